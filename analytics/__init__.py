@@ -0,0 +1,3 @@
+"""
+In-memory analytics over column-oriented snapshots of the complaints table
+"""
@@ -0,0 +1,295 @@
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime, timedelta
+from itertools import compress, islice, repeat
+from operator import floordiv, le, sub
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+EPOCH = datetime(1970, 1, 1)
+
+# Array type of each column. Timestamps are seconds since EPOCH, an
+# assignee of 0 means unassigned, and category and status hold dictionary
+# codes (widened from one to two bytes past 256 distinct values).
+COLUMN_TYPES = {
+    "id": "Q",
+    "user_id": "I",
+    "assigned_to": "I",
+    "category": "B",
+    "status": "B",
+    "created_at": "q",
+    "updated_at": "q",
+}
+
+ENCODED_COLUMNS = ("category", "status")
+
+
+def to_seconds(value: Optional[datetime]) -> int:
+    """Seconds since EPOCH of a naive database timestamp, 0 for NULL"""
+    if value is None:
+        return 0
+    return (value - EPOCH) // timedelta(seconds=1)
+
+
+def from_seconds(seconds: int) -> datetime:
+    """Inverse of to_seconds"""
+    return EPOCH + timedelta(seconds=seconds)
+
+
+class Mask:
+    """Row selection with one 0/1 byte per row
+
+    & and | go through arbitrary-precision ints, so combining filters over
+    millions of rows takes a few milliseconds.
+    """
+
+    def __init__(self, flags: bytes):
+        self.flags = flags
+
+    @classmethod
+    def all(cls, size: int) -> "Mask":
+        return cls(b"\x01" * size)
+
+    @classmethod
+    def span(cls, size: int, start: int, end: int) -> "Mask":
+        """Rows start to end-1 of size rows"""
+        return cls(bytes(start) + b"\x01" * (end - start) + bytes(size - end))
+
+    def _combine(self, other: "Mask", op) -> "Mask":
+        combined = op(
+            int.from_bytes(self.flags, "little"), int.from_bytes(other.flags, "little")
+        )
+        return Mask(combined.to_bytes(len(self.flags), "little"))
+
+    def __and__(self, other: "Mask") -> "Mask":
+        return self._combine(other, int.__and__)
+
+    def __or__(self, other: "Mask") -> "Mask":
+        return self._combine(other, int.__or__)
+
+    def __invert__(self) -> "Mask":
+        return Mask(self.flags.translate(b"\x01\x00" + bytes(254)))
+
+    def __len__(self) -> int:
+        return self.flags.count(1)
+
+
+class ComplaintSnapshot:
+    """Complaints held column-wise in typed arrays for fast aggregation
+
+    Each complaint costs about 34 bytes instead of the ~1 KB of a row dict.
+    Status and category names are dictionary-encoded into one-byte codes, so
+    filtering on them is a bytes.translate and counting them a bytes.count.
+    Rows are expected in created_at order, which turns time-range filters
+    and created_at histograms into binary searches. Everything else runs as
+    C-level map/compress/Counter passes over whole columns.
+    """
+
+    def __init__(self, categories: Dict[int, str]):
+        self.columns: Dict[str, array] = {
+            name: array(typecode) for name, typecode in COLUMN_TYPES.items()
+        }
+        self.categories = dict(categories)
+        self.labels: Dict[str, List[str]] = {name: [] for name in ENCODED_COLUMNS}
+        self.codes: Dict[str, Dict[str, int]] = {name: {} for name in ENCODED_COLUMNS}
+        self._sorted: Dict[str, bool] = {}
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    @classmethod
+    def load(
+        cls, batches: Iterable[Sequence[tuple]], categories: Dict[int, str]
+    ) -> "ComplaintSnapshot":
+        """Build a snapshot from streamed (id, user_id, assigned_to,
+        category_id, status, created_at, updated_at) batches"""
+        snapshot = cls(categories)
+        for batch in batches:
+            snapshot.append(batch)
+        return snapshot
+
+    def append(self, rows: Sequence[tuple]):
+        """Add a batch of rows to the end of every column"""
+        columns = self.columns
+        category = self.categories.get
+        columns["id"].extend(row[0] for row in rows)
+        columns["user_id"].extend(row[1] for row in rows)
+        columns["assigned_to"].extend(row[2] or 0 for row in rows)
+        self._extend_encoded("category", [category(row[3], "Unknown") for row in rows])
+        self._extend_encoded("status", [row[4] for row in rows])
+        columns["created_at"].extend(to_seconds(row[5]) for row in rows)
+        columns["updated_at"].extend(to_seconds(row[6]) for row in rows)
+        self._sorted.clear()
+
+    def _extend_encoded(self, column: str, values: List[str]):
+        codes, labels = self.codes[column], self.labels[column]
+        for value in dict.fromkeys(values):
+            if value not in codes:
+                codes[value] = len(labels)
+                labels.append(value)
+        data = self.columns[column]
+        if data.typecode == "B" and len(labels) > 256:
+            data = self.columns[column] = array("H", data)
+        data.extend(map(codes.__getitem__, values))
+
+    def memory_bytes(self) -> int:
+        """Bytes held by the column arrays"""
+        return sum(column.itemsize * len(column) for column in self.columns.values())
+
+    def is_sorted(self, column: str) -> bool:
+        """Whether a column never decreases from row to row"""
+        if column not in self._sorted:
+            data = self.columns[column]
+            self._sorted[column] = all(map(le, data, islice(data, 1, None)))
+        return self._sorted[column]
+
+    def mask(self, column: str, values: Iterable) -> Mask:
+        """Rows whose column holds one of the values (names for encoded columns)"""
+        if column in ENCODED_COLUMNS:
+            lookup = self.codes[column]
+            codes = {lookup[value] for value in values if value in lookup}
+        else:
+            codes = {value or 0 for value in values}
+        data = self.columns[column]
+        if data.typecode == "B":
+            table = bytearray(256)
+            for code in codes:
+                table[code] = 1
+            return Mask(data.tobytes().translate(table))
+        return Mask(bytes(map(codes.__contains__, data)))
+
+    def between(
+        self,
+        column: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Mask:
+        """Rows whose timestamp column is in [start, end)"""
+        data = self.columns[column]
+        if self.is_sorted(column):
+            lo = 0 if start is None else bisect_left(data, to_seconds(start))
+            hi = len(data) if end is None else bisect_left(data, to_seconds(end))
+            return Mask.span(len(data), lo, max(lo, hi))
+        mask = Mask.all(len(data))
+        if start is not None:
+            mask = mask & Mask(bytes(map(to_seconds(start).__le__, data)))
+        if end is not None:
+            mask = mask & Mask(bytes(map(to_seconds(end).__gt__, data)))
+        return mask
+
+    def filter(
+        self,
+        status: Optional[Iterable[str]] = None,
+        category: Optional[Iterable[str]] = None,
+        assigned_to: Optional[Iterable[int]] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+    ) -> Mask:
+        """Rows matching every given condition"""
+        mask = Mask.all(len(self))
+        for column, values in (
+            ("status", status),
+            ("category", category),
+            ("assigned_to", assigned_to),
+        ):
+            if values is not None:
+                mask = mask & self.mask(column, values)
+        if created_from is not None or created_to is not None:
+            mask = mask & self.between("created_at", created_from, created_to)
+        return mask
+
+    def count(self, mask: Optional[Mask] = None) -> int:
+        """Number of rows selected"""
+        return len(self) if mask is None else len(mask)
+
+    def group_count(self, column: str, mask: Optional[Mask] = None) -> Dict:
+        """Selected rows per value of a column, with names for encoded columns"""
+        return self._count_slice(column, 0, len(self), mask)
+
+    def _count_slice(
+        self, column: str, start: int, end: int, mask: Optional[Mask]
+    ) -> Dict:
+        """Value counts of rows start to end-1 that the mask selects"""
+        data = self.columns[column]
+        flags = None if mask is None else mask.flags
+        if start or end < len(data):
+            data = data[start:end]
+            flags = flags and flags[start:end]
+        selected: Iterable[int] = data if flags is None else compress(data, flags)
+        if column not in ENCODED_COLUMNS:
+            return dict(Counter(selected))
+
+        labels = self.labels[column]
+        counts: Iterable[Tuple[int, int]]
+        if data.typecode == "B":
+            raw = bytes(selected)
+            counts = ((code, raw.count(code)) for code in range(len(labels)))
+        else:
+            counts = Counter(selected).items()
+        return {labels[code]: count for code, count in counts if count}
+
+    def _buckets(
+        self, column: str, width: timedelta, origin: datetime
+    ) -> Iterator[Tuple[datetime, int, int]]:
+        """(bucket start, first row, end row) of each non-empty bucket of a
+        sorted timestamp column"""
+        data = self.columns[column]
+        if not data:
+            return
+        seconds = width // timedelta(seconds=1)
+        start = to_seconds(origin)
+        first = (data[0] - start) // seconds
+        last = (data[-1] - start) // seconds
+        lo = 0
+        for bucket in range(first, last + 1):
+            hi = bisect_left(data, start + (bucket + 1) * seconds, lo)
+            if hi > lo:
+                yield from_seconds(start + bucket * seconds), lo, hi
+            lo = hi
+
+    def histogram(
+        self,
+        column: str = "created_at",
+        width: timedelta = timedelta(days=1),
+        mask: Optional[Mask] = None,
+        origin: datetime = EPOCH,
+    ) -> Dict[datetime, int]:
+        """Selected rows per fixed-width time bucket, keyed by bucket start"""
+        if not self.is_sorted(column):
+            return self._histogram_unsorted(column, width, mask, origin)
+        histogram = {}
+        for bucket, lo, hi in self._buckets(column, width, origin):
+            count = hi - lo if mask is None else mask.flags.count(1, lo, hi)
+            if count:
+                histogram[bucket] = count
+        return histogram
+
+    def _histogram_unsorted(
+        self, column: str, width: timedelta, mask: Optional[Mask], origin: datetime
+    ) -> Dict[datetime, int]:
+        seconds = width // timedelta(seconds=1)
+        start = to_seconds(origin)
+        data = self.columns[column]
+        selected: Iterable[int] = data if mask is None else compress(data, mask.flags)
+        buckets = map(floordiv, map(sub, selected, repeat(start)), repeat(seconds))
+        return {
+            from_seconds(start + bucket * seconds): count
+            for bucket, count in sorted(Counter(buckets).items())
+        }
+
+    def group_histogram(
+        self,
+        group: str,
+        column: str = "created_at",
+        width: timedelta = timedelta(days=1),
+        mask: Optional[Mask] = None,
+        origin: datetime = EPOCH,
+    ) -> Dict[object, Dict[datetime, int]]:
+        """Histogram of a sorted timestamp column per value of a group column"""
+        if not self.is_sorted(column):
+            raise ValueError(f"{column} is not in ascending order")
+        grouped: Dict[object, Dict[datetime, int]] = {}
+        for bucket, lo, hi in self._buckets(column, width, origin):
+            for value, count in self._count_slice(group, lo, hi, mask).items():
+                grouped.setdefault(value, {})[bucket] = count
+        return grouped
@@ -0,0 +1,123 @@
+import math
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Iterable, List, Optional, Tuple
+
+
+class TDigest:
+    """Mergeable streaming quantile sketch (merging t-digest)
+
+    Values are summarized as at most about `compression` weighted centroids.
+    Centroids near the tails are kept small, so p99 stays accurate while the
+    middle of the distribution is summarized coarsely. Added values are
+    buffered and folded in with one sort, and digests built over separate
+    parts of a stream merge into a digest of the whole stream.
+    """
+
+    def __init__(self, compression: float = 100):
+        self.compression = compression
+        self.means: List[float] = []
+        self.weights: List[float] = []
+        self.count = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._buffer: List[Tuple[float, float]] = []
+        self._buffer_limit = int(5 * compression)
+
+    def __len__(self) -> int:
+        """Number of values added, including through merges"""
+        return int(self.count)
+
+    def add(self, value: float, weight: float = 1):
+        """Add one value"""
+        self._buffer.append((value, weight))
+        self.count += weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self._buffer) >= self._buffer_limit:
+            self.compress()
+
+    def extend(self, values: Iterable[float]):
+        """Add many values"""
+        for value in values:
+            self.add(value)
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        """Fold another digest's centroids into this one and return it"""
+        other.compress()
+        self._buffer.extend(zip(other.means, other.weights))
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.compress()
+        return self
+
+    def _k(self, q: float) -> float:
+        """Scale function: centroid index at quantile q (k1 in the paper)"""
+        return self.compression * math.asin(2 * q - 1) / (2 * math.pi)
+
+    def _q(self, k: float) -> float:
+        """Inverse of the scale function"""
+        return (
+            math.sin(min(k, self.compression / 4) * 2 * math.pi / self.compression) + 1
+        ) / 2
+
+    def compress(self):
+        """Fold buffered values into centroids, as large as the tails allow
+
+        Reads of a compressed digest leave it unchanged, so one digest can
+        be shared between threads once this has run.
+        """
+        if not self._buffer:
+            return
+        points = sorted(self._buffer + list(zip(self.means, self.weights)))
+        self._buffer = []
+        means: List[float] = []
+        weights: List[float] = []
+        total = self.count
+        done = 0.0
+        mean, weight = points[0]
+        limit = total * self._q(self._k(0) + 1)
+        for value, w in points[1:]:
+            if done + weight + w <= limit:
+                weight += w
+                mean += (value - mean) * w / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                done += weight
+                limit = total * self._q(self._k(done / total) + 1)
+                mean, weight = value, w
+        means.append(mean)
+        weights.append(weight)
+        self.means, self.weights = means, weights
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimated value at quantile q in [0, 1], None when empty"""
+        self.compress()
+        if not self.means:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        target = q * self.count
+        # Each centroid's weight is centred on its mean
+        centers = [c - w / 2 for c, w in zip(accumulate(self.weights), self.weights)]
+        i = bisect_right(centers, target)
+        if i == 0:
+            lo_rank, lo_value = 0.0, self.min
+            hi_rank, hi_value = centers[0], self.means[0]
+        elif i == len(centers):
+            lo_rank, lo_value = centers[-1], self.means[-1]
+            hi_rank, hi_value = self.count, self.max
+        else:
+            lo_rank, lo_value = centers[i - 1], self.means[i - 1]
+            hi_rank, hi_value = centers[i], self.means[i]
+        if hi_rank <= lo_rank:
+            return hi_value
+        return lo_value + (hi_value - lo_value) * (target - lo_rank) / (
+            hi_rank - lo_rank
+        )
@@ -0,0 +1,57 @@
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import time
+from typing import Optional
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Key that signs bearer tokens. Without API_SECRET_KEY a random key is made
+# when the server starts, so tokens stop working after a restart. Pre-forked
+# workers inherit the supervisor's key and accept each other's tokens.
+SECRET_KEY = os.getenv("API_SECRET_KEY", "").encode() or secrets.token_bytes(32)
+
+# Seconds a token issued at login stays valid
+TOKEN_TTL = int(os.getenv("API_TOKEN_TTL", "28800"))
+
+
+def _sign(payload: bytes) -> str:
+    digest = hmac.new(SECRET_KEY, payload, hashlib.sha256).digest()
+    return base64.urlsafe_b64encode(digest).decode().rstrip("=")
+
+
+def issue_token(user_id: int, now: Optional[float] = None) -> str:
+    """Signed bearer token naming a user, valid for TOKEN_TTL seconds"""
+    expires = int((now or time.time()) + TOKEN_TTL)
+    payload = base64.urlsafe_b64encode(
+        json.dumps({"sub": user_id, "exp": expires}).encode()
+    )
+    return f"{payload.decode()}.{_sign(payload)}"
+
+
+def verify_token(token: str, now: Optional[float] = None) -> Optional[int]:
+    """The user id in a valid unexpired token, or None
+
+    Tokens carry no role: callers look the user up again, so role changes
+    and deleted accounts take effect at once.
+    """
+    payload, _, signature = token.partition(".")
+    try:
+        # Compare bytes: compare_digest rejects non-ASCII str arguments
+        expected = _sign(payload.encode()).encode()
+        if not hmac.compare_digest(signature.encode(), expected):
+            return None
+    except UnicodeError:
+        return None
+    try:
+        claims = json.loads(base64.urlsafe_b64decode(payload))
+        if claims["exp"] <= (now or time.time()):
+            return None
+        return int(claims["sub"])
+    except (ValueError, KeyError, TypeError):
+        return None
@@ -0,0 +1,219 @@
+import asyncio
+import ctypes
+import os
+import signal
+import socket
+import time
+from dataclasses import dataclass
+from multiprocessing.sharedctypes import RawArray
+from typing import Dict, List, Optional
+
+from api.routes import create_router
+from api.server import DRAIN_TIMEOUT, ApiServer
+from services.comment_service import CommentService
+from services.complaint_service import ComplaintService
+from services.user_service import UserService
+
+MIN_UPTIME = 1.0
+RESPAWN_DELAY = 1.0
+
+
+@dataclass
+class WorkerInfo:
+    """A forked worker process tracked by the supervisor"""
+
+    pid: int
+    slot: int
+    started_at: float
+    retiring: bool = False
+
+
+def run_worker(sock: socket.socket, slot: int, counts) -> None:
+    """Serve the API on the shared socket in a forked worker; never returns"""
+    status = 0
+    try:
+        # The supervisor owns Ctrl-C and reloads; workers only react to SIGTERM
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        signal.signal(signal.SIGUSR1, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+        def count_request():
+            counts[slot] += 1
+
+        # The supervisor has imported every module, but it never queries, so
+        # the module-level caches it passes on are empty. The services are
+        # built here and the database pool on first query, so each worker
+        # has its own; db_config also forgets connections inherited at fork.
+        router = create_router(UserService(), ComplaintService(), CommentService())
+        server = ApiServer(router, on_request=count_request)
+
+        async def serve():
+            stop = asyncio.Event()
+            asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stop.set)
+            await server.serve_socket(sock, stop)
+
+        try:
+            asyncio.run(serve())
+        finally:
+            server.shutdown()
+    except Exception as e:
+        print(f"Worker {os.getpid()} failed: {e}")
+        status = 1
+    finally:
+        # Skip the parent's atexit handlers and finally blocks
+        os._exit(status)
+
+
+class PreforkSupervisor:
+    """Run N API worker processes that share one listening socket
+
+    The supervisor binds the socket, forks the workers and then only
+    manages them; it never touches the database, so every worker builds
+    its own connection pool after fork. Crashed workers are restarted.
+    SIGHUP starts a fresh set of workers and drains the old ones. SIGUSR1
+    prints per-worker request counts. SIGTERM or Ctrl-C drains and exits.
+    """
+
+    def __init__(self, host: str, port: int, workers: int):
+        self.host = host
+        self.port = port
+        self.size = workers
+        # Two slots per worker so a full set of replacements can run while
+        # the workers they replace are still draining
+        self.counts = RawArray(ctypes.c_ulonglong, workers * 2)
+        self.free_slots: List[int] = list(range(workers * 2))
+        self.workers: Dict[int, WorkerInfo] = {}
+        self.retired_requests = 0
+        self.sock: Optional[socket.socket] = None
+        self._stopping = False
+        self._reload = False
+        self._report = False
+        self._respawn_at = 0.0
+
+    def run(self):
+        """Bind, fork the workers and supervise them until asked to stop"""
+        self.sock = socket.create_server((self.host, self.port), backlog=1024)
+        self.sock.setblocking(False)
+        print(f"API listening on http://{self.host}:{self.port}")
+
+        signal.signal(signal.SIGTERM, self._on_stop)
+        signal.signal(signal.SIGINT, self._on_stop)
+        signal.signal(signal.SIGHUP, self._on_reload)
+        signal.signal(signal.SIGUSR1, self._on_report)
+
+        try:
+            while not self._stopping:
+                self.reap()
+                if self._reload and len(self.free_slots) >= self.size:
+                    self._reload = False
+                    self.roll()
+                if self._report:
+                    self._report = False
+                    self.report()
+                self.fill()
+                time.sleep(0.2)
+        finally:
+            self.stop()
+            self.report()
+            self.sock.close()
+
+    def active_workers(self) -> List[WorkerInfo]:
+        """Workers that are serving and not being replaced"""
+        return [info for info in self.workers.values() if not info.retiring]
+
+    def spawn(self) -> WorkerInfo:
+        """Fork one worker into a free request-count slot"""
+        if self.sock is None:
+            raise RuntimeError("The supervisor has not bound its socket")
+        slot = self.free_slots.pop(0)
+        self.counts[slot] = 0
+        pid = os.fork()
+        if pid == 0:
+            run_worker(self.sock, slot, self.counts)
+        info = WorkerInfo(pid, slot, time.monotonic())
+        self.workers[pid] = info
+        return info
+
+    def fill(self):
+        """Start workers until the configured number is serving"""
+        if time.monotonic() < self._respawn_at:
+            return
+        while not self._stopping and len(self.active_workers()) < self.size:
+            self.spawn()
+
+    def reap(self):
+        """Collect exited workers and schedule restarts for crashed ones"""
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.workers.clear()
+                return
+            if pid == 0:
+                return
+
+            info = self.workers.pop(pid, None)
+            if info is None:
+                continue
+            self.retired_requests += self.counts[info.slot]
+            self.free_slots.append(info.slot)
+
+            if info.retiring or self._stopping:
+                continue
+            print(f"Worker {pid} exited unexpectedly (status {status}), restarting")
+            if time.monotonic() - info.started_at < MIN_UPTIME:
+                # Back off so a worker that dies on startup does not fork-loop
+                self._respawn_at = time.monotonic() + RESPAWN_DELAY
+
+    def roll(self):
+        """Replace every worker, letting the old ones drain their requests"""
+        old = self.active_workers()
+        for info in old:
+            info.retiring = True
+        self.fill()
+        for info in old:
+            self._signal(info.pid, signal.SIGTERM)
+        print(f"Rolled {len(old)} workers")
+
+    def stop(self):
+        """Drain every worker, killing any that outlive the drain timeout"""
+        self._stopping = True
+        for pid in list(self.workers):
+            self._signal(pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + DRAIN_TIMEOUT + 5
+        while self.workers and time.monotonic() < deadline:
+            self.reap()
+            time.sleep(0.1)
+        for pid in list(self.workers):
+            self._signal(pid, signal.SIGKILL)
+        while self.workers:
+            self.reap()
+            time.sleep(0.1)
+
+    def report(self):
+        """Print the request count of each worker"""
+        total = self.retired_requests
+        for info in sorted(self.workers.values(), key=lambda info: info.slot):
+            served = self.counts[info.slot]
+            total += served
+            state = " (draining)" if info.retiring else ""
+            print(f"  worker {info.pid}: {served} requests{state}")
+        print(f"  total: {total} requests")
+
+    def _signal(self, pid: int, signum: int):
+        """Send a signal to a worker that may already have exited"""
+        try:
+            os.kill(pid, signum)
+        except ProcessLookupError:
+            pass
+
+    def _on_stop(self, signum, frame):
+        self._stopping = True
+
+    def _on_reload(self, signum, frame):
+        self._reload = True
+
+    def _on_report(self, signum, frame):
+        self._report = True
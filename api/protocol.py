@@ -0,0 +1,206 @@
+import asyncio
+import json
+import re
+from dataclasses import dataclass, field
+from http import HTTPStatus
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class HTTPError(Exception):
+    """Error that is turned into a JSON error response"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+@dataclass
+class Request:
+    """Parsed HTTP request"""
+
+    method: str
+    path: str
+    version: str = "HTTP/1.1"
+    query: Dict[str, str] = field(default_factory=dict)
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: bytes = b""
+
+    @property
+    def keep_alive(self) -> bool:
+        """Whether the client wants the connection kept open after the response"""
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.0":
+            return connection == "keep-alive"
+        return connection != "close"
+
+    def json(self) -> Dict[str, Any]:
+        """Decode the request body as a JSON object"""
+        if not self.body:
+            return {}
+        try:
+            data = json.loads(self.body)
+        except ValueError:
+            raise HTTPError(400, "Request body is not valid JSON")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Request body must be a JSON object")
+        return data
+
+
+async def read_request(reader: asyncio.StreamReader) -> Optional[Request]:
+    """Read one request from the stream, or return None if the client closed it"""
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as e:
+        if not e.partial.strip():
+            return None
+        raise HTTPError(400, "Incomplete request")
+    except asyncio.LimitOverrunError:
+        raise HTTPError(431, "Request headers too large")
+
+    if len(head) > MAX_HEADER_BYTES:
+        raise HTTPError(431, "Request headers too large")
+
+    request = parse_head(head.decode("latin-1"))
+
+    if "transfer-encoding" in request.headers:
+        raise HTTPError(501, "Chunked request bodies are not supported")
+    try:
+        length = int(request.headers.get("content-length", "0"))
+    except ValueError:
+        raise HTTPError(400, "Invalid Content-Length")
+    if length < 0:
+        raise HTTPError(400, "Invalid Content-Length")
+    if length > MAX_BODY_BYTES:
+        raise HTTPError(413, "Request body too large")
+    if length:
+        try:
+            request.body = await reader.readexactly(length)
+        except asyncio.IncompleteReadError:
+            raise HTTPError(400, "Incomplete request body")
+    return request
+
+
+def parse_head(head: str) -> Request:
+    """Parse the request line and headers"""
+    lines = head.split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ")
+    except ValueError:
+        raise HTTPError(400, "Malformed request line")
+    if version not in ("HTTP/1.0", "HTTP/1.1"):
+        raise HTTPError(505, "HTTP version not supported")
+
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, sep, value = line.partition(":")
+        if not sep:
+            raise HTTPError(400, "Malformed header line")
+        headers[name.strip().lower()] = value.strip()
+
+    url = urlsplit(target)
+    query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+    return Request(method.upper(), url.path, version, query, headers)
+
+
+def build_response(
+    status: int,
+    body: bytes,
+    keep_alive: bool = True,
+    content_type: str = "application/json",
+) -> bytes:
+    """Serialize a complete HTTP/1.1 response"""
+    reason = HTTPStatus(status).phrase
+    head = (
+        f"HTTP/1.1 {status} {reason}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    return head.encode("latin-1") + body
+
+
+@dataclass
+class StreamingBody:
+    """Response body produced chunk by chunk, sent with chunked encoding"""
+
+    chunks: Iterator[bytes]
+    content_type: str = "application/json"
+
+
+LAST_CHUNK = b"0\r\n\r\n"
+
+
+def build_stream_head(
+    status: int,
+    keep_alive: bool = True,
+    content_type: str = "application/json",
+    chunked: bool = True,
+) -> bytes:
+    """Serialize the head of a response whose length is not known up front
+
+    HTTP/1.0 clients do not understand chunked encoding; they get the raw
+    body and the end of the body is marked by closing the connection.
+    """
+    reason = HTTPStatus(status).phrase
+    framing = "Transfer-Encoding: chunked\r\n" if chunked else ""
+    head = (
+        f"HTTP/1.1 {status} {reason}\r\n"
+        f"Content-Type: {content_type}\r\n"
+        f"{framing}"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+        "\r\n"
+    )
+    return head.encode("latin-1")
+
+
+def encode_chunk(data: bytes) -> bytes:
+    """Frame one piece of a chunked response body"""
+    return f"{len(data):X}\r\n".encode("latin-1") + data + b"\r\n"
+
+
+def json_body(payload: Any) -> bytes:
+    """Encode a response payload as JSON"""
+    return json.dumps(payload, default=str).encode("utf-8")
+
+
+Handler = Callable[..., Tuple[int, Any]]
+
+
+class Router:
+    """Map (method, path pattern) pairs to handlers
+
+    Patterns use {name} placeholders for integer path parameters, for
+    example "/complaints/{complaint_id}/comments".
+    """
+
+    def __init__(self):
+        self._routes: List[Tuple[str, "re.Pattern[str]", Handler]] = []
+
+    def add(self, method: str, pattern: str, handler: Handler):
+        """Register a handler called as handler(request, **path_params)"""
+        regex = re.sub(r"\{(\w+)\}", r"(?P<\1>\\d+)", pattern)
+        self._routes.append((method.upper(), re.compile(f"^{regex}$"), handler))
+
+    def resolve(self, method: str, path: str) -> Tuple[Handler, Dict[str, int]]:
+        """Find the handler and path parameters for a request"""
+        path_matched = False
+        for route_method, regex, handler in self._routes:
+            match = regex.match(path)
+            if not match:
+                continue
+            path_matched = True
+            if route_method == method:
+                params = {key: int(value) for key, value in match.groupdict().items()}
+                return handler, params
+
+        if path_matched:
+            raise HTTPError(405, "Method not allowed")
+        raise HTTPError(404, "Not found")
@@ -0,0 +1,355 @@
+from itertools import chain
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from api.auth import TOKEN_TTL, issue_token, verify_token
+from api.protocol import HTTPError, Request, Router, StreamingBody
+from config.database import StreamLimitError, db_config
+from dto.serializers import complaint_serializer
+from services.comment_service import CommentService
+from services.complaint_service import TREND_BUCKETS, ComplaintService
+from services.user_service import UserService
+
+VALID_STATUSES = ("Pending", "In Progress", "Resolved")
+
+# Seconds a streamed list waits for a free streaming connection before 503
+STREAM_SLOT_WAIT = 1.0
+
+
+def public_user(user: Optional[dict]) -> Optional[dict]:
+    """Drop the password field before a user leaves the API"""
+    if user is None:
+        return None
+    return {key: value for key, value in user.items() if key != "password"}
+
+
+def require_fields(data: Dict[str, Any], *names: str) -> None:
+    """Reject a request body that is missing required fields"""
+    missing = [name for name in names if data.get(name) in (None, "")]
+    if missing:
+        raise HTTPError(400, f"Missing required fields: {', '.join(missing)}")
+
+
+def optional_int(request: Request, name: str) -> Optional[int]:
+    """Read an optional integer query parameter"""
+    value = request.query.get(name)
+    if value is None:
+        return None
+    try:
+        return int(value)
+    except ValueError:
+        raise HTTPError(400, f"Query parameter {name} must be an integer")
+
+
+def required_int(data: Dict[str, Any], name: str) -> int:
+    """Read a required integer field from a request body"""
+    require_fields(data, name)
+    value = data[name]
+    # JSON numbers or numeric strings only: true, 2.5 and "abc" are rejected
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lstrip("-").isdigit():
+        return int(value)
+    raise HTTPError(400, f"Field {name} must be an integer")
+
+
+def found(entity: Optional[dict], name: str) -> Tuple[int, Any]:
+    """Return 200 with the entity, or raise 404"""
+    if entity is None:
+        raise HTTPError(404, f"{name} not found")
+    return 200, entity
+
+
+def done(ok: bool, status: int = 200) -> Tuple[int, Any]:
+    """Map a service success flag to a response"""
+    if not ok:
+        raise HTTPError(422, "Operation failed")
+    return status, {"success": True}
+
+
+def create_router(
+    user_service: UserService,
+    complaint_service: ComplaintService,
+    comment_service: CommentService,
+) -> Router:
+    """Expose the user, complaint and comment services as JSON routes
+
+    Handlers are plain blocking functions; the server runs them on its
+    database thread pool. Every route except registration, login and the
+    health check needs the bearer token issued at login, and applies the
+    same role rules as the console menus.
+    """
+    router = Router()
+
+    def authenticate(request: Request) -> dict:
+        """The user named by the request's bearer token, or raise 401"""
+        scheme, _, token = request.headers.get("authorization", "").partition(" ")
+        user_id = verify_token(token.strip()) if scheme.lower() == "bearer" else None
+        user = None if user_id is None else user_service.find_user_by_id(user_id)
+        if user is None:
+            raise HTTPError(401, "Authentication required")
+        return user
+
+    def protected(handler: Callable[..., Tuple[int, Any]], *roles: str):
+        """Wrap a handler(request, user, **params) so it only runs for
+        authenticated users with one of the roles (any role if none given)"""
+
+        def guarded(request: Request, **params):
+            user = authenticate(request)
+            if roles and user["role"] not in roles:
+                raise HTTPError(403, "Not allowed for your role")
+            return handler(request, user, **params)
+
+        return guarded
+
+    def accessible_complaint(user: dict, complaint_id: int) -> dict:
+        """A complaint its owner, assigned staff member or an admin may see"""
+        complaint = complaint_service.find_complaint_by_id(complaint_id)
+        if complaint is None:
+            raise HTTPError(404, "Complaint not found")
+        if user["role"] != "admin" and user["id"] not in (
+            complaint["user_id"],
+            complaint.get("assigned_to"),
+        ):
+            raise HTTPError(403, "Not allowed for this complaint")
+        return complaint
+
+    def own_filters(user: dict, filters: Dict[str, Any]) -> Dict[str, Any]:
+        """Narrow user and staff requests to their own or assigned complaints"""
+        if user["role"] == "user":
+            return {**filters, "user_id": user["id"], "assigned_to": None}
+        if user["role"] == "staff":
+            return {**filters, "user_id": None, "assigned_to": user["id"]}
+        return filters
+
+    # Users
+    def register_user(request: Request):
+        data = request.json()
+        require_fields(data, "name", "email", "password")
+        if user_service.find_user_by_email(data["email"]):
+            raise HTTPError(409, "User with this email already exists")
+        # Self-registration always creates a regular user
+        return done(
+            user_service.create_user(data["name"], data["email"], data["password"]),
+            201,
+        )
+
+    def login(request: Request):
+        data = request.json()
+        require_fields(data, "email", "password")
+        user = user_service.authenticate_user(data["email"], data["password"])
+        if user is None:
+            raise HTTPError(401, "Invalid credentials")
+        return 200, {
+            "user": public_user(user),
+            "token": issue_token(user["id"]),
+            "expires_in": TOKEN_TTL,
+        }
+
+    def list_users(request: Request, user: dict):
+        role = request.query.get("role")
+        users = (
+            user_service.find_users_by_role(role)
+            if role
+            else user_service.find_all_users()
+        )
+        return 200, [public_user(member) for member in users]
+
+    def get_user(request: Request, user: dict, user_id: int):
+        if user["role"] != "admin" and user["id"] != user_id:
+            raise HTTPError(403, "Not allowed for your role")
+        return found(public_user(user_service.find_user_by_id(user_id)), "User")
+
+    router.add("POST", "/users", register_user)
+    router.add("POST", "/users/login", login)
+    router.add("GET", "/users", protected(list_users, "admin"))
+    router.add("GET", "/users/{user_id}", protected(get_user))
+
+    # Complaints
+    def list_complaints(request: Request, user: dict):
+        filters = own_filters(
+            user,
+            {
+                "user_id": optional_int(request, "user_id"),
+                "assigned_to": optional_int(request, "assigned_to"),
+            },
+        )
+        user_id, assigned_to = filters["user_id"], filters["assigned_to"]
+        status = request.query.get("status")
+        category = request.query.get("category")
+
+        if assigned_to is not None:
+            return 200, complaint_service.find_assigned_complaints(assigned_to)
+        if user_id is not None and category:
+            return 200, complaint_service.find_complaints_by_user_and_category(
+                user_id, category
+            )
+        if user_id is not None:
+            return 200, complaint_service.find_complaints_by_user_id(user_id)
+        if status:
+            return 200, complaint_service.find_complaints_by_status(status)
+        if category:
+            return 200, complaint_service.find_complaints_by_category(category)
+
+        # The unfiltered list can be very large: stream it from the cursor.
+        # The first batch is read here, so a request that finds every
+        # streaming connection busy still gets a 503 instead of a cut-off 200.
+        batches = complaint_service.iter_all_complaint_batches()
+        try:
+            with db_config.stream_timeout(STREAM_SLOT_WAIT):
+                first = next(batches, [])
+        except StreamLimitError:
+            raise HTTPError(503, "Server busy, retry shortly")
+
+        def chunks():
+            try:
+                rows = chain(first, chain.from_iterable(batches))
+                yield from complaint_serializer.iter_json_array(rows)
+            finally:
+                # Release the streaming connection as soon as the response ends
+                close = getattr(batches, "close", None)
+                if close is not None:
+                    close()
+
+        return 200, StreamingBody(chunks())
+
+    def create_complaint(request: Request, user: dict):
+        data = request.json()
+        require_fields(data, "category", "description")
+        return done(
+            complaint_service.create_complaint(
+                user["id"], data["category"], data["description"]
+            ),
+            201,
+        )
+
+    def get_complaint(request: Request, user: dict, complaint_id: int):
+        return 200, accessible_complaint(user, complaint_id)
+
+    def update_status(request: Request, user: dict, complaint_id: int):
+        data = request.json()
+        require_fields(data, "status")
+        if data["status"] not in VALID_STATUSES:
+            raise HTTPError(400, "Invalid status")
+        complaint = accessible_complaint(user, complaint_id)
+        if user["role"] == "staff" and complaint.get("assigned_to") != user["id"]:
+            raise HTTPError(403, "Not allowed for this complaint")
+        return done(
+            complaint_service.update_complaint_status(complaint_id, data["status"])
+        )
+
+    def assign(request: Request, user: dict, complaint_id: int):
+        staff = user_service.find_user_by_id(required_int(request.json(), "staff_id"))
+        if not staff or staff["role"] != "staff":
+            raise HTTPError(400, "Staff member not found")
+        return done(complaint_service.assign_complaint(complaint_id, staff["id"]))
+
+    def delete_complaint(request: Request, user: dict, complaint_id: int):
+        complaint = accessible_complaint(user, complaint_id)
+        if user["role"] != "admin" and complaint["user_id"] != user["id"]:
+            raise HTTPError(403, "Not allowed for this complaint")
+        return done(complaint_service.delete_complaint(complaint_id))
+
+    def search(request: Request, user: dict):
+        text = request.query.get("q", "")
+        if not text.strip():
+            raise HTTPError(400, "Query parameter q is required")
+        filters = own_filters(
+            user,
+            {
+                "user_id": optional_int(request, "user_id"),
+                "assigned_to": optional_int(request, "assigned_to"),
+                "status": request.query.get("status"),
+                "category": request.query.get("category"),
+            },
+        )
+        page = optional_int(request, "page") or 1
+        return 200, complaint_service.search(text, filters, page)
+
+    def statistics(request: Request, user: dict):
+        return 200, complaint_service.get_statistics()
+
+    def trends(request: Request, user: dict):
+        days = min(optional_int(request, "days") or 90, 731)
+        bucket = request.query.get("bucket", "day")
+        if bucket not in TREND_BUCKETS:
+            raise HTTPError(400, f"bucket must be one of {', '.join(TREND_BUCKETS)}")
+        category = request.query.get("category")
+        return 200, complaint_service.get_trends(
+            days, bucket, category.split(",") if category else None
+        )
+
+    def resolution_times(request: Request, user: dict):
+        return 200, complaint_service.get_resolution_times()
+
+    def dashboard(request: Request, user: dict):
+        days = min(optional_int(request, "days") or 30, 366)
+        category = request.query.get("category")
+        status = request.query.get("status")
+        return 200, complaint_service.get_dashboard(
+            days,
+            category.split(",") if category else None,
+            status.split(",") if status else None,
+        )
+
+    router.add("GET", "/complaints", protected(list_complaints))
+    router.add("POST", "/complaints", protected(create_complaint, "user"))
+    router.add("GET", "/complaints/search", protected(search))
+    router.add("GET", "/complaints/statistics", protected(statistics, "admin"))
+    router.add("GET", "/complaints/dashboard", protected(dashboard, "admin"))
+    router.add("GET", "/complaints/trends", protected(trends, "admin"))
+    router.add(
+        "GET",
+        "/complaints/resolution-times",
+        protected(resolution_times, "admin"),
+    )
+    router.add("GET", "/complaints/{complaint_id}", protected(get_complaint))
+    router.add("DELETE", "/complaints/{complaint_id}", protected(delete_complaint))
+    router.add(
+        "PATCH",
+        "/complaints/{complaint_id}/status",
+        protected(update_status, "admin", "staff"),
+    )
+    router.add(
+        "PATCH", "/complaints/{complaint_id}/assignment", protected(assign, "admin")
+    )
+
+    # Comments
+    def list_comments(request: Request, user: dict, complaint_id: int):
+        accessible_complaint(user, complaint_id)
+        limit = min(optional_int(request, "limit") or 50, 500)
+        since_id = optional_int(request, "since_id")
+        if since_id is not None:
+            comments = comment_service.find_comments_since(
+                complaint_id, since_id, limit
+            )
+            return 200, {"comments": comments}
+        return 200, comment_service.find_comment_page(
+            complaint_id, limit, optional_int(request, "before_id")
+        )
+
+    def add_comment(request: Request, user: dict, complaint_id: int):
+        data = request.json()
+        require_fields(data, "comment")
+        # The comment DAO only accepts comments from the assigned staff member
+        return done(
+            comment_service.create_comment(complaint_id, user["id"], data["comment"]),
+            201,
+        )
+
+    router.add("GET", "/complaints/{complaint_id}/comments", protected(list_comments))
+    router.add(
+        "POST",
+        "/complaints/{complaint_id}/comments",
+        protected(add_comment, "staff"),
+    )
+
+    # Categories
+    def suggest_categories(request: Request, user: dict):
+        prefix = request.query.get("prefix", "")
+        limit = min(optional_int(request, "limit") or 5, 50)
+        return 200, complaint_service.suggest_categories(prefix, limit)
+
+    router.add("GET", "/categories/suggest", protected(suggest_categories))
+
+    router.add("GET", "/health", lambda request: (200, {"status": "ok"}))
+    return router
@@ -0,0 +1,216 @@
+"""
+Complaint Management API Server
+Serves the user, complaint and comment services as HTTP/JSON on asyncio.
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from api.protocol import (
+    LAST_CHUNK,
+    HTTPError,
+    Request,
+    Router,
+    StreamingBody,
+    build_response,
+    build_stream_head,
+    encode_chunk,
+    json_body,
+    read_request,
+)
+from api.routes import create_router
+from config.database import db_config
+from services.comment_service import CommentService
+from services.complaint_service import ComplaintService
+from services.user_service import UserService
+
+IDLE_TIMEOUT = 15.0
+DRAIN_TIMEOUT = 30.0
+
+
+class ApiServer:
+    """Asyncio HTTP/1.1 server that runs blocking handlers on a bounded pool
+
+    Every connection is a coroutine on one event loop, so idle keep-alive
+    clients cost no threads. Handlers do blocking DAO calls, so they run on a
+    thread pool no larger than the database connection pool; requests beyond
+    that wait in the executor queue instead of opening more connections.
+    """
+
+    def __init__(
+        self,
+        router: Router,
+        workers: Optional[int] = None,
+        on_request: Optional[Callable[[], None]] = None,
+    ):
+        self.router = router
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers or db_config.pool_size, thread_name_prefix="api"
+        )
+        self.on_request = on_request
+        self.draining = False
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ):
+        """Serve requests on one connection until the client or server closes it"""
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await asyncio.wait_for(
+                        read_request(reader), timeout=IDLE_TIMEOUT
+                    )
+                    if request is None:
+                        break
+                    keep_alive = request.keep_alive and not self.draining
+                    status, payload = await self.dispatch(request)
+                except asyncio.TimeoutError:
+                    break
+                except HTTPError as e:
+                    status, payload = e.status, {"error": e.message}
+
+                # Only dispatch returns a stream, so request is always set here
+                if request is not None and isinstance(payload, StreamingBody):
+                    keep_alive = await self.write_stream(
+                        writer, request, status, payload, keep_alive
+                    )
+                else:
+                    writer.write(build_response(status, json_body(payload), keep_alive))
+                    await writer.drain()
+                if self.on_request is not None:
+                    self.on_request()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def write_stream(
+        self,
+        writer: asyncio.StreamWriter,
+        request: Request,
+        status: int,
+        body: StreamingBody,
+        keep_alive: bool,
+    ) -> bool:
+        """Send a streamed body, pulling each chunk on the executor
+
+        Returns whether the connection can be reused. If producing a chunk
+        fails the connection is dropped without the final chunk, so the
+        client sees a truncated response rather than a complete-looking one.
+        """
+        chunked = request.version == "HTTP/1.1"
+        keep_alive = keep_alive and chunked
+        writer.write(build_stream_head(status, keep_alive, body.content_type, chunked))
+
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                chunk = await loop.run_in_executor(
+                    self.executor, next, body.chunks, None
+                )
+                if chunk is None:
+                    break
+                if chunk:
+                    writer.write(encode_chunk(chunk) if chunked else chunk)
+                    await writer.drain()
+        except Exception as e:
+            print(f"Error streaming {request.method} {request.path}: {e}")
+            return False
+        finally:
+            # Close the producer so it releases its database cursor even if
+            # the client went away halfway through
+            close = getattr(body.chunks, "close", None)
+            if close is not None:
+                await loop.run_in_executor(self.executor, close)
+
+        if chunked:
+            writer.write(LAST_CHUNK)
+            await writer.drain()
+        return keep_alive
+
+    async def dispatch(self, request: Request):
+        """Route a request and run its handler on the executor"""
+        handler, params = self.router.resolve(request.method, request.path)
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(
+                self.executor, lambda: handler(request, **params)
+            )
+        except HTTPError:
+            raise
+        except Exception as e:
+            print(f"Error handling {request.method} {request.path}: {e}")
+            return 500, {"error": "Internal server error"}
+
+    async def serve(self, host: str, port: int):
+        """Listen on host:port until cancelled"""
+        server = await asyncio.start_server(
+            self.handle_connection, host, port, backlog=1024
+        )
+        print(f"API listening on http://{host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+    async def serve_socket(self, sock: socket.socket, stop: asyncio.Event):
+        """Accept on an already listening socket until stop is set, then drain
+
+        Draining stops accepting, answers in-flight requests with
+        Connection: close and waits up to DRAIN_TIMEOUT for clients to leave.
+        """
+        server = await asyncio.start_server(self.handle_connection, sock=sock)
+        await stop.wait()
+        self.draining = True
+        server.close()
+        try:
+            await asyncio.wait_for(server.wait_closed(), timeout=DRAIN_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+
+    def shutdown(self):
+        """Stop the handler threads and close pooled database connections"""
+        self.executor.shutdown(wait=True)
+        db_config.close_connection()
+
+
+def main():
+    """Parse arguments and run the API server"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--host", default="0.0.0.0")  # nosec B104
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Pre-fork this many worker processes sharing the socket (POSIX only)",
+    )
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        from api.prefork import PreforkSupervisor
+
+        PreforkSupervisor(args.host, args.port, args.workers).run()
+        return
+
+    router = create_router(UserService(), ComplaintService(), CommentService())
+    server = ApiServer(router)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        print("\nAPI server stopped.")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -54,6 +54,8 @@ class ComplaintManagementApp:
                     self.current_user["id"]
                 )
             elif choice == "8":
+                self.complaint_controller.search_complaints(self.current_user["id"])
+            elif choice == "9":
                 break
             else:
                 self.user_view.display_error("Invalid choice")
@@ -85,6 +87,8 @@ class ComplaintManagementApp:
             elif choice == "8":
                 self.complaint_controller.view_complaint_statistics()
             elif choice == "9":
+                self.complaint_controller.search_complaints(is_admin=True)
+            elif choice == "10":
                 break
             else:
                 self.user_view.display_error("Invalid choice")
@@ -110,6 +114,15 @@ class ComplaintManagementApp:
                     self.current_user["id"], complaint_id
                 )
             elif choice == "4":
+                self.complaint_controller.search_complaints(
+                    staff_id=self.current_user["id"]
+                )
+            elif choice == "5":
+                complaint_id = int(self.user_view.get_user_input("Enter Complaint ID"))
+                self.complaint_controller.view_complaint_details(
+                    complaint_id, show_similar=True
+                )
+            elif choice == "6":
                 break
             else:
                 self.user_view.display_error("Invalid choice")
@@ -0,0 +1,185 @@
+"""
+Analytics Snapshot Benchmark
+Builds a columnar snapshot of synthetic complaints, no database needed, and
+times the dashboard operations on it against the same rows held as dicts,
+then times resolution percentiles from t-digests against sorting:
+
+    python benchmarks/bench_analytics.py --rows 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime, timedelta
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from analytics.columnar import ComplaintSnapshot
+from analytics.tdigest import TDigest
+
+STATUSES = ["Pending", "In Progress", "Resolved"]
+
+
+def synthetic_batches(rows: int, categories: int, batch_size: int = 10000):
+    """Complaint rows in created_at order, about two minutes apart"""
+    rng = random.Random(0)
+    started = datetime(2024, 1, 1)
+    for first in range(1, rows + 1, batch_size):
+        batch = []
+        for complaint_id in range(first, min(rows, first + batch_size - 1) + 1):
+            created = started + timedelta(seconds=complaint_id * 120)
+            batch.append(
+                (
+                    complaint_id,
+                    rng.randint(1, 50000),
+                    rng.choice([None, None, 3, 4, 5, 6]),
+                    rng.randint(1, categories),
+                    rng.choice(STATUSES),
+                    created,
+                    created,
+                )
+            )
+        yield batch
+
+
+def timed(name: str, operation, repeat: int = 3):
+    """Print the best of repeat runs of an operation in milliseconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        operation()
+        best = min(best, time.perf_counter() - started)
+    print(f"{name:<40} {best * 1000:>10.1f}")
+
+
+def run_benchmark(rows: int, categories: int):
+    """Compare memory use and time the snapshot's dashboard operations"""
+    names = {
+        category_id: f"Category {category_id}"
+        for category_id in range(1, categories + 1)
+    }
+
+    tracemalloc.start()
+    snapshot = ComplaintSnapshot.load(synthetic_batches(rows, categories), names)
+    snapshot_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    sample = min(rows, 100000)
+    tracemalloc.start()
+    dict_rows = [
+        {
+            "id": row[0],
+            "user_id": row[1],
+            "assigned_to": row[2],
+            "category": names[row[3]],
+            "status": row[4],
+            "created_at": row[5],
+            "updated_at": row[6],
+        }
+        for batch in synthetic_batches(sample, categories)
+        for row in batch
+    ]
+    dict_bytes = tracemalloc.get_traced_memory()[0] * rows / sample
+    tracemalloc.stop()
+
+    print(f"\n=== Memory for {rows:,} complaints ===")
+    print(f"{'columnar snapshot':<40} {snapshot_bytes / 2**20:>9.1f} MB")
+    print(f"{'list of dicts (extrapolated)':<40} {dict_bytes / 2**20:>9.1f} MB")
+
+    since = datetime(2024, 1, 1) + timedelta(seconds=rows * 60)
+    pending = snapshot.mask("status", ["Pending"])
+    print(f"\n=== Snapshot operations ({rows:,} rows) ===")
+    print(f"{'operation':<40} {'ms':>10}")
+    timed("filter status", lambda: snapshot.mask("status", ["Pending"]))
+    timed("filter category", lambda: snapshot.mask("category", ["Category 3"]))
+    timed("filter created_at range", lambda: snapshot.between("created_at", since))
+    timed(
+        "filter status & category & range",
+        lambda: snapshot.filter(["Pending"], ["Category 3"], created_from=since),
+    )
+    timed("group by status", lambda: snapshot.group_count("status"))
+    timed("group by category", lambda: snapshot.group_count("category"))
+    timed(
+        "group open by assignee", lambda: snapshot.group_count("assigned_to", pending)
+    )
+    timed("daily histogram", lambda: snapshot.histogram())
+    timed("daily histogram, filtered", lambda: snapshot.histogram(mask=pending))
+    timed(
+        "weekly histogram per category",
+        lambda: snapshot.group_histogram("category", width=timedelta(days=7)),
+    )
+    timed(
+        f"group by category, dicts ({sample:,})",
+        lambda: Counter(row["category"] for row in dict_rows),
+    )
+
+
+def run_quantile_benchmark(rows: int, categories: int):
+    """Time per-category resolution percentiles and their accuracy"""
+    rng = random.Random(0)
+    durations = [
+        (rng.randint(1, categories), rng.lognormvariate(10, 1.5)) for _ in range(rows)
+    ]
+
+    started = time.perf_counter()
+    digests = {}
+    for category, seconds in durations:
+        if category not in digests:
+            digests[category] = TDigest()
+        digests[category].add(seconds)
+    for digest in digests.values():
+        digest.compress()
+    build_ms = (time.perf_counter() - started) * 1000
+
+    exact = sorted(seconds for _, seconds in durations)
+    overall = TDigest()
+    for digest in digests.values():
+        overall.merge(digest)
+
+    print(f"\n=== Resolution percentiles ({rows:,} durations) ===")
+    print(f"{'operation':<40} {'ms':>10}")
+    print(f"{f'build {len(digests)} category digests':<40} {build_ms:>10.1f}")
+    timed(
+        "p50/p90/p99 of every category",
+        lambda: [
+            digest.quantile(q) for digest in digests.values() for q in (0.5, 0.9, 0.99)
+        ],
+    )
+
+    def merge_all():
+        merged = TDigest()
+        for digest in digests.values():
+            merged.merge(digest)
+        return merged.quantile(0.99)
+
+    timed("merge categories, overall p99", merge_all)
+    timed(
+        "overall p99 by sorting",
+        lambda: sorted(seconds for _, seconds in durations)[int(rows * 0.99)],
+    )
+    for q in (0.5, 0.9, 0.99):
+        estimate = overall.quantile(q)
+        if estimate is None:
+            continue
+        rank = bisect_left(exact, estimate) / rows
+        print(f"{f'overall p{round(q * 100)} rank':<40} {rank:>10.4f}")
+
+
+def main():
+    """Parse arguments and run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000000)
+    parser.add_argument("--categories", type=int, default=40)
+    args = parser.parse_args()
+    run_benchmark(args.rows, args.categories)
+    run_quantile_benchmark(args.rows, args.categories)
+
+
+if __name__ == "__main__":
+    main()
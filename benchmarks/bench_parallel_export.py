@@ -0,0 +1,67 @@
+"""
+Parallel Export Benchmark
+Exports every complaint once per worker count and reports how throughput
+scales. Run it against a database holding a representative number of rows:
+
+    python benchmarks/bench_parallel_export.py --workers 1 2 4 8 --gzip
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.database import db_config
+from controllers.controllers import ComplaintController
+
+
+def run_benchmark(worker_counts, compress: bool, batch_size: int):
+    """Time one full export per worker count and print a scaling table"""
+    controller = ComplaintController()
+    results = []
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        for workers in worker_counts:
+            filename = os.path.join(output_dir, f"export_{workers}.csv")
+            report = controller.export_complaints_parallel(
+                is_admin=True,
+                filename=filename,
+                workers=workers,
+                compress=compress,
+                batch_size=batch_size,
+            )
+            if not report:
+                print(f"Export with {workers} workers failed")
+                return
+            results.append(report)
+
+    baseline = results[0]["rows"] / results[0]["seconds"]
+    print("\n=== Parallel Export Scaling ===")
+    print(f"{'workers':>8} {'rows':>12} {'seconds':>9} {'rows/sec':>12} {'speedup':>8}")
+    for report in results:
+        rate = report["rows"] / report["seconds"]
+        print(
+            f"{report['workers']:>8} {report['rows']:>12} {report['seconds']:>9.2f} "
+            f"{rate:>12,.0f} {rate / baseline:>7.2f}x"
+        )
+
+
+def main():
+    """Parse arguments and run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    try:
+        run_benchmark(args.workers, args.gzip, args.batch_size)
+    finally:
+        db_config.close_connection()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Routing Prediction Benchmark
+Times the saved routing models over a sample of stored complaint descriptions
+and reports predictions per second for each head and for both together, as
+done when a complaint is filed. Train the models first:
+
+    python train_routing_model.py
+    python benchmarks/bench_routing.py --sample 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+from itertools import chain, islice
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.database import db_config
+from dao.dao_factory import dao_factory
+from search.naive_bayes import features
+from services.routing_service import load_routing_models
+
+
+def run_benchmark(sample: int, repeat: int):
+    """Predict every sampled description and print a throughput table"""
+    models = {head: model for head, model in load_routing_models().items() if model}
+    if not models:
+        print("No routing models found; run train_routing_model.py first")
+        return
+
+    rows = chain.from_iterable(
+        dao_factory.get_complaint_dao().iter_routing_examples(batch_size=5000)
+    )
+    descriptions = [row[2] or "" for row in islice(rows, sample)]
+    if not descriptions:
+        print("No complaints to sample")
+        return
+
+    def timed(predict) -> float:
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for description in descriptions:
+                predict(description)
+            best = min(best, time.perf_counter() - started)
+        return len(descriptions) / best
+
+    results = [
+        (f"{head} ({len(model.labels)} labels)", timed(model.predict))
+        for head, model in models.items()
+    ]
+
+    def predict_both(description: str):
+        counts = features(description)
+        for model in models.values():
+            model.predict_features(counts)
+
+    results.append(("both heads", timed(predict_both)))
+
+    print(f"\n=== Routing Predictions ({len(descriptions)} descriptions) ===")
+    print(f"{'model':<28} {'predictions/sec':>16}")
+    for name, rate in results:
+        print(f"{name:<28} {rate:>16,.0f}")
+
+
+def main():
+    """Parse arguments and run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sample", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    try:
+        run_benchmark(args.sample, args.repeat)
+    finally:
+        db_config.close_connection()
+
+
+if __name__ == "__main__":
+    main()
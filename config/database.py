@@ -1,5 +1,8 @@
 import os
-from typing import Optional
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Callable, Optional
 
 import pyodbc
 from dotenv import load_dotenv
@@ -7,6 +10,74 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+class StreamLimitError(Exception):
+    """No streaming connection slot became free in time"""
+
+
+class ConnectionPool:
+    """Bounded pool of database connections owned by a single process"""
+
+    def __init__(self, connect: Callable[[], pyodbc.Connection], size: int):
+        self.connect = connect
+        self.size = size
+        self.pid = os.getpid()
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float = 30.0) -> pyodbc.Connection:
+        """Take an idle connection, open a new one, or wait for one to be released"""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_create = self._created < self.size
+            if can_create:
+                self._created += 1
+
+        if can_create:
+            try:
+                return self.connect()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise Exception("Timed out waiting for a pooled database connection")
+
+    def release(self, conn: pyodbc.Connection):
+        """Return a connection to the pool, discarding it if it is broken"""
+        try:
+            # End any open read snapshot so the next borrower sees fresh data
+            conn.rollback()
+        except pyodbc.Error:
+            self.discard(conn)
+            return
+        self._idle.put(conn)
+
+    def discard(self, conn: pyodbc.Connection):
+        """Close a connection and free its slot in the pool"""
+        with self._lock:
+            self._created -= 1
+        try:
+            conn.close()
+        except pyodbc.Error:
+            pass
+
+    def close_all(self):
+        """Close every idle connection"""
+        while True:
+            try:
+                self.discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
+
+
 class DatabaseConfig:
     """Database configuration and connection management"""
 
@@ -16,6 +87,11 @@ class DatabaseConfig:
         self.username = os.getenv("DB_USER", "root")
         self.password = os.getenv("DB_PASSWORD", "")
         self.port = os.getenv("DB_PORT", "3306")
+        self.pool_size = int(os.getenv("DB_POOL_SIZE", "5"))
+        # Streaming queries hold their own connection outside the pool, so
+        # they get a separate cap, by default as many as the pool
+        self.stream_limit = int(os.getenv("DB_STREAM_LIMIT", str(self.pool_size)))
+        self.stream_wait = float(os.getenv("DB_STREAM_WAIT", "30"))
 
         self.possible_drivers = [
             os.getenv("DB_DRIVER", "{MySQL ODBC 9.3 Unicode Driver}"),
@@ -37,8 +113,25 @@ class DatabaseConfig:
         self.driver = None
         self.connection_string = None
         self._connection = None
+        self._pool: Optional[ConnectionPool] = None
+        self._local = threading.local()
+        self._inherited: list = []
+        self._stream_slots = threading.BoundedSemaphore(self.stream_limit)
 
         self._find_available_driver()
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._after_fork_in_child)
+
+    def _after_fork_in_child(self):
+        """Forget connections inherited from the parent process"""
+        # Closing, or garbage collecting, an inherited connection would end
+        # the parent's session on the server, so keep them referenced but unused
+        self._inherited.append((self._connection, self._pool))
+        self._connection = None
+        self._pool = None
+        self._local = threading.local()
+        # Slots held by parent threads would never be released here
+        self._stream_slots = threading.BoundedSemaphore(self.stream_limit)
 
     def _find_available_driver(self):
         """Find an available MySQL ODBC driver"""
@@ -80,7 +173,7 @@ class DatabaseConfig:
         )
 
     def get_connection(self):
-        """Get database connection"""
+        """Get the dedicated connection used by setup and maintenance scripts"""
         try:
             if self._connection is None or not self._connection:
                 if not self.connection_string:
@@ -105,58 +198,197 @@ class DatabaseConfig:
             print(f"Connection configuration error: {e}")
             raise
 
+    def open_connection(self, streaming: bool = False):
+        """Open a dedicated connection that is not shared with other callers"""
+        if not self.connection_string:
+            raise Exception("Database connection string not configured")
+
+        connection_string = self.connection_string
+        if streaming:
+            # Let the driver stream forward-only result sets from the server
+            # instead of buffering the whole result in client memory
+            connection_string += "NO_CACHE=1;"
+
+        conn = pyodbc.connect(connection_string)
+        conn.autocommit = False
+        return conn
+
+    def get_pool(self) -> ConnectionPool:
+        """Get this process's connection pool, building it on first use"""
+        if self._pool is None or self._pool.pid != os.getpid():
+            # Connections inherited across fork() share sockets with the
+            # parent process, so a forked child always builds its own pool
+            self._pool = ConnectionPool(self.open_connection, self.pool_size)
+            self._local = threading.local()
+        return self._pool
+
+    @contextmanager
+    def connection(self):
+        """Borrow a pooled connection for the current thread
+
+        Nested use on the same thread (a query inside a transaction) reuses
+        the connection already borrowed, so both see the same transaction.
+        """
+        pool = self.get_pool()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            yield conn
+            return
+
+        conn = pool.acquire()
+        self._local.conn = conn
+        try:
+            yield conn
+        finally:
+            self._local.conn = None
+            pool.release(conn)
+
     def close_connection(self):
-        """Close database connection"""
+        """Close database connections"""
         if self._connection:
             self._connection.close()
             self._connection = None
+        if self._pool is not None and self._pool.pid == os.getpid():
+            self._pool.close_all()
 
     def execute_query(self, query: str, params: tuple = None):
         """Execute a SELECT query and return results"""
-        cursor = None
-        try:
-            conn = self.get_connection()
+        with self.connection() as conn:
             cursor = conn.cursor()
+            try:
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
 
+                results = cursor.fetchall()
+                return results
+            except pyodbc.Error as e:
+                print(f"Query execution error: {e}")
+                raise
+            finally:
+                cursor.close()
+
+    def stream_query(
+        self, query: str, params: Optional[tuple] = None, batch_size: int = 1000
+    ):
+        """Execute a SELECT query and yield its rows in fetchmany batches
+
+        Runs on its own streaming connection, so memory stays bounded by
+        batch_size however large the result is, and pooled connections
+        remain free for other queries while the stream is being consumed.
+        At most stream_limit streams are open per process. The first batch
+        waits up to stream_wait seconds (or the stream_timeout in effect on
+        this thread) for a slot, then raises StreamLimitError.
+        """
+        slots = self._stream_slots
+        wait = getattr(self._local, "stream_wait", self.stream_wait)
+        if not slots.acquire(timeout=wait):
+            raise StreamLimitError("Too many streaming queries in progress")
+        try:
+            conn = self.open_connection(streaming=True)
+        except Exception:
+            slots.release()
+            raise
+        cursor = conn.cursor()
+        try:
             if params:
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
 
-            results = cursor.fetchall()
-            return results
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
         except pyodbc.Error as e:
-            print(f"Query execution error: {e}")
+            print(f"Query streaming error: {e}")
             raise
         finally:
-            if cursor:
-                cursor.close()
+            cursor.close()
+            conn.close()
+            slots.release()
+
+    @contextmanager
+    def stream_timeout(self, seconds: float):
+        """Wait at most seconds for a streaming slot on this thread
+
+        For request handlers, which should answer busy rather than hold a
+        handler thread that running streams need to make progress.
+        """
+        previous = getattr(self._local, "stream_wait", None)
+        self._local.stream_wait = seconds
+        try:
+            yield
+        finally:
+            if previous is None:
+                del self._local.stream_wait
+            else:
+                self._local.stream_wait = previous
 
     def execute_non_query(self, query: str, params: tuple = None):
         """Execute INSERT, UPDATE, DELETE queries"""
-        conn = None
-        cursor = None
-        try:
-            conn = self.get_connection()
+        with self.connection() as conn:
             cursor = conn.cursor()
+            try:
+                if params:
+                    cursor.execute(query, params)
+                else:
+                    cursor.execute(query)
 
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
+                conn.commit()
+                affected_rows = cursor.rowcount
+                return affected_rows
+            except pyodbc.Error as e:
+                conn.rollback()
+                print(f"Non-query execution error: {e}")
+                raise
+            finally:
+                cursor.close()
 
-            conn.commit()
-            affected_rows = cursor.rowcount
-            return affected_rows
-        except pyodbc.Error as e:
-            if conn:
+    @contextmanager
+    def transaction(self):
+        """Run several statements on one cursor and commit them together"""
+        with self.connection() as conn:
+            cursor = conn.cursor()
+            try:
+                yield cursor
+                conn.commit()
+            except Exception:
                 conn.rollback()
-            print(f"Non-query execution error: {e}")
-            raise
-        finally:
-            if cursor:
+                raise
+            finally:
                 cursor.close()
 
+    def ensure_index(
+        self, table: str, index_name: str, columns: str, kind: str = "INDEX"
+    ) -> bool:
+        """Create an index on an existing table unless it is already there"""
+        query = """
+            SELECT COUNT(*) FROM information_schema.statistics
+            WHERE table_schema = DATABASE() AND table_name = ? AND index_name = ?
+        """
+        results = self.execute_query(query, (table, index_name))
+        if results and results[0][0]:
+            return False
+
+        self.execute_non_query(f"CREATE {kind} {index_name} ON {table} ({columns})")
+        return True
+
+    def ensure_column(self, table: str, column: str, definition: str) -> bool:
+        """Add a column to an existing table unless it is already there"""
+        query = """
+            SELECT COUNT(*) FROM information_schema.columns
+            WHERE table_schema = DATABASE() AND table_name = ? AND column_name = ?
+        """
+        results = self.execute_query(query, (table, column))
+        if results and results[0][0]:
+            return False
+
+        self.execute_non_query(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+        return True
+
     def create_tables(self):
         """Create database tables if they don't exist"""
         tables = [
@@ -171,15 +403,26 @@ class DatabaseConfig:
             )
             """,
             """
+            CREATE TABLE IF NOT EXISTS categories (
+                id MEDIUMINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
+                name VARCHAR(255) NOT NULL UNIQUE
+            )
+            """,
+            """
             CREATE TABLE IF NOT EXISTS complaints (
                 id INT AUTO_INCREMENT PRIMARY KEY,
                 user_id INT NOT NULL,
                 category VARCHAR(255) NOT NULL,
+                category_id MEDIUMINT UNSIGNED NULL,
                 description TEXT NOT NULL,
                 status ENUM('Pending', 'In Progress', 'Resolved') DEFAULT 'Pending',
                 assigned_to INT NULL,
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                last_comment_at TIMESTAMP NULL,
+                duplicate_of INT NULL,
+                resolved_at TIMESTAMP NULL,
+                first_response_at TIMESTAMP NULL,
                 FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
                 FOREIGN KEY (assigned_to) REFERENCES users(id) ON DELETE SET NULL
             )
@@ -195,11 +438,168 @@ class DatabaseConfig:
                 FOREIGN KEY (staff_id) REFERENCES users(id) ON DELETE CASCADE
             )
             """,
+            """
+            CREATE TABLE IF NOT EXISTS complaint_stats (
+                dimension ENUM('status', 'category') NOT NULL,
+                bucket VARCHAR(255) NOT NULL,
+                complaint_count INT NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                PRIMARY KEY (dimension, bucket)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS complaint_daily_stats (
+                day DATE NOT NULL,
+                category_id MEDIUMINT UNSIGNED NOT NULL,
+                created_count INT NOT NULL DEFAULT 0,
+                resolved_count INT NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, category_id)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS complaint_signatures (
+                complaint_id INT PRIMARY KEY,
+                signature VARBINARY(256) NOT NULL,
+                FOREIGN KEY (complaint_id) REFERENCES complaints(id) ON DELETE CASCADE
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS complaint_lsh_bands (
+                band_key BIGINT NOT NULL,
+                complaint_id INT NOT NULL,
+                PRIMARY KEY (band_key, complaint_id),
+                FOREIGN KEY (complaint_id) REFERENCES complaints(id) ON DELETE CASCADE
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS complaint_tombstones (
+                id INT AUTO_INCREMENT PRIMARY KEY,
+                complaint_id INT NOT NULL,
+                deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS export_watermarks (
+                export_name VARCHAR(100) PRIMARY KEY,
+                last_updated_at TIMESTAMP NULL DEFAULT NULL,
+                last_complaint_id INT NOT NULL DEFAULT 0,
+                last_tombstone_id INT NOT NULL DEFAULT 0,
+                exported_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+            )
+            """,
+        ]
+
+        # Columns added after the first release, for databases created earlier,
+        # with the statement that fills them in from existing data
+        columns = [
+            # Denormalized newest comment time, maintained by CommentDAOImpl.
+            # Setting updated_at to itself stops ON UPDATE from bumping it, so
+            # the backfill does not show up in incremental exports.
+            (
+                "complaints",
+                "last_comment_at",
+                "TIMESTAMP NULL",
+                """
+                UPDATE complaints c
+                JOIN (
+                    SELECT complaint_id, MAX(created_at) AS last_comment_at
+                    FROM complaint_comments
+                    GROUP BY complaint_id
+                ) latest ON latest.complaint_id = c.id
+                SET c.last_comment_at = latest.last_comment_at,
+                    c.updated_at = c.updated_at
+                """,
+            ),
+            # Likely original of a near-duplicate complaint, set at creation
+            # time or by dedupe_complaints.py --link
+            ("complaints", "duplicate_of", "INT NULL", None),
+            # Integer category key, filled in by category_backfill below
+            ("complaints", "category_id", "MEDIUMINT UNSIGNED NULL", None),
+            # Set on every transition into Resolved and cleared on reopening.
+            # Earlier resolutions were not timestamped, so the backfill uses
+            # the last update of every complaint already resolved. That is at
+            # or after the real resolution, so resolution-time percentiles
+            # over these complaints are approximate and skew high.
+            (
+                "complaints",
+                "resolved_at",
+                "TIMESTAMP NULL",
+                """
+                UPDATE complaints
+                SET resolved_at = updated_at, updated_at = updated_at
+                WHERE status = 'Resolved'
+                """,
+            ),
+            # Time of the first staff comment, maintained by CommentDAOImpl
+            (
+                "complaints",
+                "first_response_at",
+                "TIMESTAMP NULL",
+                """
+                UPDATE complaints c
+                JOIN (
+                    SELECT complaint_id, MIN(created_at) AS first_response_at
+                    FROM complaint_comments
+                    GROUP BY complaint_id
+                ) first ON first.complaint_id = c.id
+                SET c.first_response_at = first.first_response_at,
+                    c.updated_at = c.updated_at
+                """,
+            ),
+        ]
+
+        # Integer category keys: the categories dictionary gets every name in
+        # use, then complaints get their id. Both are idempotent and only touch
+        # rows still missing an id, such as rows from before the migration or
+        # from writers that only set the category name.
+        category_backfill = [
+            """
+            INSERT IGNORE INTO categories (name)
+            SELECT DISTINCT category FROM complaints WHERE category_id IS NULL
+            """,
+            """
+            UPDATE complaints c
+            JOIN categories k ON k.name = c.category
+            SET c.category_id = k.id, c.updated_at = c.updated_at
+            WHERE c.category_id IS NULL
+            """,
+        ]
+
+        indexes = [
+            # Keyset scans for incremental export: WHERE (updated_at, id) > watermark
+            ("complaints", "idx_complaints_updated_at", "updated_at, id"),
+            # Staff queues sorted by recent activity
+            (
+                "complaints",
+                "idx_complaints_assignee_activity",
+                "assigned_to, last_comment_at",
+            ),
+            # Category lookups resolved from the in-memory category catalog
+            ("complaints", "idx_complaints_category_id", "category_id, id"),
+            # Comment activity scans when refreshing the embedded search index
+            ("complaints", "idx_complaints_last_comment_at", "last_comment_at"),
+            # Analytics snapshots streamed in creation order
+            ("complaints", "idx_complaints_created_at", "created_at, id"),
+            # Keyword search over descriptions and comments
+            (
+                "complaints",
+                "ft_complaints_description",
+                "description",
+                "FULLTEXT INDEX",
+            ),
+            ("complaint_comments", "ft_comments_comment", "comment", "FULLTEXT INDEX"),
         ]
 
         try:
             for table_sql in tables:
                 self.execute_non_query(table_sql)
+            for table, column, definition, backfill_sql in columns:
+                if self.ensure_column(table, column, definition) and backfill_sql:
+                    self.execute_non_query(backfill_sql)
+            for backfill_sql in category_backfill:
+                self.execute_non_query(backfill_sql)
+            for table, index_name, index_columns, *kind in indexes:
+                self.ensure_index(table, index_name, index_columns, *kind)
             print("Database tables created successfully.")
         except Exception as e:
             print(f"Error creating tables: {e}")
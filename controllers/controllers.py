@@ -1,7 +1,40 @@
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional
+
 from services.comment_service import CommentService
 from services.complaint_service import ComplaintService
 from services.user_service import UserService
-from views.views import ComplaintView, UserView
+from views.views import INCREMENTAL_EXPORT_FIELDS, ComplaintView, UserView
+
+# Latest comments shown under each complaint in the staff queue
+QUEUE_PREVIEW_COMMENTS = 3
+
+# Comments loaded per page on the complaint detail screen
+DETAIL_COMMENT_PAGE = 20
+
+# Similar resolved complaints suggested to staff on the detail screen
+SIMILAR_RESOLVED_LIMIT = 5
+
+# Days of filed vs resolved trend shown with the admin statistics
+STATISTICS_TREND_DAYS = 14
+
+
+def export_partition(task: dict) -> dict:
+    """Process pool entry point: stream one id range of complaints to a part file"""
+    complaint_service = ComplaintService()
+    batches = complaint_service.iter_export_batches(
+        task["user_id"],
+        task["user_id"] is None,
+        task["batch_size"],
+        id_range=task["id_range"],
+    )
+    rows = ComplaintView().write_complaint_rows(
+        batches, task["filename"], task["compress"], include_header=False
+    )
+    return {"file": task["filename"], "rows": rows, "id_range": task["id_range"]}
 
 
 class UserController:
@@ -110,17 +143,48 @@ class ComplaintController:
         self.user_service = UserService()
         self.complaint_view = ComplaintView()
 
+    def resolve_category(self, typed: str) -> str:
+        """Map typed text to an existing category, offering suggestions if new"""
+        canonical: Optional[str] = self.complaint_service.canonical_category(typed)
+        if canonical is not None:
+            return canonical
+        suggestions = self.complaint_service.suggest_categories(typed)
+        if not suggestions:
+            return typed
+        choice: str = self.complaint_view.choose_category(typed, suggestions)
+        return choice
+
+    def suggest_category(self, description: str) -> str:
+        """Offer the predicted category for a description, or return ''"""
+        suggestion = self.complaint_service.suggest_routing(description)
+        if "category" not in suggestion:
+            return ""
+        if self.complaint_view.confirm_suggested_category(
+            suggestion["category"], suggestion["category_confidence"]
+        ):
+            category: str = suggestion["category"]
+            return category
+        return ""
+
     def register_complaint(self, user_id: int):
         """Handle complaint registration"""
         try:
             complaint_data = self.complaint_view.get_complaint_input()
 
+            if complaint_data["description"] and not complaint_data["category"]:
+                complaint_data["category"] = self.suggest_category(
+                    complaint_data["description"]
+                )
+
             if not all([complaint_data["category"], complaint_data["description"]]):
                 self.complaint_view.display_error(
                     "Category and description are required"
                 )
                 return False
 
+            complaint_data["category"] = self.resolve_category(
+                complaint_data["category"]
+            )
             if self.complaint_service.create_complaint(
                 user_id, complaint_data["category"], complaint_data["description"]
             ):
@@ -153,12 +217,38 @@ class ComplaintController:
             self.complaint_view.display_error(f"Error viewing all complaints: {e}")
             return []
 
-    def view_complaint_details(self, complaint_id: int):
-        """View detailed complaint information"""
+    def view_complaint_details(self, complaint_id: int, show_similar: bool = False):
+        """View detailed complaint information
+
+        With show_similar, staff also get the resolved complaints most
+        similar to this one and how each was resolved.
+        """
         try:
-            complaint = self.complaint_service.find_complaint_by_id(complaint_id)
-            comments = self.comment_service.find_comments_by_complaint_id(complaint_id)
+            complaint, comments = self.complaint_service.get_complaint_details(
+                complaint_id, DETAIL_COMMENT_PAGE
+            )
             self.complaint_view.display_complaint_details(complaint, comments)
+            if complaint and show_similar:
+                self.complaint_view.display_similar_complaints(
+                    self.complaint_service.find_similar_resolved(
+                        complaint, SIMILAR_RESOLVED_LIMIT
+                    )
+                )
+
+            # Older comments are fetched a page at a time, only on request
+            shown = len(comments)
+            before_id = None
+            if complaint and len(comments) == DETAIL_COMMENT_PAGE:
+                before_id = comments[0]["id"]
+            while before_id is not None and self.complaint_view.confirm_load_older(
+                shown, complaint.get("comment_count")
+            ):
+                page = self.comment_service.find_comment_page(
+                    complaint_id, DETAIL_COMMENT_PAGE, before_id
+                )
+                self.complaint_view.display_comments(page["comments"], "Older Comments")
+                shown += len(page["comments"])
+                before_id = page["next_before_id"]
             return complaint
         except Exception as e:
             self.complaint_view.display_error(f"Error viewing complaint details: {e}")
@@ -208,7 +298,12 @@ class ComplaintController:
     def view_assigned_complaints(self, staff_id: int):
         """View complaints assigned to staff member"""
         try:
-            complaints = self.complaint_service.find_assigned_complaints(staff_id)
+            complaints = self.complaint_service.find_with_comments(
+                {"assigned_to": staff_id},
+                page_size=None,
+                max_comments=QUEUE_PREVIEW_COMMENTS,
+                order_by="activity",
+            )
             self.complaint_view.display_complaint_list(complaints, show_user=True)
             return complaints
         except Exception as e:
@@ -259,17 +354,36 @@ class ComplaintController:
         """Search complaints by category"""
         try:
             category = self.complaint_view.get_search_category()
+            if category:
+                category = self.resolve_category(category)
+            complaints = self.complaint_service.search_by_category(
+                category, user_id, is_admin
+            )
+            self.complaint_view.display_complaint_list(complaints, show_user=is_admin)
+            return complaints
+        except Exception as e:
+            self.complaint_view.display_error(f"Search error: {e}")
+            return []
+
+    def search_complaints(
+        self,
+        user_id: Optional[int] = None,
+        is_admin: bool = False,
+        staff_id: Optional[int] = None,
+    ):
+        """Keyword search over complaint descriptions and comments"""
+        try:
+            text = self.complaint_view.get_search_text()
             if is_admin:
-                complaints = self.complaint_service.find_complaints_by_category(
-                    category
-                )
+                filters: Dict[str, Any] = {}
+            elif staff_id is not None:
+                filters = {"assigned_to": staff_id}
             else:
-                complaints = (
-                    self.complaint_service.find_complaints_by_user_and_category(
-                        user_id, category
-                    )
-                )
-            self.complaint_view.display_complaint_list(complaints, show_user=is_admin)
+                filters = {"user_id": user_id}
+            complaints = self.complaint_service.search(text, filters)
+            self.complaint_view.display_complaint_list(
+                complaints, show_user=user_id is None
+            )
             return complaints
         except Exception as e:
             self.complaint_view.display_error(f"Search error: {e}")
@@ -291,18 +405,154 @@ class ComplaintController:
         user_id: int = None,
         is_admin: bool = False,
         filename: str = "complaints_export.csv",
+        compress: bool = False,
+        progress_callback=None,
+        batch_size: int = 1000,
+    ):
+        """Export complaints to CSV, streaming rows from the database in batches"""
+        try:
+            if compress and not filename.endswith(".gz"):
+                filename += ".gz"
+            batches = self.complaint_service.iter_export_batches(
+                user_id, is_admin, batch_size
+            )
+            if self.complaint_view.export_complaints_to_csv(
+                batches, filename, compress, progress_callback
+            ):
+                return True
+            return False
+        except Exception as e:
+            self.complaint_view.display_error(f"Export error: {e}")
+            return False
+
+    def export_complaint_history(
+        self,
+        user_id: Optional[int] = None,
+        is_admin: bool = False,
+        filename: str = "complaints_history.jsonl",
+        compress: bool = False,
+        progress_callback=None,
+        batch_size: int = 500,
+    ):
+        """Export complaints with their full comment history as JSON lines"""
+        try:
+            if compress and not filename.endswith(".gz"):
+                filename += ".gz"
+            batches = self.complaint_service.iter_history_batches(
+                user_id, is_admin, batch_size
+            )
+            return self.complaint_view.export_complaint_history(
+                batches, filename, compress, progress_callback
+            )
+        except Exception as e:
+            self.complaint_view.display_error(f"Export error: {e}")
+            return False
+
+    def export_complaints_parallel(
+        self,
+        user_id: Optional[int] = None,
+        is_admin: bool = False,
+        filename: str = "complaints_export.csv",
+        workers: int = 4,
+        partitions: Optional[int] = None,
+        compress: bool = False,
+        manifest: bool = False,
+        batch_size: int = 1000,
     ):
-        """Export complaints to CSV"""
+        """Export complaints with a process pool, one id-range partition per task
+
+        Each worker process opens its own streaming connection and writes a
+        headerless part file. The parts are then joined into filename, or
+        listed in a <filename>.manifest.json file when manifest is set.
+        """
         try:
+            started = time.perf_counter()
+            if compress and not filename.endswith(".gz"):
+                filename += ".gz"
             if is_admin:
-                complaints = self.complaint_service.find_all_complaints()
+                user_id = None
+            part_name = filename[:-3] if filename.endswith(".gz") else filename
+
+            tasks = []
+            id_range = self.complaint_service.get_export_id_range(user_id, is_admin)
+            if id_range:
+                # More partitions than workers keeps every worker busy when
+                # deletes leave some id ranges much sparser than others
+                start, end = id_range[0], id_range[1] + 1
+                partitions = partitions or workers * 4
+                step = max(1, math.ceil((end - start) / partitions))
+                for index, lower in enumerate(range(start, end, step)):
+                    suffix = ".gz" if compress else ""
+                    tasks.append(
+                        {
+                            "user_id": user_id,
+                            "id_range": (lower, min(lower + step, end)),
+                            "filename": f"{part_name}.part{index:04d}{suffix}",
+                            "compress": compress,
+                            "batch_size": batch_size,
+                        }
+                    )
+
+            # Spawned workers never inherit the parent's open database connection
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                parts = list(pool.map(export_partition, tasks))
+
+            if manifest:
+                filename = f"{part_name}.manifest.json"
+                self.complaint_view.write_export_manifest(filename, parts, compress)
             else:
-                complaints = self.complaint_service.find_complaints_by_user_id(user_id)
-            if self.complaint_view.export_complaints_to_csv(complaints, filename):
+                self.complaint_view.concatenate_export_parts(
+                    filename, [part["file"] for part in parts], compress
+                )
+
+            rows = sum(part["rows"] for part in parts)
+            elapsed = time.perf_counter() - started
+            self.complaint_view.display_export_report(filename, rows, elapsed)
+            return {
+                "rows": rows,
+                "seconds": elapsed,
+                "workers": workers,
+                "partitions": len(tasks),
+            }
+        except Exception as e:
+            self.complaint_view.display_error(f"Parallel export error: {e}")
+            return None
+
+    def export_incremental_changes_to_csv(
+        self,
+        export_name: str = "default",
+        filename: str = "complaints_delta.csv",
+        compress: bool = False,
+        progress_callback=None,
+        batch_size: int = 1000,
+    ):
+        """Export complaints changed or deleted since the last run of export_name"""
+        try:
+            if compress and not filename.endswith(".gz"):
+                filename += ".gz"
+            watermark = self.complaint_service.get_export_watermark(export_name)
+            batches = self.complaint_service.iter_incremental_export(
+                watermark, batch_size
+            )
+            if not self.complaint_view.export_complaints_to_csv(
+                batches,
+                filename,
+                compress,
+                progress_callback,
+                fields=INCREMENTAL_EXPORT_FIELDS,
+            ):
+                return False
+
+            # Only move the watermark once the delta file is safely written
+            if self.complaint_service.save_export_watermark(export_name, watermark):
                 return True
+            self.complaint_view.display_error(
+                "Export written but its watermark could not be saved"
+            )
             return False
         except Exception as e:
-            self.complaint_view.display_error(f"Export error: {e}")
+            self.complaint_view.display_error(f"Incremental export error: {e}")
             return False
 
     def view_complaint_statistics(self):
@@ -310,6 +560,12 @@ class ComplaintController:
         try:
             stats = self.complaint_service.get_statistics()
             self.complaint_view.display_complaint_statistics(stats)
+            self.complaint_view.display_trends(
+                self.complaint_service.get_trends(STATISTICS_TREND_DAYS)
+            )
+            self.complaint_view.display_resolution_times(
+                self.complaint_service.get_resolution_times()
+            )
             return stats
         except Exception as e:
             self.complaint_view.display_error(f"Statistics error: {e}")
@@ -0,0 +1,26 @@
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, Optional
+
+
+class CategoryDAO(ABC):
+    """Abstract interface for the category dictionary"""
+
+    @abstractmethod
+    def find_all(self) -> Dict[int, str]:
+        """Get every category name by id"""
+        pass
+
+    @abstractmethod
+    def find_ids(self, names: Iterable[str]) -> Dict[str, int]:
+        """Get the ids of existing categories, skipping unknown names"""
+        pass
+
+    @abstractmethod
+    def get_or_create_ids(self, names: Iterable[str]) -> Dict[str, Optional[int]]:
+        """Get category ids, adding categories that do not exist yet"""
+        pass
+
+    @abstractmethod
+    def find_name(self, category_id: int) -> Optional[str]:
+        """Get a category name by id"""
+        pass
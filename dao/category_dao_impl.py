@@ -0,0 +1,121 @@
+import threading
+from typing import Dict, Iterable, Optional
+
+from config.database import db_config
+from dao.category_dao import CategoryDAO
+
+
+class CategoryDictionary:
+    """Process-wide cache of category name <-> id
+
+    Categories are few and never renamed or removed, so entries never go
+    stale and the cache only has to fill misses. Which spellings name the
+    same category is up to the table's collation (case- and, by default,
+    accent-insensitive), so every spelling is cached exactly as looked up,
+    under the id the database matched it to.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.ids: Dict[str, int] = {}
+        self.names: Dict[int, str] = {}
+
+    def get_id(self, name: str) -> Optional[int]:
+        return self.ids.get(name)
+
+    def store(self, category_id: int, name: str, spelling: Optional[str] = None):
+        """Cache a category row and the spelling a lookup matched it with"""
+        with self._lock:
+            self.names[category_id] = name
+            self.ids[name] = category_id
+            if spelling is not None:
+                self.ids[spelling] = category_id
+
+
+category_dictionary = CategoryDictionary()
+
+
+class CategoryDAOImpl(CategoryDAO):
+    """Concrete implementation of CategoryDAO backed by category_dictionary"""
+
+    def __init__(self) -> None:
+        self.db = db_config
+        self.dictionary = category_dictionary
+
+    def _load(self, names: Iterable[str]):
+        """Fill dictionary misses for names with one query per 500 names
+
+        Each requested name is echoed back beside the row it matched, so the
+        database's collation, not Python, decides which category it names.
+        """
+        missing = list(
+            dict.fromkeys(n for n in names if self.dictionary.get_id(n) is None)
+        )
+        for start in range(0, len(missing), 500):
+            chunk = missing[start : start + 500]
+            query = " UNION ALL ".join(
+                ["SELECT ?, id, name FROM categories WHERE name = ?"] * len(chunk)
+            )
+            params = tuple(value for name in chunk for value in (name, name))
+            for row in self.db.execute_query(query, params):
+                self.dictionary.store(row[1], row[2], spelling=row[0])
+
+    def find_all(self) -> Dict[int, str]:
+        """Get every category name by id"""
+        try:
+            for row in self.db.execute_query("SELECT id, name FROM categories"):
+                self.dictionary.store(row[0], row[1])
+            return dict(self.dictionary.names)
+        except Exception as e:
+            print(f"Error finding categories: {e}")
+            return {}
+
+    def find_ids(self, names: Iterable[str]) -> Dict[str, int]:
+        """Get the ids of existing categories, skipping unknown names"""
+        try:
+            names = list(names)
+            self._load(names)
+            ids = {}
+            for name in names:
+                category_id = self.dictionary.get_id(name)
+                if category_id is not None:
+                    ids[name] = category_id
+            return ids
+        except Exception as e:
+            print(f"Error finding category ids: {e}")
+            return {}
+
+    def get_or_create_ids(self, names: Iterable[str]) -> Dict[str, Optional[int]]:
+        """Get category ids, adding categories that do not exist yet
+
+        New names are inserted in their own committed transaction, so an id
+        handed out here stays valid even if the caller's write rolls back.
+        Raises on database errors so the caller's write fails with it.
+        """
+        names = list(names)
+        self._load(names)
+        missing = [n for n in names if self.dictionary.get_id(n) is None]
+        if missing:
+            with self.db.transaction() as cursor:
+                cursor.executemany(
+                    "INSERT IGNORE INTO categories (name) VALUES (?)",
+                    [(name,) for name in dict.fromkeys(missing)],
+                )
+            self._load(missing)
+        return {name: self.dictionary.get_id(name) for name in names}
+
+    def find_name(self, category_id: int) -> Optional[str]:
+        """Get a category name by id"""
+        try:
+            name = self.dictionary.names.get(category_id)
+            if name is None:
+                results = self.db.execute_query(
+                    "SELECT name FROM categories WHERE id = ?", (category_id,)
+                )
+                if results:
+                    name = results[0][0]
+                    self.dictionary.store(category_id, name)
+            return name
+        except Exception as e:
+            print(f"Error finding category name: {e}")
+            return None
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from dao.base_dao import BaseDAO
 
@@ -16,3 +16,29 @@ class CommentDAO(BaseDAO):
     def find_by_user_id(self, user_id: int) -> List[dict]:
         """Find comments by user ID"""
         pass
+
+    @abstractmethod
+    def find_by_complaint_ids(
+        self,
+        complaint_ids: Iterable[int],
+        max_per_complaint: Optional[int] = None,
+        raise_errors: bool = False,
+    ) -> List[dict]:
+        """Find the comments of many complaints, optionally the newest N of each"""
+        pass
+
+    @abstractmethod
+    def count_by_complaint_ids(self, complaint_ids: Iterable[int]) -> Dict[int, int]:
+        """Count comments per complaint; complaints without comments are omitted"""
+        pass
+
+    @abstractmethod
+    def find_page_by_complaint_id(
+        self,
+        complaint_id: int,
+        limit: int = 50,
+        before_id: Optional[int] = None,
+        since_id: Optional[int] = None,
+    ) -> List[dict]:
+        """Find one page of a complaint's comments, oldest first within the page"""
+        pass
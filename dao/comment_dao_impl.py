@@ -1,4 +1,4 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
 from config.database import db_config
 from dao.comment_dao import CommentDAO
@@ -25,15 +25,36 @@ class CommentDAOImpl(CommentDAO):
             if not results:
                 return False
 
-            # Add the comment
-            query = """
-                INSERT INTO complaint_comments (complaint_id, staff_id, comment)
-                VALUES (?, ?, ?)
-            """
-            self.db.execute_non_query(
-                query,
-                (comment_dto.complaint_id, comment_dto.user_id, comment_dto.comment),
-            )
+            # Add the comment and record it as the complaint's latest activity
+            # in the same transaction. Setting updated_at to itself keeps a
+            # comment from marking the complaint as changed for exports.
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO complaint_comments (complaint_id, staff_id, comment)
+                    VALUES (?, ?, ?)
+                    """,
+                    (
+                        comment_dto.complaint_id,
+                        comment_dto.user_id,
+                        comment_dto.comment,
+                    ),
+                )
+                cursor.execute(
+                    """
+                    UPDATE complaints
+                    SET last_comment_at = (
+                            SELECT created_at FROM complaint_comments
+                            WHERE id = LAST_INSERT_ID()
+                        ),
+                        first_response_at = COALESCE(
+                            first_response_at, last_comment_at
+                        ),
+                        updated_at = updated_at
+                    WHERE id = ?
+                    """,
+                    (comment_dto.complaint_id,),
+                )
             return True
         except Exception as e:
             print(f"Error creating comment: {e}")
@@ -107,8 +128,37 @@ class CommentDAOImpl(CommentDAO):
     def delete(self, entity_id: int) -> bool:
         """Delete a comment"""
         try:
-            query = "DELETE FROM complaint_comments WHERE id = ?"
-            self.db.execute_non_query(query, (entity_id,))
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    "SELECT complaint_id FROM complaint_comments WHERE id = ?",
+                    (entity_id,),
+                )
+                row = cursor.fetchone()
+                cursor.execute(
+                    "DELETE FROM complaint_comments WHERE id = ?", (entity_id,)
+                )
+                if row:
+                    # Unlike a new comment, a deletion bumps updated_at: the
+                    # complaint re-enters the incremental feed, so the search
+                    # index re-indexes it without the deleted text. The first
+                    # response may have been the deleted comment, so it is
+                    # recomputed from the remaining ones (NULL if none are left).
+                    cursor.execute(
+                        """
+                        UPDATE complaints
+                        SET last_comment_at = (
+                                SELECT MAX(created_at) FROM complaint_comments
+                                WHERE complaint_id = ?
+                            ),
+                            first_response_at = (
+                                SELECT MIN(created_at) FROM complaint_comments
+                                WHERE complaint_id = ?
+                            ),
+                            updated_at = CURRENT_TIMESTAMP
+                        WHERE id = ?
+                        """,
+                        (row[0], row[0], row[0]),
+                    )
             return True
         except Exception as e:
             print(f"Error deleting comment: {e}")
@@ -169,3 +219,142 @@ class CommentDAOImpl(CommentDAO):
         except Exception as e:
             print(f"Error finding comments by user ID: {e}")
             return []
+
+    def find_by_complaint_ids(
+        self,
+        complaint_ids: Iterable[int],
+        max_per_complaint: Optional[int] = None,
+        raise_errors: bool = False,
+    ) -> List[dict]:
+        """Find the comments of many complaints with one IN query per 500 ids
+
+        Comments come back ordered by complaint and then oldest first. With
+        max_per_complaint only the newest N comments of each complaint are
+        returned, ranked on the server with ROW_NUMBER(). With raise_errors
+        a database error is raised instead of giving an empty list.
+        """
+        try:
+            comments = []
+            unique_ids = list(dict.fromkeys(complaint_ids))
+            for start in range(0, len(unique_ids), 500):
+                chunk = unique_ids[start : start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                params: List[Any] = list(chunk)
+                if max_per_complaint is None:
+                    query = f"""
+                        SELECT cc.id, cc.complaint_id, cc.staff_id, cc.comment,
+                               cc.created_at, u.name
+                        FROM complaint_comments cc
+                        JOIN users u ON cc.staff_id = u.id
+                        WHERE cc.complaint_id IN ({placeholders})
+                        ORDER BY cc.complaint_id, cc.id
+                    """  # nosec B608 - only placeholders are interpolated
+                else:
+                    query = f"""
+                        SELECT id, complaint_id, staff_id, comment, created_at, name
+                        FROM (
+                            SELECT cc.id, cc.complaint_id, cc.staff_id, cc.comment,
+                                   cc.created_at, u.name,
+                                   ROW_NUMBER() OVER (
+                                       PARTITION BY cc.complaint_id ORDER BY cc.id DESC
+                                   ) AS position
+                            FROM complaint_comments cc
+                            JOIN users u ON cc.staff_id = u.id
+                            WHERE cc.complaint_id IN ({placeholders})
+                        ) ranked
+                        WHERE position <= ?
+                        ORDER BY complaint_id, id
+                    """  # nosec B608 - only placeholders are interpolated
+                    params.append(max_per_complaint)
+
+                for row in self.db.execute_query(query, tuple(params)):
+                    comment_dto = CommentDTO(
+                        id=row[0],
+                        complaint_id=row[1],
+                        user_id=row[2],
+                        comment=row[3],
+                        created_at=row[4],
+                        user_name=row[5],
+                    )
+                    comments.append(comment_dto.to_dict())
+            return comments
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"Error finding comments by complaint IDs: {e}")
+            return []
+
+    def count_by_complaint_ids(self, complaint_ids: Iterable[int]) -> Dict[int, int]:
+        """Count the comments of many complaints with one GROUP BY per 500 ids"""
+        try:
+            counts = {}
+            unique_ids = list(dict.fromkeys(complaint_ids))
+            for start in range(0, len(unique_ids), 500):
+                chunk = unique_ids[start : start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                query = f"""
+                    SELECT complaint_id, COUNT(*)
+                    FROM complaint_comments
+                    WHERE complaint_id IN ({placeholders})
+                    GROUP BY complaint_id
+                """  # nosec B608 - only placeholders are interpolated
+                for row in self.db.execute_query(query, tuple(chunk)):
+                    counts[row[0]] = row[1]
+            return counts
+        except Exception as e:
+            print(f"Error counting comments by complaint IDs: {e}")
+            return {}
+
+    def find_page_by_complaint_id(
+        self,
+        complaint_id: int,
+        limit: int = 50,
+        before_id: Optional[int] = None,
+        since_id: Optional[int] = None,
+    ) -> List[dict]:
+        """Find one page of a complaint's comments using the comment id as cursor
+
+        By default returns the newest `limit` comments; pass the smallest id
+        of a page as before_id to get the page before it. With since_id only
+        comments newer than that id are returned, for clients polling for new
+        comments. Either way the (complaint_id, id) index is read from the
+        cursor position, so page cost does not grow with history length.
+        """
+        try:
+            if since_id is not None:
+                condition, order, params = "cc.id > ?", "ASC", [since_id]
+            elif before_id is not None:
+                condition, order, params = "cc.id < ?", "DESC", [before_id]
+            else:
+                condition, order, params = "1 = 1", "DESC", []
+
+            query = f"""
+                SELECT cc.id, cc.complaint_id, cc.staff_id, cc.comment,
+                       cc.created_at, u.name
+                FROM complaint_comments cc
+                JOIN users u ON cc.staff_id = u.id
+                WHERE cc.complaint_id = ? AND {condition}
+                ORDER BY cc.id {order}
+                LIMIT ?
+            """  # nosec B608 - only fixed condition fragments are interpolated
+            results = self.db.execute_query(
+                query, tuple([complaint_id] + params + [limit])
+            )
+            if order == "DESC":
+                results = list(reversed(results))
+
+            comments = []
+            for row in results:
+                comment_dto = CommentDTO(
+                    id=row[0],
+                    complaint_id=row[1],
+                    user_id=row[2],
+                    comment=row[3],
+                    created_at=row[4],
+                    user_name=row[5],
+                )
+                comments.append(comment_dto.to_dict())
+            return comments
+        except Exception as e:
+            print(f"Error finding comment page: {e}")
+            return []
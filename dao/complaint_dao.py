@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from dao.base_dao import BaseDAO
 
@@ -32,7 +33,207 @@ class ComplaintDAO(BaseDAO):
         """Update complaint status"""
         pass
 
+    @abstractmethod
+    def find_by_categories(
+        self, categories: List[str], user_id: Optional[int] = None
+    ) -> List[dict]:
+        """Find complaints in any of the categories, optionally for one user"""
+        pass
+
     @abstractmethod
     def find_by_user_and_category(self, user_id: int, category: str) -> List[dict]:
         """Find complaints by user ID and category"""
         pass
+
+    @abstractmethod
+    def get_statistics(self) -> Dict[str, Dict[str, int]]:
+        """Get complaint counts keyed by dimension ('status', 'category')"""
+        pass
+
+    @abstractmethod
+    def reconcile_statistics(self) -> bool:
+        """Recompute the statistics rollup from the complaints table"""
+        pass
+
+    @abstractmethod
+    def iter_export_batches(
+        self,
+        user_id: Optional[int] = None,
+        batch_size: int = 1000,
+        id_range: Optional[Tuple[int, int]] = None,
+    ) -> Iterator[List[tuple]]:
+        """Stream complaint export rows in batches, optionally for one user"""
+        pass
+
+    @abstractmethod
+    def find_page(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page: int = 1,
+        page_size: Optional[int] = 20,
+        order_by: str = "newest",
+    ) -> List[dict]:
+        """Find one page of complaints matching the filters, newest or most active first"""
+        pass
+
+    @abstractmethod
+    def search(
+        self,
+        text: str,
+        filters: Optional[Dict[str, Any]] = None,
+        page: int = 1,
+        page_size: int = 20,
+    ) -> List[dict]:
+        """Full-text search complaint descriptions and comments by relevance"""
+        pass
+
+    @abstractmethod
+    def find_by_ids(
+        self,
+        complaint_ids: List[int],
+        filters: Optional[Dict[str, Any]] = None,
+        raise_errors: bool = False,
+    ) -> List[dict]:
+        """Find complaints by id that match the filters, in the order given"""
+        pass
+
+    @abstractmethod
+    def find_ids_commented_since(
+        self, since: Optional[datetime], until: datetime
+    ) -> List[int]:
+        """Find ids of complaints whose latest comment is in [since, until)
+
+        Raises on database errors.
+        """
+        pass
+
+    @abstractmethod
+    def find_details(self, complaint_id: int) -> Optional[Dict[str, Any]]:
+        """Find a complaint with owner, assignee and comment summary in one query"""
+        pass
+
+    @abstractmethod
+    def iter_all_batches(self, batch_size: int = 1000) -> Iterator[List[tuple]]:
+        """Stream every complaint as ComplaintDTO-ordered tuples, newest first"""
+        pass
+
+    @abstractmethod
+    def get_id_range(self, user_id: Optional[int] = None) -> Optional[Tuple[int, int]]:
+        """Get the (min, max) complaint id, optionally for one user"""
+        pass
+
+    @abstractmethod
+    def get_export_horizon(self, lag_seconds: int = 5) -> datetime:
+        """Get the database time up to which changes are safe to export"""
+        pass
+
+    @abstractmethod
+    def iter_changed_batches(
+        self,
+        since_updated_at: Optional[datetime],
+        since_id: int,
+        until: datetime,
+        batch_size: int = 1000,
+    ) -> Iterator[List[tuple]]:
+        """Stream complaints changed after the (updated_at, id) watermark"""
+        pass
+
+    @abstractmethod
+    def iter_tombstone_batches(
+        self, since_id: int, until: datetime, batch_size: int = 1000
+    ) -> Iterator[List[tuple]]:
+        """Stream (tombstone id, complaint id, deleted_at) rows after since_id"""
+        pass
+
+    @abstractmethod
+    def get_export_watermark(self, export_name: str) -> Optional[Dict[str, Any]]:
+        """Get the saved watermark of a named incremental export"""
+        pass
+
+    @abstractmethod
+    def save_export_watermark(
+        self, export_name: str, watermark: Dict[str, Any]
+    ) -> bool:
+        """Persist the watermark of a named incremental export"""
+        pass
+
+    @abstractmethod
+    def create_many(self, entities: List[Dict[str, Any]]) -> int:
+        """Insert many complaints at once and return how many were inserted"""
+        pass
+
+    @abstractmethod
+    def find_signatures_by_band_keys(
+        self, band_keys: List[int], max_candidates: int = 200
+    ) -> List[Tuple[int, bytes]]:
+        """Find (complaint id, MinHash signature) of complaints sharing a band"""
+        pass
+
+    @abstractmethod
+    def find_signatures(self, complaint_ids: List[int]) -> Dict[int, bytes]:
+        """Get the stored MinHash signatures of complaints"""
+        pass
+
+    @abstractmethod
+    def save_signatures(self, rows: List[Tuple[int, bytes, List[int]]]) -> int:
+        """Store (complaint id, signature, band keys) rows for existing complaints"""
+        pass
+
+    @abstractmethod
+    def get_daily_stats(
+        self, since: date, category_names: Optional[List[str]] = None
+    ) -> List[tuple]:
+        """Read (day, category, created, resolved) rollup rows from a day on"""
+        pass
+
+    @abstractmethod
+    def rebuild_daily_stats(self) -> bool:
+        """Rebuild the daily rollup from the complaints table"""
+        pass
+
+    @abstractmethod
+    def iter_analytics_batches(self, batch_size: int = 10000) -> Iterator[List[tuple]]:
+        """Stream the columns of an analytics snapshot in created_at order"""
+        pass
+
+    @abstractmethod
+    def iter_response_times(self, batch_size: int = 10000) -> Iterator[List[tuple]]:
+        """Stream the resolution and first response times of complaints"""
+        pass
+
+    @abstractmethod
+    def iter_resolved_batches(self, batch_size: int = 5000) -> Iterator[List[tuple]]:
+        """Stream (id, description) of resolved complaints"""
+        pass
+
+    @abstractmethod
+    def iter_unsigned_batches(self, batch_size: int = 1000) -> Iterator[List[tuple]]:
+        """Stream (id, description) of complaints without a MinHash signature"""
+        pass
+
+    @abstractmethod
+    def iter_shared_band_batches(
+        self, batch_size: int = 10000
+    ) -> Iterator[List[tuple]]:
+        """Stream (band key, complaint id) rows of LSH buckets with 2+ members"""
+        pass
+
+    @abstractmethod
+    def link_duplicates(self, links: List[Tuple[int, int]]) -> int:
+        """Set duplicate_of for (complaint id, original id) pairs not yet linked"""
+        pass
+
+    @abstractmethod
+    def iter_routing_examples(self, batch_size: int = 5000) -> Iterator[List[tuple]]:
+        """Stream (id, category, description, staff assignee) training rows"""
+        pass
+
+    @abstractmethod
+    def iter_unrouted_batches(self, batch_size: int = 1000) -> Iterator[List[tuple]]:
+        """Stream (id, category, description) of pending unassigned complaints"""
+        pass
+
+    @abstractmethod
+    def assign_many(self, assignments: List[Tuple[int, int]]) -> int:
+        """Assign (complaint id, staff id) pairs to complaints still unassigned"""
+        pass
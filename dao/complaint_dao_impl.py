@@ -1,38 +1,495 @@
-from typing import Any, Dict, List, Optional
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from config.database import db_config
+from dao.category_dao_impl import CategoryDAOImpl
 from dao.complaint_dao import ComplaintDAO
 from dto.complaint_dto import ComplaintDTO
 
+# resolved_at for a row whose new status is bound to the placeholder: stamped
+# on the transition into Resolved, kept while it stays resolved and cleared
+# when it is reopened
+RESOLVED_AT = (
+    "CASE WHEN ? = 'Resolved' THEN COALESCE(resolved_at, CURRENT_TIMESTAMP) END"
+)
+
 
 class ComplaintDAOImpl(ComplaintDAO):
     """Concrete implementation of ComplaintDAO"""
 
     def __init__(self):
         self.db = db_config
+        self.category_dao = CategoryDAOImpl()
+
+    def _category_ids(self, names: List[str]) -> List[int]:
+        """Resolve category names for a filter; unknown names match no rows"""
+        ids = self.category_dao.find_ids(names)
+        return [ids.get(name, 0) for name in names]
+
+    def _write_category_ids(self, names: Iterable[str]) -> Dict[str, int]:
+        """Category ids for names being written, raising if any is unresolved
+
+        A missing id would only fail later, on the NOT NULL daily rollup key,
+        with a far less helpful message.
+        """
+        ids = self.category_dao.get_or_create_ids(names)
+        resolved = {
+            name: category_id
+            for name, category_id in ids.items()
+            if category_id is not None
+        }
+        unresolved = sorted(set(ids) - set(resolved))
+        if unresolved:
+            raise ValueError(f"Could not resolve category ids for {unresolved}")
+        return resolved
+
+    def _adjust_stats(self, cursor, dimension: str, bucket: str, delta: int):
+        """Apply a count delta to one complaint_stats bucket on the given cursor"""
+        query = """
+            INSERT INTO complaint_stats (dimension, bucket, complaint_count)
+            VALUES (?, ?, ?)
+            ON DUPLICATE KEY UPDATE complaint_count = complaint_count + VALUES(complaint_count)
+        """
+        cursor.execute(query, (dimension, bucket, delta))
+
+    def _adjust_daily_stats(
+        self,
+        cursor,
+        category_id: int,
+        created: int = 0,
+        resolved: int = 0,
+        day: Optional[date] = None,
+    ):
+        """Count complaints filed or resolved on a day (today by default)"""
+        query = """
+            INSERT INTO complaint_daily_stats
+                (day, category_id, created_count, resolved_count)
+            VALUES (COALESCE(?, CURRENT_DATE), ?, ?, ?)
+            ON DUPLICATE KEY UPDATE
+                created_count = created_count + VALUES(created_count),
+                resolved_count = resolved_count + VALUES(resolved_count)
+        """
+        cursor.execute(query, (day, category_id, created, resolved))
+
+    @staticmethod
+    def _daily_counts(
+        category_id: Optional[int],
+        created_at: Optional[datetime],
+        resolved: bool = False,
+        resolved_at: Optional[datetime] = None,
+    ) -> Counter:
+        """How rebuild_daily_stats() counts one version of a complaint
+
+        Keys are (day, category_id, "created" or "resolved"), with a day of
+        None for today: a complaint resolved without a resolved_at yet gets
+        stamped now. Rows without a category are not counted.
+        """
+        counts: Counter = Counter()
+        if category_id is None:
+            return counts
+        if created_at is not None:
+            counts[(created_at.date(), category_id, "created")] += 1
+        if resolved:
+            day = resolved_at.date() if resolved_at is not None else None
+            counts[(day, category_id, "resolved")] += 1
+        return counts
+
+    def _apply_daily_change(self, cursor, before: Counter, after: Counter):
+        """Move the daily rollup from one version of a complaint to another"""
+        change = Counter(after)
+        change.subtract(before)
+        for (day, category_id, kind), delta in change.items():
+            if kind == "created" and delta:
+                self._adjust_daily_stats(cursor, category_id, created=delta, day=day)
+            elif delta:
+                self._adjust_daily_stats(cursor, category_id, resolved=delta, day=day)
+
+    def _legacy_category_id(
+        self, category_id: Optional[int], category: Optional[str]
+    ) -> Optional[int]:
+        """A row's category_id, looked up by name for rows that predate it
+
+        Only reads, so it is safe inside a transaction; unknown names give None.
+        """
+        if category_id is not None or not category:
+            return category_id
+        ids: Dict[str, int] = self.category_dao.find_ids([category])
+        return ids.get(category)
 
     def create(self, entity_data: Dict[str, Any]) -> bool:
-        """Create a new complaint"""
+        """Create a new complaint
+
+        Optional duplicate_of, signature and band_keys entries link the
+        complaint to a likely original and store its MinHash fingerprint in
+        the same transaction.
+        """
         try:
             complaint_dto = ComplaintDTO.from_dict(entity_data)
-            query = """
-                INSERT INTO complaints (user_id, category, description, status)
-                VALUES (?, ?, ?, ?)
-            """
-            self.db.execute_non_query(
-                query,
+            category_id = self._write_category_ids([complaint_dto.category])[
+                complaint_dto.category
+            ]
+            query = f"""
+                INSERT INTO complaints
+                    (user_id, category, category_id, description, status,
+                     duplicate_of, assigned_to, resolved_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, {RESOLVED_AT})
+            """  # nosec B608 - only a constant is interpolated
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    query,
+                    (
+                        complaint_dto.user_id,
+                        complaint_dto.category,
+                        category_id,
+                        complaint_dto.description,
+                        complaint_dto.status,
+                        entity_data.get("duplicate_of"),
+                        complaint_dto.assigned_to,
+                        complaint_dto.status,
+                    ),
+                )
+                if entity_data.get("signature") is not None:
+                    cursor.execute("SELECT LAST_INSERT_ID()")
+                    complaint_id = cursor.fetchone()[0]
+                    self._insert_signatures(
+                        cursor,
+                        [
+                            (
+                                complaint_id,
+                                entity_data["signature"],
+                                entity_data["band_keys"],
+                            )
+                        ],
+                    )
+                self._adjust_stats(cursor, "status", complaint_dto.status, 1)
+                self._adjust_stats(cursor, "category", complaint_dto.category, 1)
+                self._adjust_daily_stats(
+                    cursor, category_id, 1, int(complaint_dto.status == "Resolved")
+                )
+            return True
+        except Exception as e:
+            print(f"Error creating complaint: {e}")
+            return False
+
+    def create_many(self, entities: List[Dict[str, Any]]) -> int:
+        """Insert many complaints in one transaction with a batched executemany"""
+        if not entities:
+            return 0
+        try:
+            complaint_dtos = [ComplaintDTO.from_dict(entity) for entity in entities]
+            category_ids = self._write_category_ids(
+                {dto.category for dto in complaint_dtos}
+            )
+            params = [
                 (
-                    complaint_dto.user_id,
-                    complaint_dto.category,
-                    complaint_dto.description,
-                    complaint_dto.status,
-                ),
+                    dto.user_id,
+                    dto.category,
+                    category_ids[dto.category],
+                    dto.description,
+                    dto.status,
+                    dto.status,
+                )
+                for dto in complaint_dtos
+            ]
+            status_counts = Counter(dto.status for dto in complaint_dtos)
+            category_counts = Counter(dto.category for dto in complaint_dtos)
+            daily_counts = Counter(
+                (category_ids[dto.category], dto.status == "Resolved")
+                for dto in complaint_dtos
             )
+
+            query = f"""
+                INSERT INTO complaints
+                    (user_id, category, category_id, description, status,
+                     resolved_at)
+                VALUES (?, ?, ?, ?, ?, {RESOLVED_AT})
+            """  # nosec B608 - only a constant is interpolated
+            with self.db.transaction() as cursor:
+                # Send the whole chunk as one parameter array instead of
+                # one round trip per row
+                cursor.fast_executemany = True
+                cursor.executemany(query, params)
+                for status, count in status_counts.items():
+                    self._adjust_stats(cursor, "status", status, count)
+                for category, count in category_counts.items():
+                    self._adjust_stats(cursor, "category", category, count)
+                for (category_id, resolved), count in daily_counts.items():
+                    self._adjust_daily_stats(
+                        cursor, category_id, count, count if resolved else 0
+                    )
+            return len(params)
+        except Exception as e:
+            print(f"Error creating complaints in bulk: {e}")
+            return 0
+
+    def _insert_signatures(self, cursor, rows: List[Tuple[int, bytes, List[int]]]):
+        """Store MinHash signatures and their LSH band keys on the given cursor"""
+        cursor.executemany(
+            "INSERT IGNORE INTO complaint_signatures (complaint_id, signature) "
+            "VALUES (?, ?)",
+            [(complaint_id, signature) for complaint_id, signature, _ in rows],
+        )
+        cursor.executemany(
+            "INSERT IGNORE INTO complaint_lsh_bands (band_key, complaint_id) "
+            "VALUES (?, ?)",
+            [
+                (band_key, complaint_id)
+                for complaint_id, _, band_keys in rows
+                for band_key in band_keys
+            ],
+        )
+
+    def find_signatures_by_band_keys(
+        self, band_keys: List[int], max_candidates: int = 200
+    ) -> List[Tuple[int, bytes]]:
+        """Find (complaint id, signature) of complaints sharing any LSH band
+
+        Each band key is a primary key lookup. max_candidates bounds the work
+        for crowded buckets, keeping the newest complaints.
+        """
+        if not band_keys:
+            return []
+        try:
+            placeholders = ", ".join("?" * len(band_keys))
+            query = f"""
+                SELECT s.complaint_id, s.signature
+                FROM complaint_signatures s
+                WHERE s.complaint_id IN (
+                    SELECT complaint_id FROM complaint_lsh_bands
+                    WHERE band_key IN ({placeholders})
+                )
+                ORDER BY s.complaint_id DESC
+                LIMIT ?
+            """  # nosec B608 - only placeholders are interpolated
+            results = self.db.execute_query(query, tuple(band_keys) + (max_candidates,))
+            return [(row[0], bytes(row[1])) for row in results]
+        except Exception as e:
+            print(f"Error finding similar complaint signatures: {e}")
+            return []
+
+    def find_signatures(self, complaint_ids: List[int]) -> Dict[int, bytes]:
+        """Get the stored signatures of complaints with one IN query per 500 ids"""
+        try:
+            signatures = {}
+            unique_ids = list(dict.fromkeys(complaint_ids))
+            for start in range(0, len(unique_ids), 500):
+                chunk = unique_ids[start : start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                query = f"""
+                    SELECT complaint_id, signature FROM complaint_signatures
+                    WHERE complaint_id IN ({placeholders})
+                """  # nosec B608 - only placeholders are interpolated
+                for row in self.db.execute_query(query, tuple(chunk)):
+                    signatures[row[0]] = bytes(row[1])
+            return signatures
+        except Exception as e:
+            print(f"Error finding complaint signatures: {e}")
+            return {}
+
+    def save_signatures(self, rows: List[Tuple[int, bytes, List[int]]]) -> int:
+        """Store signatures and band keys for complaints indexed after creation"""
+        if not rows:
+            return 0
+        try:
+            with self.db.transaction() as cursor:
+                cursor.fast_executemany = True
+                self._insert_signatures(cursor, rows)
+            return len(rows)
+        except Exception as e:
+            print(f"Error saving complaint signatures: {e}")
+            return 0
+
+    def get_daily_stats(
+        self, since: date, category_names: Optional[List[str]] = None
+    ) -> List[tuple]:
+        """Read (day, category, created, resolved) rollup rows from since on"""
+        try:
+            params: List[Any] = [since]
+            category_condition = ""
+            if category_names:
+                placeholders = ", ".join("?" * len(category_names))
+                category_condition = f"AND d.category_id IN ({placeholders})"
+                params.extend(self._category_ids(category_names))
+            query = f"""
+                SELECT d.day, k.name, d.created_count, d.resolved_count
+                FROM complaint_daily_stats d
+                JOIN categories k ON k.id = d.category_id
+                WHERE d.day >= ? {category_condition}
+                ORDER BY d.day
+            """  # nosec B608 - only placeholders are interpolated
+            return [tuple(row) for row in self.db.execute_query(query, tuple(params))]
+        except Exception as e:
+            print(f"Error getting daily complaint statistics: {e}")
+            return []
+
+    def rebuild_daily_stats(self) -> bool:
+        """Rebuild the daily rollup from the complaints table
+
+        Inflow is exact. Complaints resolved and later reopened are not
+        counted, and each resolution is dated by its complaint's resolved_at.
+        """
+        try:
+            with self.db.transaction() as cursor:
+                cursor.execute("DELETE FROM complaint_daily_stats")
+                cursor.execute(
+                    """
+                    INSERT INTO complaint_daily_stats (day, category_id, created_count)
+                    SELECT DATE(created_at), category_id, COUNT(*)
+                    FROM complaints
+                    GROUP BY DATE(created_at), category_id
+                    """
+                )
+                cursor.execute(
+                    """
+                    INSERT INTO complaint_daily_stats (day, category_id, resolved_count)
+                    SELECT DATE(resolved_at), category_id, COUNT(*)
+                    FROM complaints
+                    WHERE resolved_at IS NOT NULL
+                    GROUP BY DATE(resolved_at), category_id
+                    ON DUPLICATE KEY UPDATE resolved_count = VALUES(resolved_count)
+                    """
+                )
             return True
         except Exception as e:
-            print(f"Error creating complaint: {e}")
+            print(f"Error rebuilding daily complaint statistics: {e}")
             return False
 
+    def iter_analytics_batches(self, batch_size: int = 10000) -> Iterator[List[tuple]]:
+        """Stream (id, user_id, assigned_to, category_id, status, created_at,
+        updated_at) of every complaint in created_at order"""
+        query = """
+            SELECT id, user_id, assigned_to, category_id, status, created_at,
+                   updated_at
+            FROM complaints
+            ORDER BY created_at, id
+        """
+        yield from self.db.stream_query(query, batch_size=batch_size)
+
+    def iter_response_times(self, batch_size: int = 10000) -> Iterator[List[tuple]]:
+        """Stream (category, assigned_to, staff name, seconds to resolution,
+        seconds to first response) of complaints resolved or responded to
+
+        Either duration is None when that event has not happened.
+        """
+        query = """
+            SELECT k.name, c.assigned_to, a.name,
+                   TIMESTAMPDIFF(SECOND, c.created_at, c.resolved_at),
+                   TIMESTAMPDIFF(SECOND, c.created_at, c.first_response_at)
+            FROM complaints c
+            JOIN categories k ON k.id = c.category_id
+            LEFT JOIN users a ON a.id = c.assigned_to
+            WHERE c.resolved_at IS NOT NULL OR c.first_response_at IS NOT NULL
+        """
+        yield from self.db.stream_query(query, batch_size=batch_size)
+
+    def iter_resolved_batches(self, batch_size: int = 5000) -> Iterator[List[tuple]]:
+        """Stream (id, description) of resolved complaints in id order"""
+        query = """
+            SELECT id, description FROM complaints
+            WHERE status = 'Resolved'
+            ORDER BY id
+        """
+        yield from self.db.stream_query(query, batch_size=batch_size)
+
+    def iter_unsigned_batches(self, batch_size: int = 1000) -> Iterator[List[tuple]]:
+        """Stream (id, description) of complaints without a signature, by id"""
+        query = """
+            SELECT c.id, c.description
+            FROM complaints c
+            LEFT JOIN complaint_signatures s ON s.complaint_id = c.id
+            WHERE s.complaint_id IS NULL
+            ORDER BY c.id
+        """
+        yield from self.db.stream_query(query, batch_size=batch_size)
+
+    def iter_shared_band_batches(
+        self, batch_size: int = 10000
+    ) -> Iterator[List[tuple]]:
+        """Stream (band key, complaint id) rows of buckets with 2+ members
+
+        Rows come in primary key order, so each bucket's members arrive
+        together and in id order.
+        """
+        query = """
+            SELECT b.band_key, b.complaint_id
+            FROM complaint_lsh_bands b
+            JOIN (
+                SELECT band_key FROM complaint_lsh_bands
+                GROUP BY band_key
+                HAVING COUNT(*) > 1
+            ) shared ON shared.band_key = b.band_key
+            ORDER BY b.band_key, b.complaint_id
+        """
+        yield from self.db.stream_query(query, batch_size=batch_size)
+
+    def link_duplicates(self, links: List[Tuple[int, int]]) -> int:
+        """Set duplicate_of on complaints that are not linked yet
+
+        updated_at is kept as is, so linking does not show up in
+        incremental exports.
+        """
+        if not links:
+            return 0
+        try:
+            query = """
+                UPDATE complaints
+                SET duplicate_of = ?, updated_at = updated_at
+                WHERE id = ? AND duplicate_of IS NULL
+            """
+            linked = 0
+            with self.db.transaction() as cursor:
+                for complaint_id, original_id in links:
+                    cursor.execute(query, (original_id, complaint_id))
+                    linked += cursor.rowcount
+            return linked
+        except Exception as e:
+            print(f"Error linking duplicate complaints: {e}")
+            return 0
+
+    def iter_routing_examples(self, batch_size: int = 5000) -> Iterator[List[tuple]]:
+        """Stream (id, category, description, assignee) rows in id order
+
+        The assignee is only given when it is a current staff member, so the
+        router never learns to route to admins or deleted accounts.
+        """
+        query = """
+            SELECT c.id, c.category, c.description,
+                   CASE WHEN u.role = 'staff' THEN c.assigned_to END
+            FROM complaints c
+            LEFT JOIN users u ON u.id = c.assigned_to
+            ORDER BY c.id
+        """
+        yield from self.db.stream_query(query, batch_size=batch_size)
+
+    def iter_unrouted_batches(self, batch_size: int = 1000) -> Iterator[List[tuple]]:
+        """Stream (id, category, description) of pending unassigned complaints"""
+        query = """
+            SELECT id, category, description FROM complaints
+            WHERE status = 'Pending' AND assigned_to IS NULL
+            ORDER BY id
+        """
+        yield from self.db.stream_query(query, batch_size=batch_size)
+
+    def assign_many(self, assignments: List[Tuple[int, int]]) -> int:
+        """Assign complaints in one transaction, skipping ones assigned meanwhile"""
+        if not assignments:
+            return 0
+        try:
+            query = """
+                UPDATE complaints SET assigned_to = ?
+                WHERE id = ? AND assigned_to IS NULL
+            """
+            assigned = 0
+            with self.db.transaction() as cursor:
+                for complaint_id, staff_id in assignments:
+                    cursor.execute(query, (staff_id, complaint_id))
+                    assigned += cursor.rowcount
+            return assigned
+        except Exception as e:
+            print(f"Error assigning complaints: {e}")
+            return 0
+
     def find_by_id(self, entity_id: int) -> Optional[Dict[str, Any]]:
         """Find complaint by ID with user information"""
         try:
@@ -63,6 +520,285 @@ class ComplaintDAOImpl(ComplaintDAO):
             print(f"Error finding complaint by ID: {e}")
             return None
 
+    PAGE_FILTERS = {
+        "user_id": "c.user_id = ?",
+        "status": "c.status = ?",
+        "category": "c.category_id = ?",
+        "assigned_to": "c.assigned_to = ?",
+    }
+
+    PAGE_ORDERS = {
+        "newest": "c.id DESC",
+        "activity": "c.last_comment_at DESC, c.id DESC",
+    }
+
+    def _filter_clause(
+        self, filters: Optional[Dict[str, Any]]
+    ) -> Tuple[str, List[Any]]:
+        """Build a WHERE clause and its parameters from complaint filters"""
+        conditions = []
+        params: List[Any] = []
+        for name, value in (filters or {}).items():
+            if value is None:
+                continue
+            if name not in self.PAGE_FILTERS:
+                raise ValueError(f"Unsupported complaint filter: {name}")
+            if name == "category":
+                value = self._category_ids([value])[0]
+            conditions.append(self.PAGE_FILTERS[name])
+            params.append(value)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where, params
+
+    def find_page(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page: int = 1,
+        page_size: Optional[int] = 20,
+        order_by: str = "newest",
+    ) -> List[dict]:
+        """Find one page of complaints matching the filters
+
+        Supported filters are user_id, status, category and assigned_to.
+        order_by is "newest" (by id) or "activity" (latest comment first,
+        complaints without comments last). A page_size of None returns every
+        matching complaint.
+        """
+        try:
+            where, params = self._filter_clause(filters)
+            if order_by not in self.PAGE_ORDERS:
+                raise ValueError(f"Unsupported complaint order: {order_by}")
+
+            limit = ""
+            if page_size is not None:
+                limit = "LIMIT ? OFFSET ?"
+                params.extend([page_size, (max(page, 1) - 1) * page_size])
+
+            query = f"""
+                SELECT c.id, c.user_id, c.category, c.description, c.status,
+                       c.created_at, c.assigned_to, u.name, a.name, c.last_comment_at
+                FROM complaints c
+                JOIN users u ON c.user_id = u.id
+                LEFT JOIN users a ON c.assigned_to = a.id
+                {where}
+                ORDER BY {self.PAGE_ORDERS[order_by]}
+                {limit}
+            """  # nosec B608 - only fixed condition fragments are interpolated
+            results = self.db.execute_query(query, tuple(params) or None)
+
+            complaints = []
+            for row in results:
+                complaint_dto = ComplaintDTO(
+                    id=row[0],
+                    user_id=row[1],
+                    category=row[2],
+                    description=row[3],
+                    status=row[4],
+                    created_at=row[5],
+                    assigned_to=row[6],
+                    user_name=row[7],
+                    assigned_staff_name=row[8],
+                    last_comment_at=row[9],
+                )
+                complaints.append(complaint_dto.to_dict())
+            return complaints
+        except Exception as e:
+            print(f"Error finding complaint page: {e}")
+            return []
+
+    def search(
+        self,
+        text: str,
+        filters: Optional[Dict[str, Any]] = None,
+        page: int = 1,
+        page_size: int = 20,
+    ) -> List[dict]:
+        """Full-text search complaint descriptions and comments, best match first
+
+        Each side is matched through its own FULLTEXT index. A complaint's
+        relevance is its description score plus the score of its best
+        matching comment. Takes the same filters as find_page.
+        """
+        try:
+            where, filter_params = self._filter_clause(filters)
+            query = f"""
+                SELECT c.id, c.user_id, c.category, c.description, c.status,
+                       c.created_at, c.assigned_to, u.name, a.name, c.last_comment_at,
+                       hits.relevance
+                FROM (
+                    SELECT complaint_id, SUM(score) AS relevance
+                    FROM (
+                        SELECT id AS complaint_id,
+                               MATCH(description) AGAINST (? IN NATURAL LANGUAGE MODE) AS score
+                        FROM complaints
+                        WHERE MATCH(description) AGAINST (? IN NATURAL LANGUAGE MODE)
+                        UNION ALL
+                        SELECT complaint_id,
+                               MAX(MATCH(comment) AGAINST (? IN NATURAL LANGUAGE MODE))
+                        FROM complaint_comments
+                        WHERE MATCH(comment) AGAINST (? IN NATURAL LANGUAGE MODE)
+                        GROUP BY complaint_id
+                    ) scored
+                    GROUP BY complaint_id
+                ) hits
+                JOIN complaints c ON c.id = hits.complaint_id
+                JOIN users u ON c.user_id = u.id
+                LEFT JOIN users a ON c.assigned_to = a.id
+                {where}
+                ORDER BY hits.relevance DESC, c.id DESC
+                LIMIT ? OFFSET ?
+            """  # nosec B608 - only fixed condition fragments are interpolated
+            params = (
+                [text] * 4 + filter_params + [page_size, (max(page, 1) - 1) * page_size]
+            )
+            results = self.db.execute_query(query, tuple(params))
+
+            complaints = []
+            for row in results:
+                complaint = ComplaintDTO(
+                    id=row[0],
+                    user_id=row[1],
+                    category=row[2],
+                    description=row[3],
+                    status=row[4],
+                    created_at=row[5],
+                    assigned_to=row[6],
+                    user_name=row[7],
+                    assigned_staff_name=row[8],
+                    last_comment_at=row[9],
+                ).to_dict()
+                complaint["relevance"] = float(row[10])
+                complaints.append(complaint)
+            return complaints
+        except Exception as e:
+            print(f"Error searching complaints: {e}")
+            return []
+
+    def find_by_ids(
+        self,
+        complaint_ids: List[int],
+        filters: Optional[Dict[str, Any]] = None,
+        raise_errors: bool = False,
+    ) -> List[dict]:
+        """Find complaints by id that match the filters, in the order given
+
+        Used to hydrate ranked ids from the embedded search index; ids that
+        no longer exist or fail the filters are dropped. With raise_errors a
+        database error is raised instead of giving an empty list.
+        """
+        if not complaint_ids:
+            return []
+        try:
+            where, params = self._filter_clause(filters)
+            placeholders = ", ".join("?" * len(complaint_ids))
+            id_condition = f"c.id IN ({placeholders})"
+            where = f"{where} AND {id_condition}" if where else f"WHERE {id_condition}"
+            query = f"""
+                SELECT c.id, c.user_id, c.category, c.description, c.status,
+                       c.created_at, c.assigned_to, u.name, a.name, c.last_comment_at
+                FROM complaints c
+                JOIN users u ON c.user_id = u.id
+                LEFT JOIN users a ON c.assigned_to = a.id
+                {where}
+            """  # nosec B608 - only fixed condition fragments are interpolated
+            results = self.db.execute_query(query, tuple(params + list(complaint_ids)))
+
+            by_id = {}
+            for row in results:
+                by_id[row[0]] = ComplaintDTO(
+                    id=row[0],
+                    user_id=row[1],
+                    category=row[2],
+                    description=row[3],
+                    status=row[4],
+                    created_at=row[5],
+                    assigned_to=row[6],
+                    user_name=row[7],
+                    assigned_staff_name=row[8],
+                    last_comment_at=row[9],
+                ).to_dict()
+            return [by_id[i] for i in complaint_ids if i in by_id]
+        except Exception as e:
+            if raise_errors:
+                raise
+            print(f"Error finding complaints by ids: {e}")
+            return []
+
+    def find_ids_commented_since(
+        self, since: Optional[datetime], until: datetime
+    ) -> List[int]:
+        """Find ids of complaints whose latest comment is in [since, until)
+
+        Raises on database errors, so a search index refresh fails instead of
+        moving its watermark past comments it never saw.
+        """
+        if since is None:
+            query = """
+                SELECT id FROM complaints
+                WHERE last_comment_at < ?
+            """
+            params: Tuple[Any, ...] = (until,)
+        else:
+            query = """
+                SELECT id FROM complaints
+                WHERE last_comment_at >= ? AND last_comment_at < ?
+            """
+            params = (since, until)
+        return [row[0] for row in self.db.execute_query(query, params)]
+
+    def find_details(self, complaint_id: int) -> Optional[Dict[str, Any]]:
+        """Find a complaint with owner, assignee and comment summary in one query
+
+        Adds assigned_staff_name, comment_count and latest_comment (comment,
+        created_at and user_name of the newest comment, or None) to the
+        complaint dict, so a detail header costs a single round trip.
+        """
+        try:
+            query = """
+                SELECT c.id, c.user_id, c.category, c.description, c.status,
+                       c.created_at, c.assigned_to, u.name, a.name, c.last_comment_at,
+                       (SELECT COUNT(*) FROM complaint_comments cc
+                        WHERE cc.complaint_id = c.id),
+                       lc.comment, lc.created_at, ls.name, c.duplicate_of
+                FROM complaints c
+                JOIN users u ON c.user_id = u.id
+                LEFT JOIN users a ON c.assigned_to = a.id
+                LEFT JOIN complaint_comments lc ON lc.id = (
+                    SELECT MAX(cc.id) FROM complaint_comments cc
+                    WHERE cc.complaint_id = c.id
+                )
+                LEFT JOIN users ls ON lc.staff_id = ls.id
+                WHERE c.id = ?
+            """
+            results = self.db.execute_query(query, (complaint_id,))
+
+            if not results:
+                return None
+            row = results[0]
+            complaint = ComplaintDTO(
+                id=row[0],
+                user_id=row[1],
+                category=row[2],
+                description=row[3],
+                status=row[4],
+                created_at=row[5],
+                assigned_to=row[6],
+                user_name=row[7],
+                assigned_staff_name=row[8],
+                last_comment_at=row[9],
+            ).to_dict()
+            complaint["comment_count"] = row[10]
+            complaint["latest_comment"] = (
+                {"comment": row[11], "created_at": row[12], "user_name": row[13]}
+                if row[11] is not None
+                else None
+            )
+            complaint["duplicate_of"] = row[14]
+            return complaint
+        except Exception as e:
+            print(f"Error finding complaint details: {e}")
+            return None
+
     def find_all(self) -> List[Dict[str, Any]]:
         """Find all complaints with user information"""
         try:
@@ -97,21 +833,64 @@ class ComplaintDAOImpl(ComplaintDAO):
         """Update a complaint"""
         try:
             complaint_dto = ComplaintDTO.from_dict(entity_data)
-            query = """
+            category_id = self._write_category_ids([complaint_dto.category])[
+                complaint_dto.category
+            ]
+            query = f"""
                 UPDATE complaints
-                SET category = ?, description = ?, status = ?, assigned_to = ?
+                SET category = ?, category_id = ?, description = ?, status = ?,
+                    assigned_to = ?, resolved_at = {RESOLVED_AT}
                 WHERE id = ?
-            """
-            self.db.execute_non_query(
-                query,
-                (
-                    complaint_dto.category,
-                    complaint_dto.description,
-                    complaint_dto.status,
-                    complaint_dto.assigned_to,
-                    entity_id,
-                ),
-            )
+            """  # nosec B608 - only a constant is interpolated
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    """
+                    SELECT status, category, category_id, created_at, resolved_at
+                    FROM complaints WHERE id = ? FOR UPDATE
+                    """,
+                    (entity_id,),
+                )
+                current = cursor.fetchone()
+                cursor.execute(
+                    query,
+                    (
+                        complaint_dto.category,
+                        category_id,
+                        complaint_dto.description,
+                        complaint_dto.status,
+                        complaint_dto.assigned_to,
+                        complaint_dto.status,
+                        entity_id,
+                    ),
+                )
+                if current:
+                    old_status, old_category, old_category_id = current[:3]
+                    created_at, resolved_at = current[3], current[4]
+                    # Moves both counts when the category changes, and the
+                    # resolution when the complaint is resolved or reopened
+                    self._apply_daily_change(
+                        cursor,
+                        self._daily_counts(
+                            self._legacy_category_id(old_category_id, old_category),
+                            created_at,
+                            resolved_at is not None,
+                            resolved_at,
+                        ),
+                        self._daily_counts(
+                            category_id,
+                            created_at,
+                            complaint_dto.status == "Resolved",
+                            resolved_at,
+                        ),
+                    )
+                    if old_status != complaint_dto.status:
+                        self._adjust_stats(cursor, "status", old_status, -1)
+                        self._adjust_stats(cursor, "status", complaint_dto.status, 1)
+                    if old_category != complaint_dto.category:
+                        self._adjust_stats(cursor, "category", old_category, -1)
+                        self._adjust_stats(
+                            cursor, "category", complaint_dto.category, 1
+                        )
             return True
         except Exception as e:
             print(f"Error updating complaint: {e}")
@@ -120,8 +899,34 @@ class ComplaintDAOImpl(ComplaintDAO):
     def delete(self, entity_id: int) -> bool:
         """Delete a complaint"""
         try:
-            query = "DELETE FROM complaints WHERE id = ?"
-            self.db.execute_non_query(query, (entity_id,))
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    """
+                    SELECT status, category, category_id, created_at, resolved_at
+                    FROM complaints WHERE id = ? FOR UPDATE
+                    """,
+                    (entity_id,),
+                )
+                current = cursor.fetchone()
+                cursor.execute("DELETE FROM complaints WHERE id = ?", (entity_id,))
+                if current:
+                    self._adjust_stats(cursor, "status", current[0], -1)
+                    self._adjust_stats(cursor, "category", current[1], -1)
+                    self._apply_daily_change(
+                        cursor,
+                        self._daily_counts(
+                            self._legacy_category_id(current[2], current[1]),
+                            current[3],
+                            current[4] is not None,
+                            current[4],
+                        ),
+                        Counter(),
+                    )
+                    # Leave a tombstone so incremental exports can emit the delete
+                    cursor.execute(
+                        "INSERT INTO complaint_tombstones (complaint_id) VALUES (?)",
+                        (entity_id,),
+                    )
             return True
         except Exception as e:
             print(f"Error deleting complaint: {e}")
@@ -194,10 +999,12 @@ class ComplaintDAOImpl(ComplaintDAO):
                        c.user_id, u.name as user_name, c.assigned_to
                 FROM complaints c
                 JOIN users u ON c.user_id = u.id
-                WHERE c.category = ?
-                ORDER BY c.created_at DESC
+                WHERE c.category_id = ?
+                ORDER BY c.id DESC
             """
-            results = self.db.execute_query(query, (category,))
+            results = self.db.execute_query(
+                query, tuple(self._category_ids([category]))
+            )
 
             complaints = []
             for row in results:
@@ -230,23 +1037,101 @@ class ComplaintDAOImpl(ComplaintDAO):
     def update_status(self, complaint_id: int, status: str) -> bool:
         """Update complaint status"""
         try:
-            query = "UPDATE complaints SET status = ? WHERE id = ?"
-            self.db.execute_non_query(query, (status, complaint_id))
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    """
+                    SELECT status, category_id, category, resolved_at
+                    FROM complaints WHERE id = ? FOR UPDATE
+                    """,
+                    (complaint_id,),
+                )
+                current = cursor.fetchone()
+                category_id = (
+                    self._legacy_category_id(current[1], current[2])
+                    if current
+                    else None
+                )
+                # Rows from before category_id existed get it filled in here
+                cursor.execute(
+                    f"""
+                    UPDATE complaints
+                    SET status = ?, category_id = COALESCE(category_id, ?),
+                        resolved_at = {RESOLVED_AT}
+                    WHERE id = ?
+                    """,  # nosec B608 - only a constant is interpolated
+                    (status, category_id, status, complaint_id),
+                )
+                if current and current[0] != status:
+                    self._adjust_stats(cursor, "status", current[0], -1)
+                    self._adjust_stats(cursor, "status", status, 1)
+                    resolved_at = current[3]
+                    self._apply_daily_change(
+                        cursor,
+                        self._daily_counts(
+                            category_id, None, resolved_at is not None, resolved_at
+                        ),
+                        self._daily_counts(
+                            category_id, None, status == "Resolved", resolved_at
+                        ),
+                    )
             return True
         except Exception as e:
             print(f"Error updating complaint status: {e}")
             return False
 
+    def find_by_categories(
+        self, categories: List[str], user_id: Optional[int] = None
+    ) -> List[dict]:
+        """Find complaints in any of the categories, newest first"""
+        if not categories:
+            return []
+        try:
+            placeholders = ", ".join("?" * len(categories))
+            params: List[Any] = self._category_ids(categories)
+            user_condition = ""
+            if user_id is not None:
+                user_condition = "AND c.user_id = ?"
+                params.append(user_id)
+            query = f"""
+                SELECT c.id, c.category, c.description, c.status, c.created_at,
+                       c.user_id, u.name as user_name, c.assigned_to
+                FROM complaints c
+                JOIN users u ON c.user_id = u.id
+                WHERE c.category_id IN ({placeholders}) {user_condition}
+                ORDER BY c.id DESC
+            """  # nosec B608 - only placeholders are interpolated
+            results = self.db.execute_query(query, tuple(params))
+
+            complaints = []
+            for row in results:
+                complaint_dto = ComplaintDTO(
+                    id=row[0],
+                    category=row[1],
+                    description=row[2],
+                    status=row[3],
+                    created_at=row[4],
+                    user_id=row[5],
+                    user_name=row[6],
+                    assigned_to=row[7],
+                )
+                complaints.append(complaint_dto.to_dict())
+            return complaints
+        except Exception as e:
+            print(f"Error finding complaints by categories: {e}")
+            return []
+
     def find_by_user_and_category(self, user_id: int, category: str) -> List[dict]:
         """Find complaints by user ID and category"""
         try:
             query = """
                 SELECT id, category, description, status, created_at, assigned_to
                 FROM complaints
-                WHERE user_id = ? AND category = ?
+                WHERE user_id = ? AND category_id = ?
                 ORDER BY created_at DESC
             """
-            results = self.db.execute_query(query, (user_id, category))
+            results = self.db.execute_query(
+                query, (user_id, self._category_ids([category])[0])
+            )
 
             complaints = []
             for row in results:
@@ -264,3 +1149,228 @@ class ComplaintDAOImpl(ComplaintDAO):
         except Exception as e:
             print(f"Error finding complaints by user and category: {e}")
             return []
+
+    def get_statistics(self) -> Dict[str, Dict[str, int]]:
+        """Read complaint counts by status and category from the stats rollup"""
+        try:
+            query = """
+                SELECT dimension, bucket, complaint_count
+                FROM complaint_stats
+                WHERE complaint_count > 0
+            """
+            results = self.db.execute_query(query)
+
+            stats: Dict[str, Dict[str, int]] = {"status": {}, "category": {}}
+            for row in results:
+                stats[row[0]][row[1]] = row[2]
+            return stats
+        except Exception as e:
+            print(f"Error getting complaint statistics: {e}")
+            return {"status": {}, "category": {}}
+
+    def reconcile_statistics(self) -> bool:
+        """Rebuild the stats rollup from the complaints table to repair drift"""
+        try:
+            with self.db.transaction() as cursor:
+                cursor.execute("DELETE FROM complaint_stats")
+                cursor.execute(
+                    """
+                    INSERT INTO complaint_stats (dimension, bucket, complaint_count)
+                    SELECT 'status', status, COUNT(*) FROM complaints GROUP BY status
+                    """
+                )
+                # Rows written before category_id existed, or by writers that
+                # only set the name, are counted under their category text
+                cursor.execute(
+                    """
+                    INSERT INTO complaint_stats (dimension, bucket, complaint_count)
+                    SELECT 'category', bucket, SUM(complaint_count)
+                    FROM (
+                        SELECT COALESCE(k.name, counts.legacy_category) AS bucket,
+                               counts.complaint_count
+                        FROM (
+                            SELECT category_id,
+                                   CASE WHEN category_id IS NULL
+                                        THEN category END AS legacy_category,
+                                   COUNT(*) AS complaint_count
+                            FROM complaints
+                            GROUP BY category_id, legacy_category
+                        ) counts
+                        LEFT JOIN categories k ON k.id = counts.category_id
+                    ) buckets
+                    WHERE bucket IS NOT NULL
+                    GROUP BY bucket
+                    """
+                )
+            return True
+        except Exception as e:
+            print(f"Error reconciling complaint statistics: {e}")
+            return False
+
+    def iter_export_batches(
+        self,
+        user_id: Optional[int] = None,
+        batch_size: int = 1000,
+        id_range: Optional[Tuple[int, int]] = None,
+    ) -> Iterator[List[tuple]]:
+        """Stream (id, user_id, category, description, status, created_at) rows
+
+        Rows come back as plain tuples in primary key order straight from a
+        server-side cursor, without building a DTO or dict per row. id_range
+        limits the stream to ids in [start, end) for partitioned exports.
+        """
+        conditions = []
+        params: List[Any] = []
+        if user_id is not None:
+            conditions.append("user_id = ?")
+            params.append(user_id)
+        if id_range is not None:
+            conditions.append("id >= ? AND id < ?")
+            params.extend(id_range)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        query = f"""
+            SELECT id, user_id, category, description, status, created_at
+            FROM complaints
+            {where}
+            ORDER BY id
+        """  # nosec B608 - only fixed condition fragments are interpolated
+        yield from self.db.stream_query(query, tuple(params) or None, batch_size)
+
+    def iter_all_batches(self, batch_size: int = 1000) -> Iterator[List[tuple]]:
+        """Stream every complaint as tuples in ComplaintDTO field order
+
+        Columns are (id, user_id, category, description, status, created_at,
+        assigned_to, user_name, assigned_staff_name, last_comment_at), so rows
+        can be serialized without building a DTO. Newest first by id, which
+        the primary key serves without sorting.
+        """
+        query = """
+            SELECT c.id, c.user_id, c.category, c.description, c.status,
+                   c.created_at, c.assigned_to, u.name, a.name, c.last_comment_at
+            FROM complaints c
+            JOIN users u ON c.user_id = u.id
+            LEFT JOIN users a ON c.assigned_to = a.id
+            ORDER BY c.id DESC
+        """
+        yield from self.db.stream_query(query, batch_size=batch_size)
+
+    def get_id_range(self, user_id: Optional[int] = None) -> Optional[Tuple[int, int]]:
+        """Get the smallest and largest complaint id, optionally for one user"""
+        try:
+            if user_id is None:
+                results = self.db.execute_query(
+                    "SELECT MIN(id), MAX(id) FROM complaints"
+                )
+            else:
+                results = self.db.execute_query(
+                    "SELECT MIN(id), MAX(id) FROM complaints WHERE user_id = ?",
+                    (user_id,),
+                )
+
+            if results and results[0][0] is not None:
+                return results[0][0], results[0][1]
+            return None
+        except Exception as e:
+            print(f"Error finding complaint id range: {e}")
+            return None
+
+    def get_export_horizon(self, lag_seconds: int = 5) -> datetime:
+        """Get database time minus a lag so in-flight transactions are not skipped"""
+        query = "SELECT NOW() - INTERVAL ? SECOND"
+        horizon: datetime = self.db.execute_query(query, (lag_seconds,))[0][0]
+        return horizon
+
+    def iter_changed_batches(
+        self,
+        since_updated_at: Optional[datetime],
+        since_id: int,
+        until: datetime,
+        batch_size: int = 1000,
+    ) -> Iterator[List[tuple]]:
+        """Stream (id, user_id, category, description, status, created_at,
+        updated_at) rows changed after the watermark, in (updated_at, id) order
+        """
+        if since_updated_at is None:
+            query = """
+                SELECT id, user_id, category, description, status, created_at,
+                       updated_at
+                FROM complaints
+                WHERE updated_at < ?
+                ORDER BY updated_at, id
+            """
+            params: Tuple[Any, ...] = (until,)
+        else:
+            query = """
+                SELECT id, user_id, category, description, status, created_at,
+                       updated_at
+                FROM complaints
+                WHERE (updated_at > ? OR (updated_at = ? AND id > ?))
+                  AND updated_at < ?
+                ORDER BY updated_at, id
+            """
+            params = (since_updated_at, since_updated_at, since_id, until)
+
+        yield from self.db.stream_query(query, params, batch_size)
+
+    def iter_tombstone_batches(
+        self, since_id: int, until: datetime, batch_size: int = 1000
+    ) -> Iterator[List[tuple]]:
+        """Stream (tombstone id, complaint id, deleted_at) rows after since_id"""
+        query = """
+            SELECT id, complaint_id, deleted_at
+            FROM complaint_tombstones
+            WHERE id > ? AND deleted_at < ?
+            ORDER BY id
+        """
+        yield from self.db.stream_query(query, (since_id, until), batch_size)
+
+    def get_export_watermark(self, export_name: str) -> Optional[Dict[str, Any]]:
+        """Get the saved watermark of a named incremental export"""
+        try:
+            query = """
+                SELECT last_updated_at, last_complaint_id, last_tombstone_id
+                FROM export_watermarks
+                WHERE export_name = ?
+            """
+            results = self.db.execute_query(query, (export_name,))
+
+            if results:
+                row = results[0]
+                return {
+                    "last_updated_at": row[0],
+                    "last_complaint_id": row[1],
+                    "last_tombstone_id": row[2],
+                }
+            return None
+        except Exception as e:
+            print(f"Error finding export watermark: {e}")
+            return None
+
+    def save_export_watermark(
+        self, export_name: str, watermark: Dict[str, Any]
+    ) -> bool:
+        """Persist the watermark of a named incremental export"""
+        try:
+            query = """
+                INSERT INTO export_watermarks
+                    (export_name, last_updated_at, last_complaint_id, last_tombstone_id)
+                VALUES (?, ?, ?, ?)
+                ON DUPLICATE KEY UPDATE
+                    last_updated_at = VALUES(last_updated_at),
+                    last_complaint_id = VALUES(last_complaint_id),
+                    last_tombstone_id = VALUES(last_tombstone_id)
+            """
+            self.db.execute_non_query(
+                query,
+                (
+                    export_name,
+                    watermark["last_updated_at"],
+                    watermark["last_complaint_id"],
+                    watermark["last_tombstone_id"],
+                ),
+            )
+            return True
+        except Exception as e:
+            print(f"Error saving export watermark: {e}")
+            return False
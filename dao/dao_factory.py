@@ -1,3 +1,5 @@
+from dao.category_dao import CategoryDAO
+from dao.category_dao_impl import CategoryDAOImpl
 from dao.comment_dao import CommentDAO
 from dao.comment_dao_impl import CommentDAOImpl
 from dao.complaint_dao import ComplaintDAO
@@ -13,6 +15,7 @@ class DAOFactory:
     _user_dao = None
     _complaint_dao = None
     _comment_dao = None
+    _category_dao = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -37,6 +40,12 @@ class DAOFactory:
             self._comment_dao = CommentDAOImpl()
         return self._comment_dao
 
+    def get_category_dao(self) -> CategoryDAO:
+        """Get CategoryDAO instance"""
+        if self._category_dao is None:
+            self._category_dao = CategoryDAOImpl()
+        return self._category_dao
+
 
 # Global factory instance
 dao_factory = DAOFactory()
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from dao.base_dao import BaseDAO
 
@@ -26,3 +26,8 @@ class UserDAO(BaseDAO):
     def find_by_role(self, role: str) -> List[dict]:
         """Find users by role"""
         pass
+
+    @abstractmethod
+    def find_ids_by_emails(self, emails: List[str]) -> Dict[str, int]:
+        """Resolve many emails to user ids in batched lookups"""
+        pass
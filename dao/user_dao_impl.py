@@ -82,10 +82,35 @@ class UserDAOImpl(UserDAO):
             return False
 
     def delete(self, entity_id: int) -> bool:
-        """Delete a user"""
+        """Delete a user, with their complaints and comments
+
+        The database removes those through ON DELETE CASCADE, which bypasses
+        ComplaintDAOImpl.delete and fires no triggers. So the same transaction
+        leaves the tombstones incremental exports and the search index need.
+        It also marks the complaints the user was assigned or commented on
+        as updated, because their assignee and comments change too.
+        """
         try:
-            query = "DELETE FROM users WHERE id = ?"
-            self.db.execute_non_query(query, (entity_id,))
+            with self.db.transaction() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO complaint_tombstones (complaint_id)
+                    SELECT id FROM complaints WHERE user_id = ?
+                    """,
+                    (entity_id,),
+                )
+                cursor.execute(
+                    """
+                    UPDATE complaints
+                    SET updated_at = CURRENT_TIMESTAMP
+                    WHERE user_id <> ?
+                      AND (assigned_to = ?
+                           OR id IN (SELECT complaint_id FROM complaint_comments
+                                     WHERE staff_id = ?))
+                    """,
+                    (entity_id, entity_id, entity_id),
+                )
+                cursor.execute("DELETE FROM users WHERE id = ?", (entity_id,))
             return True
         except Exception as e:
             print(f"Error deleting user: {e}")
@@ -153,3 +178,19 @@ class UserDAOImpl(UserDAO):
         except Exception as e:
             print(f"Error finding users by role: {e}")
             return []
+
+    def find_ids_by_emails(self, emails: List[str]) -> Dict[str, int]:
+        """Resolve many emails to user ids, keyed by lower-cased email"""
+        try:
+            user_ids = {}
+            unique_emails = list(dict.fromkeys(emails))
+            for start in range(0, len(unique_emails), 500):
+                chunk = unique_emails[start : start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                query = f"SELECT email, id FROM users WHERE email IN ({placeholders})"  # nosec B608
+                for row in self.db.execute_query(query, tuple(chunk)):
+                    user_ids[row[0].lower()] = row[1]
+            return user_ids
+        except Exception as e:
+            print(f"Error finding users by emails: {e}")
+            return {}
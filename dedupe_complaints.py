@@ -0,0 +1,75 @@
+"""
+Duplicate Complaint Clustering Script
+Fingerprints complaints stored without a MinHash signature (rows from before
+duplicate detection, or bulk-ingested ones), then groups the backlog into
+near-duplicate clusters. --link marks every later complaint in a cluster as a
+duplicate of the oldest one; --output writes the clusters to a CSV file.
+"""
+
+import argparse
+import csv
+import os
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config.database import db_config
+from services.duplicate_service import DUPLICATE_THRESHOLD, DuplicateDetectionService
+
+
+def main():
+    """Index the backlog, cluster it and report or link the clusters"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DUPLICATE_THRESHOLD,
+        help=f"Minimum estimated similarity (default: {DUPLICATE_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--index-only", action="store_true", help="Only fingerprint the backlog"
+    )
+    parser.add_argument(
+        "--link", action="store_true", help="Set duplicate_of within each cluster"
+    )
+    parser.add_argument("--output", help="Write cluster_id,complaint_id rows here")
+    args = parser.parse_args()
+
+    try:
+        duplicate_service = DuplicateDetectionService(args.threshold)
+        started = time.perf_counter()
+        indexed = duplicate_service.index_backlog(args.batch_size)
+        print(
+            f"Fingerprinted {indexed} complaints in {time.perf_counter() - started:.2f}s"
+        )
+        if args.index_only:
+            return
+
+        started = time.perf_counter()
+        clusters = duplicate_service.cluster()
+        duplicates = sum(len(members) - 1 for members in clusters)
+        print(
+            f"Found {len(clusters)} clusters with {duplicates} likely duplicates "
+            f"in {time.perf_counter() - started:.2f}s"
+        )
+
+        if args.output:
+            with open(args.output, "w", newline="", encoding="utf-8") as f:
+                writer = csv.writer(f)
+                writer.writerow(["cluster_id", "complaint_id"])
+                for members in clusters:
+                    writer.writerows((members[0], member) for member in members)
+            print(f"Clusters written to {args.output}")
+
+        if args.link:
+            linked = duplicate_service.link_clusters(clusters)
+            print(f"Linked {linked} complaints to their oldest duplicate")
+    finally:
+        db_config.close_connection()
+
+
+if __name__ == "__main__":
+    main()
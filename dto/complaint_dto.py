@@ -15,6 +15,8 @@ class ComplaintDTO:
     created_at: Optional[datetime] = None
     assigned_to: Optional[int] = None
     user_name: Optional[str] = None
+    assigned_staff_name: Optional[str] = None
+    last_comment_at: Optional[datetime] = None
 
     def to_dict(self) -> dict:
         """Convert DTO to dictionary"""
@@ -27,6 +29,8 @@ class ComplaintDTO:
             "created_at": self.created_at,
             "assigned_to": self.assigned_to,
             "user_name": self.user_name,
+            "assigned_staff_name": self.assigned_staff_name,
+            "last_comment_at": self.last_comment_at,
         }
 
     @classmethod
@@ -41,4 +45,6 @@ class ComplaintDTO:
             created_at=data.get("created_at"),
             assigned_to=data.get("assigned_to"),
             user_name=data.get("user_name"),
+            assigned_staff_name=data.get("assigned_staff_name"),
+            last_comment_at=data.get("last_comment_at"),
         )
@@ -0,0 +1,146 @@
+import dataclasses
+import json
+from collections.abc import Mapping
+from datetime import date, datetime
+from json.encoder import encode_basestring_ascii
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+    get_args,
+    get_type_hints,
+)
+
+from dto.comment_dto import CommentDTO
+from dto.complaint_dto import ComplaintDTO
+from dto.user_dto import UserDTO
+
+Encoder = Callable[[Any], str]
+
+
+def encode_int(value: Any) -> str:
+    """Encode an integer field"""
+    return "null" if value is None else str(int(value))
+
+
+def encode_str(value: Any) -> str:
+    """Encode a string field using the C-accelerated JSON string escaper"""
+    if value is None:
+        return "null"
+    return encode_basestring_ascii(value if isinstance(value, str) else str(value))
+
+
+def encode_datetime(value: Any) -> str:
+    """Encode a datetime as "YYYY-MM-DD HH:MM:SS" and a date as "YYYY-MM-DD",
+    the same text as str(value)"""
+    if value is None:
+        return "null"
+    if isinstance(value, datetime):
+        return '"' + value.isoformat(" ") + '"'
+    if isinstance(value, date):
+        return '"' + value.isoformat() + '"'
+    return encode_str(value)
+
+
+def encode_any(value: Any) -> str:
+    """Fallback encoder for fields without a specialised one"""
+    return json.dumps(value, default=str)
+
+
+ENCODERS = {int: encode_int, str: encode_str, datetime: encode_datetime}
+
+
+def encoder_for(annotation: Any) -> Encoder:
+    """Pick the encoder for a field's type annotation, unwrapping Optional"""
+    candidates = [arg for arg in get_args(annotation) if arg is not type(None)]
+    if getattr(annotation, "__origin__", None) is Union and len(candidates) == 1:
+        annotation = candidates[0]
+    return ENCODERS.get(annotation, encode_any)
+
+
+class DTOSerializer:
+    """JSON serializer for one DTO type with per-field encoders precomputed
+
+    Field names, their escaped JSON keys and the encoder for each field's
+    type are worked out once, so encoding a row is a single pass over its
+    values with no type dispatch or default hook. Rows can be dicts, DTO
+    instances, or tuples in the serializer's field order straight from a
+    DAO cursor. A tuple must hold exactly one value per field, so a query
+    that falls out of step with the DTO fails instead of dropping keys.
+    """
+
+    def __init__(
+        self,
+        dto_class: type,
+        fields: Optional[List[str]] = None,
+        exclude: Iterable[str] = (),
+    ):
+        hints = get_type_hints(dto_class)
+        names = fields or [field.name for field in dataclasses.fields(dto_class)]
+        self.dto_class = dto_class
+        self.fields = [name for name in names if name not in set(exclude)]
+        self._prefixes = [encode_basestring_ascii(name) + ":" for name in self.fields]
+        self._encoders = [encoder_for(hints.get(name)) for name in self.fields]
+
+    def encode(self, row: Any) -> str:
+        """Encode one row as a JSON object"""
+        if isinstance(row, Mapping):
+            values = [row.get(name) for name in self.fields]
+        elif isinstance(row, self.dto_class):
+            values = [getattr(row, name) for name in self.fields]
+        else:
+            values = row
+            if len(values) != len(self.fields):
+                raise ValueError(
+                    f"{self.dto_class.__name__} row has {len(values)} values, "
+                    f"expected {len(self.fields)}"
+                )
+        return (
+            "{"
+            + ",".join(
+                [
+                    prefix + encode(value)
+                    for prefix, encode, value in zip(
+                        self._prefixes, self._encoders, values
+                    )
+                ]
+            )
+            + "}"
+        )
+
+    def dumps(self, rows: Iterable[Any]) -> str:
+        """Encode a list of rows as a JSON array"""
+        return "[" + ",".join([self.encode(row) for row in rows]) + "]"
+
+    def iter_json_array(
+        self, rows: Iterable[Any], chunk_rows: int = 500
+    ) -> Iterator[bytes]:
+        """Yield a JSON array of rows as UTF-8 chunks of up to chunk_rows rows
+
+        The first chunk is produced as soon as chunk_rows rows have been read,
+        so a response can start before the last row is fetched.
+        """
+        parts = ["["]
+        count = 0
+        first = True
+        for row in rows:
+            if not first:
+                parts.append(",")
+            first = False
+            parts.append(self.encode(row))
+            count += 1
+            if count >= chunk_rows:
+                yield "".join(parts).encode("utf-8")
+                parts = []
+                count = 0
+        parts.append("]")
+        yield "".join(parts).encode("utf-8")
+
+
+complaint_serializer = DTOSerializer(ComplaintDTO)
+user_serializer = DTOSerializer(UserDTO, exclude=("password",))
+comment_serializer = DTOSerializer(CommentDTO)
@@ -0,0 +1,124 @@
+"""
+Complaint Export Script
+Streams complaints from the database into a CSV file in constant memory.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config.database import db_config
+from controllers.controllers import ComplaintController
+
+
+class ProgressPrinter:
+    """Progress callback that reports the running row count about once a second"""
+
+    def __init__(self, interval: float = 1.0):
+        self.interval = interval
+        self.last_report = time.monotonic()
+
+    def __call__(self, rows_written: int):
+        now = time.monotonic()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            print(f"{rows_written} rows exported...", file=sys.stderr, flush=True)
+
+
+def main():
+    """Parse arguments and run the export"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--output", default="complaints_export.csv")
+    parser.add_argument(
+        "--user-id", type=int, help="Only export complaints filed by this user"
+    )
+    parser.add_argument("--gzip", action="store_true", help="Gzip the CSV output")
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--quiet", action="store_true", help="Hide progress output")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only export rows changed or deleted since the last incremental run",
+    )
+    parser.add_argument(
+        "--name",
+        default="default",
+        help="Watermark name for --incremental, one per downstream consumer",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=0,
+        help="Export id-range partitions with this many worker processes",
+    )
+    parser.add_argument(
+        "--partitions", type=int, help="Number of id ranges (default: 4 per worker)"
+    )
+    parser.add_argument(
+        "--manifest",
+        action="store_true",
+        help="With --workers, keep the part files and write a JSON manifest",
+    )
+    parser.add_argument(
+        "--with-comments",
+        action="store_true",
+        help="Export JSON lines with each complaint's full comment history",
+    )
+    args = parser.parse_args()
+
+    try:
+        controller = ComplaintController()
+        progress_callback = None if args.quiet else ProgressPrinter()
+        if args.with_comments:
+            ok = controller.export_complaint_history(
+                user_id=args.user_id,
+                is_admin=args.user_id is None,
+                filename=args.output,
+                compress=args.gzip,
+                progress_callback=progress_callback,
+                batch_size=args.batch_size,
+            )
+            sys.exit(0 if ok else 1)
+
+        if args.incremental:
+            ok = controller.export_incremental_changes_to_csv(
+                export_name=args.name,
+                filename=args.output,
+                compress=args.gzip,
+                progress_callback=progress_callback,
+                batch_size=args.batch_size,
+            )
+            sys.exit(0 if ok else 1)
+
+        if args.workers > 0:
+            report = controller.export_complaints_parallel(
+                user_id=args.user_id,
+                is_admin=args.user_id is None,
+                filename=args.output,
+                workers=args.workers,
+                partitions=args.partitions,
+                compress=args.gzip,
+                manifest=args.manifest,
+                batch_size=args.batch_size,
+            )
+            sys.exit(0 if report else 1)
+
+        ok = controller.export_complaints_to_csv(
+            user_id=args.user_id,
+            is_admin=args.user_id is None,
+            filename=args.output,
+            compress=args.gzip,
+            progress_callback=progress_callback,
+            batch_size=args.batch_size,
+        )
+        sys.exit(0 if ok else 1)
+    finally:
+        db_config.close_connection()
+
+
+if __name__ == "__main__":
+    main()
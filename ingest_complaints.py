@@ -0,0 +1,52 @@
+"""
+Complaint Ingestion Script
+Bulk-loads complaints from partner CSV or JSONL files.
+
+Each record needs user_email, category and description; status is optional
+and defaults to Pending. Rows that fail validation or name an unknown user
+are written to a reject file together with the reason.
+"""
+
+import argparse
+import os
+import sys
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config.database import db_config
+from services.ingestion_service import ComplaintIngestionService
+
+
+def main():
+    """Parse arguments, run the ingestion and print its report"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", help="CSV or JSONL file to ingest")
+    parser.add_argument(
+        "--format",
+        choices=["csv", "jsonl"],
+        help="File format (default: inferred from the file extension)",
+    )
+    parser.add_argument(
+        "--rejects", help="Reject file path (default: <path>.rejects.csv)"
+    )
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    args = parser.parse_args()
+
+    try:
+        report = ComplaintIngestionService().ingest(
+            args.path, args.format, args.rejects, args.chunk_size
+        )
+    finally:
+        db_config.close_connection()
+
+    print("\n=== Ingestion Report ===")
+    print(f"Rows read: {report['read']}")
+    print(f"Inserted: {report['inserted']}")
+    print(f"Rejected: {report['rejected']} (see {report['reject_file']})")
+    print(f"Elapsed: {report['seconds']:.2f}s ({report['rows_per_sec']:,.0f} rows/sec)")
+    sys.exit(0 if report["rejected"] == 0 else 2)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,11 +15,14 @@ class Complaint:
     def create(self, user_id: int, category: str, description: str) -> bool:
         """Create a new complaint"""
         try:
+            self.db.execute_non_query(
+                "INSERT IGNORE INTO categories (name) VALUES (?)", (category,)
+            )
             query = """
-                INSERT INTO complaints (user_id, category, description, status)
-                VALUES (?, ?, ?, 'Pending')
+                INSERT INTO complaints (user_id, category, category_id, description, status)
+                VALUES (?, ?, (SELECT id FROM categories WHERE name = ?), ?, 'Pending')
             """
-            self.db.execute_non_query(query, (user_id, category, description))
+            self.db.execute_non_query(query, (user_id, category, category, description))
             return True
         except Exception as e:
             print(f"Error creating complaint: {e}")
@@ -83,13 +86,15 @@ class Complaint:
             return []
 
     def find_by_id(self, complaint_id: int) -> Optional[Dict[str, Any]]:
-        """Get complaint by ID with user information"""
+        """Get complaint by ID with user and assigned staff information"""
         try:
             query = """
                 SELECT c.id, c.category, c.description, c.status, c.created_at,
-                       c.user_id, u.name as user_name, c.assigned_to
+                       c.user_id, u.name as user_name, c.assigned_to,
+                       a.name as assigned_staff_name
                 FROM complaints c
                 JOIN users u ON c.user_id = u.id
+                LEFT JOIN users a ON c.assigned_to = a.id
                 WHERE c.id = ?
             """
             results = self.db.execute_query(query, (complaint_id,))
@@ -107,10 +112,8 @@ class Complaint:
                     "assigned_to": row[7],
                 }
 
-                # Get assigned staff name if available
                 if complaint["assigned_to"]:
-                    staff = self.user_model.find_by_id(complaint["assigned_to"])
-                    complaint["assigned_staff_name"] = staff["name"] if staff else None
+                    complaint["assigned_staff_name"] = row[8]
 
                 return complaint
             return None
@@ -0,0 +1,79 @@
+"""
+Statistics Reconciliation Script
+Rebuilds the complaint_stats rollup from the complaints table to repair drift.
+Run it once after upgrading an existing database, then periodically (cron or
+--interval) to correct counts changed outside the DAO layer, such as complaints
+removed by ON DELETE CASCADE when a user is deleted. --rebuild-daily also
+backfills the daily rollup behind the trends report; run it once after
+upgrading, as it replaces recorded resolution history with an estimate.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config.database import db_config
+from services.complaint_service import ComplaintService
+
+
+def reconcile_stats() -> bool:
+    """Recompute the statistics rollup once"""
+    complaint_service = ComplaintService()
+    started = time.perf_counter()
+    if complaint_service.reconcile_statistics():
+        elapsed = time.perf_counter() - started
+        print(f"Complaint statistics reconciled in {elapsed:.2f}s")
+        return True
+    print("Complaint statistics reconciliation failed")
+    return False
+
+
+def rebuild_daily_stats() -> bool:
+    """Recompute the daily trends rollup once"""
+    complaint_service = ComplaintService()
+    started = time.perf_counter()
+    if complaint_service.rebuild_daily_statistics():
+        elapsed = time.perf_counter() - started
+        print(f"Daily complaint statistics rebuilt in {elapsed:.2f}s")
+        return True
+    print("Daily complaint statistics rebuild failed")
+    return False
+
+
+def main():
+    """Reconcile once, or keep reconciling every --interval seconds"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=0,
+        help="Seconds between runs; 0 runs a single reconciliation (default)",
+    )
+    parser.add_argument(
+        "--rebuild-daily",
+        action="store_true",
+        help="Also rebuild the daily trends rollup (once, after upgrading)",
+    )
+    args = parser.parse_args()
+
+    try:
+        if args.rebuild_daily and not rebuild_daily_stats():
+            sys.exit(1)
+        if args.interval <= 0:
+            sys.exit(0 if reconcile_stats() else 1)
+
+        while True:
+            reconcile_stats()
+            time.sleep(args.interval)
+    except KeyboardInterrupt:
+        print("\nReconciliation stopped.")
+    finally:
+        db_config.close_connection()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Search Index Refresh Script
+Brings the embedded BM25 search index (SEARCH_BACKEND=bm25) up to date with
+the database. Each run applies only complaints changed, deleted or commented
+on since the last run; use --rebuild after restoring a backup or editing
+comments outside the application. Run it from cron or with --interval.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config.database import db_config
+from services.search_service import SearchIndexService
+
+
+def refresh_index(search_index_service: SearchIndexService, rebuild: bool) -> bool:
+    """Refresh or rebuild the index once"""
+    started = time.perf_counter()
+    try:
+        if rebuild:
+            report = {"indexed": search_index_service.rebuild(), "deleted": 0}
+        else:
+            report = search_index_service.refresh()
+    except Exception as e:
+        print(f"Search index refresh failed: {e}")
+        return False
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"Search index: {report['indexed']} indexed, {report['deleted']} deleted, "
+        f"{len(search_index_service.index)} live in {elapsed:.2f}s"
+    )
+    return True
+
+
+def main():
+    """Refresh once, or keep refreshing every --interval seconds"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--index-path", help="Index directory (default: SEARCH_INDEX_PATH)"
+    )
+    parser.add_argument(
+        "--rebuild", action="store_true", help="Reindex every complaint from scratch"
+    )
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=0,
+        help="Seconds between runs; 0 runs a single refresh (default)",
+    )
+    args = parser.parse_args()
+
+    try:
+        search_index_service = SearchIndexService(args.index_path)
+        if args.interval <= 0:
+            sys.exit(0 if refresh_index(search_index_service, args.rebuild) else 1)
+
+        refresh_index(search_index_service, args.rebuild)
+        while True:
+            time.sleep(args.interval)
+            refresh_index(search_index_service, False)
+    except KeyboardInterrupt:
+        print("\nSearch index refresh stopped.")
+    finally:
+        db_config.close_connection()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,3 @@
+"""
+Embedded search engines that run without the database's full-text support
+"""
@@ -0,0 +1,504 @@
+import bisect
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import shutil
+import sys
+import threading
+from array import array
+from collections import Counter
+from operator import itemgetter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    "a an and are as at be been but by for from has have i in is it its me my "
+    "no not of on or our so that the this to was we were will with you your".split()
+)
+
+MAX_SEGMENTS = 8
+MAX_TF = 0xFFFF
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lower-case word tokens, dropping stopwords"""
+    return [
+        token
+        for token in TOKEN_RE.findall(text.lower())
+        if len(token) > 1 and token not in STOPWORDS
+    ]
+
+
+def _write_atomic(path: str, data: bytes):
+    """Replace a file in one step so readers never see it half written"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _remove_quietly(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class Segment:
+    """One immutable, memory-mapped slice of the index
+
+    Files for segment <name>:
+      <name>.dict  JSON term dictionary: term -> [byte offset, document count]
+      <name>.post  per term, document ordinals (uint32) then term counts (uint16)
+      <name>.docs  document count, then complaint ids and lengths (uint32)
+      <name>.del   bitmap of ordinals whose document was deleted or replaced
+
+    Ordinals index the docs table, which is sorted by complaint id. Only the
+    bitmap changes after a segment is written, and each change goes to a new
+    generation (<name>.<generation>.del) named in meta.json, so the bitmap a
+    committed meta.json refers to is never overwritten.
+    """
+
+    def __init__(self, directory: str, name: str, generation: int = 0):
+        self.name = name
+        self.base = os.path.join(directory, name)
+        self.generation = generation
+        with open(f"{self.base}.dict", encoding="utf-8") as f:
+            self.terms: Dict[str, List[int]] = json.load(f)
+
+        self._post_file = open(f"{self.base}.post", "rb")
+        self._docs_file = open(f"{self.base}.docs", "rb")
+        self._post = self._map(self._post_file)
+        self._docs = self._map(self._docs_file)
+        docs = memoryview(self._docs)
+        self.count = docs[:4].cast("I")[0]
+        self.ids = docs[4 : 4 + 4 * self.count].cast("I")
+        self.lengths = docs[4 + 4 * self.count : 4 + 8 * self.count].cast("I")
+        with open(self.del_path, "rb") as f:
+            self.deleted = bytearray(f.read())
+        self.has_deletes = any(self.deleted)
+        self._norms: Optional[Tuple[float, List[float]]] = None
+
+    @property
+    def del_path(self) -> str:
+        if self.generation == 0:
+            return f"{self.base}.del"
+        return f"{self.base}.{self.generation}.del"
+
+    @staticmethod
+    def _map(f):
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        """Release the memory maps"""
+        for view in (self.ids, self.lengths):
+            view.release()
+        for mapped in (self._post, self._docs):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+        self._post_file.close()
+        self._docs_file.close()
+
+    def postings(self, term: str) -> Optional[Tuple[memoryview, memoryview]]:
+        """Ordinals and term counts of the documents containing term"""
+        entry = self.terms.get(term)
+        if entry is None:
+            return None
+        offset, df = entry
+        view = memoryview(self._post)
+        ordinals = view[offset : offset + 4 * df].cast("I")
+        counts = view[offset + 4 * df : offset + 6 * df].cast("H")
+        return ordinals, counts
+
+    def is_deleted(self, ordinal: int) -> bool:
+        return bool(self.deleted[ordinal >> 3] & (1 << (ordinal & 7)))
+
+    def find(self, doc_id: int) -> Optional[int]:
+        """Ordinal of a live document, or None"""
+        ordinal = bisect.bisect_left(self.ids, doc_id)
+        if ordinal < self.count and self.ids[ordinal] == doc_id:
+            if not self.is_deleted(ordinal):
+                return ordinal
+        return None
+
+    def delete(self, ordinal: int):
+        self.deleted[ordinal >> 3] |= 1 << (ordinal & 7)
+        self.has_deletes = True
+
+    def save_deletes(self) -> str:
+        """Write the bitmap as a new generation and return the previous file
+
+        The previous file is still referenced by the committed meta.json, so
+        it may only be removed once the new generation has been committed.
+        """
+        previous = self.del_path
+        self.generation += 1
+        _write_atomic(self.del_path, bytes(self.deleted))
+        return previous
+
+    def norms(self, k1: float, b: float, avgdl: float) -> List[float]:
+        """Per-document BM25 length normalisation, cached for the current avgdl"""
+        if self._norms is None or self._norms[0] != avgdl:
+            scale = k1 * b / avgdl
+            base = k1 * (1 - b)
+            self._norms = (avgdl, [base + scale * length for length in self.lengths])
+        return self._norms[1]
+
+    def files(self) -> List[str]:
+        """Paths of the files making up the segment's current version"""
+        return [
+            f"{self.base}.dict",
+            f"{self.base}.post",
+            f"{self.base}.docs",
+            self.del_path,
+        ]
+
+    def remove_files(self):
+        for path in self.files():
+            _remove_quietly(path)
+
+
+class BM25Index:
+    """Persistent inverted index over complaint text with BM25 ranking
+
+    Each update() writes one new immutable segment and new generations of
+    the older segments' delete bitmaps marking replaced or deleted documents,
+    then commits by atomically replacing meta.json. Files the previous commit
+    used are removed only after that. Posting lists are memory-mapped, so
+    opening an index and running queries never loads them into the heap.
+    Segments are merged once there are more than MAX_SEGMENTS.
+
+    meta.json also stores a caller-defined `state` dict committed together
+    with each update, used to hold the database watermark the index has
+    caught up to. There is one writer; readers pick up new commits through
+    reload_if_changed().
+    """
+
+    def __init__(self, directory: str, k1: float = 1.2, b: float = 0.75):
+        self.directory = directory
+        self.k1 = k1
+        self.b = b
+        self.segments: List[Segment] = []
+        self.meta: Dict[str, Any] = {}
+        self._meta_mtime: Optional[int] = None
+        self._reload_lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+
+    @property
+    def meta_path(self) -> str:
+        return os.path.join(self.directory, "meta.json")
+
+    @property
+    def state(self) -> Dict[str, Any]:
+        state: Dict[str, Any] = self.meta["state"]
+        return state
+
+    def __len__(self) -> int:
+        live_docs: int = self.meta["live_docs"]
+        return live_docs
+
+    def _read_meta(self) -> Dict[str, Any]:
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, encoding="utf-8") as f:
+                meta: Dict[str, Any] = json.load(f)
+            if meta.get("byteorder") != sys.byteorder:
+                raise ValueError("Search index was built on a different byte order")
+            self._meta_mtime = os.stat(self.meta_path).st_mtime_ns
+            return meta
+        return {
+            "byteorder": sys.byteorder,
+            "segments": [],
+            "deletes": {},
+            "next_segment": 0,
+            "live_docs": 0,
+            "total_length": 0,
+            "state": {},
+        }
+
+    def _load(self, attempts: int = 3):
+        """Open the segments listed in meta.json"""
+        for attempt in range(attempts):
+            meta = self._read_meta()
+            generations = meta.get("deletes", {})
+            try:
+                segments = [
+                    Segment(self.directory, name, generations.get(name, 0))
+                    for name in meta["segments"]
+                ]
+                break
+            except FileNotFoundError:
+                # The writer removes files of the previous commit once the next
+                # one is published, so a newer meta.json names what is there
+                if attempt == attempts - 1:
+                    raise
+
+        # Swap rather than close: searches running on other threads may still
+        # be reading the old segments, which are unmapped once unreferenced
+        self.segments = segments
+        self.meta = meta
+
+    def reload_if_changed(self) -> bool:
+        """Reopen the index if another process committed since it was loaded"""
+        try:
+            mtime = os.stat(self.meta_path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self._meta_mtime:
+            return False
+        with self._reload_lock:
+            if mtime != self._meta_mtime:
+                self._load()
+        return True
+
+    def close(self):
+        for segment in self.segments:
+            segment.close()
+        self.segments = []
+
+    def clear(self):
+        """Drop every document and the stored state"""
+        old_segments = self.segments
+        self.segments = []
+        self.meta.update(segments=[], live_docs=0, total_length=0, state={})
+        self._commit()
+        for segment in old_segments:
+            segment.close()
+            segment.remove_files()
+
+    def staging(self) -> "BM25Index":
+        """An empty index beside this one to rebuild into, for replace()
+
+        Its segment numbers continue from this index's, so its files can be
+        moved in next to the live ones without taking their names.
+        """
+        directory = f"{os.path.normpath(self.directory)}.staging"
+        shutil.rmtree(directory, ignore_errors=True)
+        staging = BM25Index(directory, self.k1, self.b)
+        staging.meta["next_segment"] = self.meta["next_segment"]
+        return staging
+
+    def replace(self, other: "BM25Index"):
+        """Publish another index's documents and state in place of these ones
+
+        The other index's files are moved into this directory, so both must
+        be on one filesystem, and then committed with a single meta.json
+        rename: readers go straight from the old contents to the new ones.
+        The other index's directory is removed afterwards.
+        """
+        live = {segment.name for segment in self.segments}
+        if live & {segment.name for segment in other.segments}:
+            raise ValueError("Replacement index reuses live segment names")
+
+        moved = []
+        for segment in other.segments:
+            for path in segment.files():
+                os.replace(path, os.path.join(self.directory, os.path.basename(path)))
+            moved.append((segment.name, segment.generation))
+        other.close()
+
+        old_segments = self.segments
+        self.segments = [
+            Segment(self.directory, name, generation) for name, generation in moved
+        ]
+        self.meta.update(
+            next_segment=max(self.meta["next_segment"], other.meta["next_segment"]),
+            live_docs=other.meta["live_docs"],
+            total_length=other.meta["total_length"],
+            state=other.meta["state"],
+        )
+        self._commit()
+        for segment in old_segments:
+            segment.close()
+            segment.remove_files()
+        shutil.rmtree(other.directory, ignore_errors=True)
+
+    def update(
+        self,
+        documents: Iterable[Tuple[int, str]] = (),
+        deleted: Iterable[int] = (),
+        state: Optional[Dict[str, Any]] = None,
+    ):
+        """Add or replace documents, delete others and commit, all at once"""
+        latest: Dict[int, List[str]] = {}
+        for doc_id, text in documents:
+            latest[doc_id] = tokenize(text)
+
+        # Hide the previous version of every replaced or deleted document
+        touched = set()
+        for doc_id in set(latest) | set(deleted):
+            for segment in self.segments:
+                ordinal = segment.find(doc_id)
+                if ordinal is not None:
+                    segment.delete(ordinal)
+                    touched.add(segment)
+                    self.meta["live_docs"] -= 1
+                    self.meta["total_length"] -= segment.lengths[ordinal]
+
+        if latest:
+            doc_ids = sorted(latest)
+            postings: Dict[str, Tuple[array, array]] = {}
+            lengths = array("I")
+            for ordinal, doc_id in enumerate(doc_ids):
+                tokens = latest[doc_id]
+                lengths.append(len(tokens))
+                for term, tf in Counter(tokens).items():
+                    entry = postings.get(term)
+                    if entry is None:
+                        entry = postings[term] = (array("I"), array("H"))
+                    entry[0].append(ordinal)
+                    entry[1].append(min(tf, MAX_TF))
+            name = self._write_segment(
+                array("I", doc_ids), lengths, sorted(postings.items())
+            )
+            self.segments.append(Segment(self.directory, name))
+            self.meta["live_docs"] += len(doc_ids)
+            self.meta["total_length"] += sum(lengths)
+
+        superseded = [segment.save_deletes() for segment in touched]
+        if state is not None:
+            self.meta["state"] = state
+        self._commit()
+        for path in superseded:
+            _remove_quietly(path)
+
+        if len(self.segments) > MAX_SEGMENTS:
+            self.compact()
+
+    def compact(self):
+        """Merge every segment into one, dropping deleted documents"""
+        if len(self.segments) < 2 and not any(s.has_deletes for s in self.segments):
+            return
+
+        live = []
+        for index, segment in enumerate(self.segments):
+            for ordinal in range(segment.count):
+                if not segment.has_deletes or not segment.is_deleted(ordinal):
+                    live.append((segment.ids[ordinal], index, ordinal))
+        live.sort()
+
+        remaps = [array("i", [-1]) * segment.count for segment in self.segments]
+        doc_ids = array("I")
+        lengths = array("I")
+        for new_ordinal, (doc_id, index, ordinal) in enumerate(live):
+            remaps[index][ordinal] = new_ordinal
+            doc_ids.append(doc_id)
+            lengths.append(self.segments[index].lengths[ordinal])
+
+        def merged_postings():
+            for term in sorted(set().union(*(s.terms for s in self.segments))):
+                pairs = []
+                for index, segment in enumerate(self.segments):
+                    found = segment.postings(term)
+                    if found is None:
+                        continue
+                    remap = remaps[index]
+                    for ordinal, tf in zip(*found):
+                        new_ordinal = remap[ordinal]
+                        if new_ordinal >= 0:
+                            pairs.append((new_ordinal, tf))
+                if pairs:
+                    pairs.sort()
+                    yield term, (
+                        array("I", [p[0] for p in pairs]),
+                        array("H", [p[1] for p in pairs]),
+                    )
+
+        name = self._write_segment(doc_ids, lengths, merged_postings())
+        old_segments = self.segments
+        self.segments = [Segment(self.directory, name)]
+        self.meta["live_docs"] = len(doc_ids)
+        self.meta["total_length"] = sum(lengths)
+        self._commit()
+        for segment in old_segments:
+            segment.close()
+            segment.remove_files()
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, float]]:
+        """Return up to limit (complaint id, score) pairs, best first"""
+        self.reload_if_changed()
+        meta, segments = self.meta, self.segments
+        live_docs = meta["live_docs"]
+        if not live_docs:
+            return []
+        avgdl = max(meta["total_length"] / live_docs, 1.0)
+        k1_plus_1 = self.k1 + 1
+
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            candidates = [(s, s.postings(term)) for s in segments]
+            found = [(s, p) for s, p in candidates if p is not None]
+            if not found:
+                continue
+            df = sum(len(p[0]) for _, p in found)
+            idf = math.log(1 + (live_docs - df + 0.5) / (df + 0.5))
+
+            for segment, (ordinals, counts) in found:
+                norms = segment.norms(self.k1, self.b, avgdl)
+                ids = segment.ids
+                check_deleted = segment.has_deletes
+                for ordinal, tf in zip(ordinals, counts):
+                    if check_deleted and segment.is_deleted(ordinal):
+                        continue
+                    doc_id = ids[ordinal]
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * k1_plus_1 / (
+                        tf + norms[ordinal]
+                    )
+
+        return heapq.nlargest(limit, scores.items(), key=itemgetter(1))
+
+    def _write_segment(
+        self,
+        doc_ids: array,
+        lengths: array,
+        postings: Iterable[Tuple[str, Tuple[array, array]]],
+    ) -> str:
+        """Write a segment's files, postings in term order, and return its name"""
+        name = f"seg_{self.meta['next_segment']:06d}"
+        self.meta["next_segment"] += 1
+        base = os.path.join(self.directory, name)
+
+        terms = {}
+        with open(f"{base}.post", "wb") as f:
+            for term, (ordinals, counts) in postings:
+                terms[term] = [f.tell(), len(ordinals)]
+                f.write(ordinals.tobytes())
+                f.write(counts.tobytes())
+                if len(counts) % 2:
+                    f.write(b"\0\0")  # keep the next term's uint32s aligned
+            f.flush()
+            os.fsync(f.fileno())
+
+        _write_atomic(
+            f"{base}.docs",
+            array("I", [len(doc_ids)]).tobytes()
+            + doc_ids.tobytes()
+            + lengths.tobytes(),
+        )
+        _write_atomic(f"{base}.del", bytes((len(doc_ids) + 7) // 8))
+        _write_atomic(
+            f"{base}.dict", json.dumps(terms, separators=(",", ":")).encode("utf-8")
+        )
+        return name
+
+    def _commit(self):
+        """Publish the current segment list, stats and state"""
+        self.meta["segments"] = [segment.name for segment in self.segments]
+        self.meta["deletes"] = {
+            segment.name: segment.generation
+            for segment in self.segments
+            if segment.generation
+        }
+        _write_atomic(
+            self.meta_path, json.dumps(self.meta, default=str).encode("utf-8")
+        )
+        self._meta_mtime = os.stat(self.meta_path).st_mtime_ns
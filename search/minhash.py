@@ -0,0 +1,107 @@
+import random
+import re
+from array import array
+from hashlib import blake2b
+from typing import List, Set
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+NUM_PERM = 64
+BANDS = 16
+SHINGLE_WORDS = 2
+
+_MASK64 = (1 << 64) - 1
+_BAND_BITS = 56
+_EMPTY = 0xFFFFFFFF
+
+
+def shingles(text: str, size: int = SHINGLE_WORDS) -> Set[bytes]:
+    """Overlapping word n-grams of the lower-cased text"""
+    words = WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        return {" ".join(words).encode()} if words else set()
+    return {
+        " ".join(words[i : i + size]).encode() for i in range(len(words) - size + 1)
+    }
+
+
+class MinHasher:
+    """MinHash signatures of short texts for Jaccard similarity estimates
+
+    Each shingle is hashed once to 64 bits and then permuted with NUM_PERM
+    multiply-add hash functions; the signature keeps the minimum of each.
+    The fraction of equal positions in two signatures estimates the Jaccard
+    similarity of the texts' shingle sets. Seeds are fixed, so signatures
+    stored by one process are comparable with those computed by another.
+    """
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._perms = [
+            (rng.getrandbits(64) | 1, rng.getrandbits(64)) for _ in range(num_perm)
+        ]
+
+    def signature(self, text: str) -> array:
+        """Signature of a text as num_perm uint32 values"""
+        hashes = [
+            int.from_bytes(blake2b(shingle, digest_size=8).digest(), "little")
+            for shingle in shingles(text)
+        ]
+        if not hashes:
+            return array("I", [_EMPTY] * self.num_perm)
+        return array(
+            "I",
+            [
+                min(((a * h + b) & _MASK64) >> 32 for h in hashes)
+                for a, b in self._perms
+            ],
+        )
+
+
+def similarity(first: array, second: array) -> float:
+    """Estimated Jaccard similarity of two signatures"""
+    if not len(first) or len(first) != len(second):
+        return 0.0
+    matches = sum(1 for x, y in zip(first, second) if x == y)
+    return matches / len(first)
+
+
+def band_keys(signature: array, bands: int = BANDS) -> List[int]:
+    """LSH bucket keys, one per band, as non-negative signed-BIGINT-safe ints
+
+    Two signatures share a key when one whole band of rows is identical.
+    With 16 bands of 4 rows, pairs at Jaccard 0.8 collide with probability
+    above 0.99 and pairs at 0.3 with probability below 0.13. The band number
+    is kept in the top bits so equal rows in different bands never collide.
+    """
+    rows = len(signature) // bands
+    keys = []
+    for band in range(bands):
+        digest = blake2b(
+            signature[band * rows : (band + 1) * rows].tobytes(), digest_size=7
+        ).digest()
+        keys.append((band << _BAND_BITS) | int.from_bytes(digest, "little"))
+    return keys
+
+
+def to_bytes(signature: array) -> bytes:
+    """Pack a signature for storage, independent of the host byte order"""
+    packed = array("I", signature)
+    if packed.itemsize != 4:
+        raise ValueError("uint32 arrays are required")
+    if not _LITTLE_ENDIAN:
+        packed.byteswap()
+    return packed.tobytes()
+
+
+def from_bytes(data: bytes) -> array:
+    """Unpack a stored signature"""
+    signature = array("I")
+    signature.frombytes(data)
+    if not _LITTLE_ENDIAN:
+        signature.byteswap()
+    return signature
+
+
+_LITTLE_ENDIAN = array("I", [1]).tobytes()[0] == 1
@@ -0,0 +1,158 @@
+import heapq
+import json
+import math
+import zlib
+from array import array
+from collections import Counter
+from operator import itemgetter
+from typing import Dict, List, Tuple
+
+from search.bm25_index import _write_atomic, tokenize
+
+# Size of the hashed feature space (a power of two)
+N_FEATURES = 2**18
+
+
+def features(text: str) -> Counter:
+    """Hashed counts of a text's words and adjacent word pairs"""
+    tokens = tokenize(text)
+    grams = tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+    return Counter(zlib.crc32(gram.encode()) & (N_FEATURES - 1) for gram in grams)
+
+
+class NaiveBayesClassifier:
+    """Multinomial naive Bayes over hashed word and word-pair features
+
+    Each feature seen in training holds a row with one log-likelihood per
+    label, stored relative to a feature never seen with that label. Scoring
+    a text therefore adds up one row per known feature it contains; features
+    the model does not know are ignored.
+    """
+
+    def __init__(
+        self,
+        labels: List[str],
+        log_priors: List[float],
+        unseen: List[float],
+        rows: Dict[int, array],
+    ):
+        self.labels = labels
+        self.log_priors = log_priors
+        self.unseen = unseen
+        self.rows = rows
+
+    def scores(self, counts: Counter) -> List[float]:
+        """Unnormalized log-probability of every label for hashed features"""
+        columns = []
+        get = self.rows.get
+        for feature, count in counts.items():
+            row = get(feature)
+            if row is not None:
+                columns.extend([row] * count)
+        base = [p + len(columns) * u for p, u in zip(self.log_priors, self.unseen)]
+        # Transposing the gathered rows sums each label's column in C
+        return list(map(sum, zip(base, *columns)))
+
+    def predict_features(self, counts: Counter, k: int = 1) -> List[Tuple[str, float]]:
+        """Top k (label, probability) pairs for hashed features, best first"""
+        if not self.labels:
+            return []
+        scores = self.scores(counts)
+        best = max(scores)
+        weights = [math.exp(s - best) for s in scores]
+        norm = sum(weights)
+        top = heapq.nlargest(k, enumerate(weights), key=itemgetter(1))
+        return [(self.labels[i], weight / norm) for i, weight in top]
+
+    def predict(self, text: str, k: int = 1) -> List[Tuple[str, float]]:
+        """Top k (label, probability) pairs for a text, best first"""
+        return self.predict_features(features(text), k)
+
+    def save(self, path: str):
+        """Write the model as a JSON header line followed by its arrays"""
+        keys = array("I", sorted(self.rows))
+        matrix = array("f")
+        for key in keys:
+            matrix.extend(self.rows[key])
+        header = {
+            "labels": self.labels,
+            "log_priors": self.log_priors,
+            "unseen": self.unseen,
+            "features": len(keys),
+        }
+        _write_atomic(
+            path,
+            json.dumps(header).encode() + b"\n" + keys.tobytes() + matrix.tobytes(),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "NaiveBayesClassifier":
+        """Read a model written by save()"""
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            keys = array("I")
+            keys.fromfile(f, header["features"])
+            matrix = array("f")
+            matrix.fromfile(f, header["features"] * len(header["labels"]))
+        width = len(header["labels"])
+        rows = {key: matrix[i * width : (i + 1) * width] for i, key in enumerate(keys)}
+        return cls(header["labels"], header["log_priors"], header["unseen"], rows)
+
+
+class NaiveBayesTrainer:
+    """Accumulate labelled examples in one pass and build a classifier
+
+    Features seen fewer than min_feature_count times overall are dropped,
+    which keeps the model small without hurting accuracy.
+    """
+
+    def __init__(self, alpha: float = 0.1, min_feature_count: int = 2):
+        self.alpha = alpha
+        self.min_feature_count = min_feature_count
+        self.label_ids: Dict[str, int] = {}
+        self.doc_counts: List[int] = []
+        self.token_counts: List[int] = []
+        # Keyed by feature * 65536 + label id so the table holds plain ints
+        self.counts: Counter = Counter()
+
+    def add(self, counts: Counter, label: str):
+        """Count one example's hashed features under its label"""
+        label_id = self.label_ids.get(label)
+        if label_id is None:
+            label_id = self.label_ids[label] = len(self.label_ids)
+            self.doc_counts.append(0)
+            self.token_counts.append(0)
+        self.doc_counts[label_id] += 1
+        self.token_counts[label_id] += sum(counts.values())
+        for feature, count in counts.items():
+            self.counts[(feature << 16) | label_id] += count
+
+    def build(self) -> NaiveBayesClassifier:
+        """Turn the accumulated counts into smoothed log-likelihood rows"""
+        n_labels = len(self.label_ids)
+        totals: Counter = Counter()
+        for key, count in self.counts.items():
+            totals[key >> 16] += count
+        kept = {f for f, count in totals.items() if count >= self.min_feature_count}
+
+        # Dropped features leave their label totals untouched, so kept
+        # features keep the same likelihoods they would have had
+        vocabulary = len(totals)
+        denominators = [
+            tokens + self.alpha * vocabulary for tokens in self.token_counts
+        ]
+        unseen = [math.log(self.alpha / d) for d in denominators]
+
+        rows: Dict[int, array] = {}
+        for key, count in self.counts.items():
+            feature = key >> 16
+            if feature not in kept:
+                continue
+            row = rows.get(feature)
+            if row is None:
+                row = rows[feature] = array("f", bytes(4 * n_labels))
+            row[key & 0xFFFF] = math.log((count + self.alpha) / self.alpha)
+
+        documents = sum(self.doc_counts)
+        log_priors = [math.log(count / documents) for count in self.doc_counts]
+        return NaiveBayesClassifier(list(self.label_ids), log_priors, unseen, rows)
@@ -0,0 +1,76 @@
+from typing import Dict, List, Optional, Tuple
+
+TOP_K = 10
+
+
+class _Node:
+    __slots__ = ("children", "weight", "top")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_Node"] = {}
+        self.weight = 0
+        # Best (weight, key) pairs in this subtree, heaviest first
+        self.top: List[Tuple[int, str]] = []
+
+
+class PrefixTrie:
+    """Character trie that suggests the heaviest keys under a prefix
+
+    Every node caches the TOP_K heaviest keys below it, so a suggestion is a
+    walk down the prefix plus a slice, independent of how many keys share
+    it. Changing a key's weight refreshes only the caches on its path.
+    """
+
+    def __init__(self) -> None:
+        self.root = _Node()
+
+    def __len__(self) -> int:
+        return self._count(self.root)
+
+    def _count(self, node: _Node) -> int:
+        return (node.weight > 0) + sum(self._count(c) for c in node.children.values())
+
+    def set_weight(self, key: str, weight: int):
+        """Insert, reweight or (with weight 0) remove a key"""
+        path = [self.root]
+        node = self.root
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                if weight <= 0:
+                    return
+                child = node.children[char] = _Node()
+            path.append(child)
+            node = child
+        node.weight = max(weight, 0)
+
+        # Recompute the cached top lists bottom-up along the key's path
+        for depth in range(len(path) - 1, -1, -1):
+            node = path[depth]
+            candidates = [] if node.weight <= 0 else [(node.weight, key[:depth])]
+            for child in node.children.values():
+                candidates.extend(child.top)
+            candidates.sort(key=lambda pair: (-pair[0], pair[1]))
+            node.top = candidates[:TOP_K]
+            if depth and not node.top:
+                del path[depth - 1].children[key[depth - 1]]
+
+    def weight(self, key: str) -> int:
+        node = self._find(key)
+        return node.weight if node else 0
+
+    def suggest(self, prefix: str, limit: int = TOP_K) -> List[Tuple[str, int]]:
+        """Return up to limit (key, weight) pairs starting with prefix"""
+        node = self._find(prefix)
+        if node is None:
+            return []
+        return [(key, weight) for weight, key in node.top[:limit]]
+
+    def _find(self, key: str) -> Optional[_Node]:
+        node = self.root
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                return None
+            node = child
+        return node
@@ -0,0 +1,141 @@
+import heapq
+import math
+from array import array
+from collections import Counter
+from operator import itemgetter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from search.bm25_index import tokenize
+
+# Only the heaviest query terms are scored; the rest barely move the ranking
+MAX_QUERY_TERMS = 12
+
+# Terms in more than this share of documents are skipped at query time
+# unless the query has nothing rarer
+MAX_DF_RATIO = 0.2
+
+
+class TfidfIndex:
+    """In-memory TF-IDF vectors of short texts for cosine similarity lookups
+
+    The corpus is stored column-wise, as a sparse term-document matrix in
+    which each term holds parallel arrays of document ordinals and
+    L2-normalized weights (sublinear tf times smoothed idf). A query is one
+    sparse matrix-vector product over the columns of its terms, followed by
+    a top-k selection.
+
+    idf is fixed when the index is built. Documents added afterwards are
+    weighted with it, so rebuild periodically to keep weights honest.
+    """
+
+    def __init__(self) -> None:
+        self.doc_ids = array("I")
+        self.ordinals: Dict[int, int] = {}
+        self.removed: set = set()
+        self.postings: Dict[str, Tuple[array, array]] = {}
+        self.idf: Dict[str, float] = {}
+        self.built_docs = 0
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    @classmethod
+    def build(cls, documents: Iterable[Tuple[int, str]]) -> "TfidfIndex":
+        """Index a corpus in two passes over its postings, not its documents"""
+        index = cls()
+        counts: Dict[str, Tuple[array, array]] = {}
+        for doc_id, text in documents:
+            ordinal = index._new_ordinal(doc_id)
+            for term, tf in Counter(tokenize(text)).items():
+                entry = counts.get(term)
+                if entry is None:
+                    entry = counts[term] = (array("I"), array("f"))
+                entry[0].append(ordinal)
+                entry[1].append(1.0 + math.log(tf))
+
+        n_docs = index.built_docs = len(index.doc_ids)
+        norms = array("d", bytes(8 * n_docs))
+        for term, (ordinals, weights) in counts.items():
+            idf = index.idf[term] = math.log((1 + n_docs) / (1 + len(ordinals))) + 1
+            for position, ordinal in enumerate(ordinals):
+                weights[position] *= idf
+                norms[ordinal] += weights[position] * weights[position]
+
+        for term, (ordinals, weights) in counts.items():
+            for position, ordinal in enumerate(ordinals):
+                weights[position] /= math.sqrt(norms[ordinal])
+        index.postings = counts
+        return index
+
+    def _new_ordinal(self, doc_id: int) -> int:
+        ordinal = len(self.doc_ids)
+        self.doc_ids.append(doc_id)
+        self.ordinals[doc_id] = ordinal
+        return ordinal
+
+    def _term_idf(self, term: str) -> float:
+        idf = self.idf.get(term)
+        if idf is None:
+            idf = math.log((1 + self.built_docs) / 2) + 1
+        return idf
+
+    def vectorize(self, text: str) -> Dict[str, float]:
+        """L2-normalized TF-IDF weights of a text"""
+        weights = {
+            term: (1.0 + math.log(tf)) * self._term_idf(term)
+            for term, tf in Counter(tokenize(text)).items()
+        }
+        norm = math.sqrt(sum(w * w for w in weights.values()))
+        return {term: w / norm for term, w in weights.items()} if norm else {}
+
+    def add(self, doc_id: int, text: str):
+        """Append a document, replacing an earlier version of it"""
+        self.remove(doc_id)
+        ordinal = self._new_ordinal(doc_id)
+        for term, weight in self.vectorize(text).items():
+            entry = self.postings.get(term)
+            if entry is None:
+                entry = self.postings[term] = (array("I"), array("f"))
+            entry[0].append(ordinal)
+            entry[1].append(weight)
+
+    def remove(self, doc_id: int):
+        """Hide a document from results until the next rebuild"""
+        ordinal = self.ordinals.pop(doc_id, None)
+        if ordinal is not None:
+            self.removed.add(ordinal)
+
+    def most_similar(
+        self, text: str, limit: int = 5, exclude: Optional[int] = None
+    ) -> List[Tuple[int, float]]:
+        """Return up to limit (doc id, cosine similarity) pairs, best first"""
+        query = self.vectorize(text)
+        max_df = max(MAX_DF_RATIO * len(self.doc_ids), 1)
+        terms = sorted(
+            (t for t in query.items() if t[0] in self.postings),
+            key=itemgetter(1),
+            reverse=True,
+        )
+        selective = [t for t in terms if len(self.postings[t[0]][0]) <= max_df]
+        terms = (selective or terms)[:MAX_QUERY_TERMS]
+
+        scores: Dict[int, float] = {}
+        get = scores.get
+        for term, query_weight in terms:
+            ordinals, weights = self.postings[term]
+            for ordinal, weight in zip(ordinals, weights):
+                scores[ordinal] = get(ordinal, 0.0) + query_weight * weight
+
+        skip = set(self.removed)
+        if exclude is not None and exclude in self.ordinals:
+            skip.add(self.ordinals[exclude])
+        best = heapq.nlargest(
+            limit + len(skip),
+            scores.items(),
+            key=itemgetter(1),
+        )
+        return [
+            (self.doc_ids[ordinal], score)
+            for ordinal, score in best
+            if ordinal not in skip
+        ][:limit]
@@ -0,0 +1,108 @@
+import re
+from collections import Counter
+from typing import AbstractSet, Dict, Iterable, List, Set
+
+FUZZY_THRESHOLD = 0.45
+
+
+def normalize(value: str) -> str:
+    """Case-fold and collapse whitespace so spelling variants compare equal"""
+    return re.sub(r"\s+", " ", value.casefold()).strip()
+
+
+def trigrams(text: str) -> Set[str]:
+    """Trigrams of normalized text, padded so short words still produce some"""
+    padded = f"  {text} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """In-memory trigram index over a small set of strings
+
+    Values are grouped by their normalized form, so "Bug Report" and
+    "bug report" are one entry that matches as both spellings. Substring
+    lookups intersect the posting sets of the term's trigrams and verify the
+    few survivors; when nothing contains the term, values sharing enough
+    trigrams with it are returned instead, which tolerates typos.
+    """
+
+    def __init__(self, values: Iterable[str] = ()):
+        self._spellings: Dict[str, Set[str]] = {}
+        self._grams: Dict[str, Set[str]] = {}
+        self._postings: Dict[str, Set[str]] = {}
+        for value in values:
+            self.add(value)
+
+    def __len__(self) -> int:
+        return len(self._spellings)
+
+    def add(self, value: str):
+        """Index a value (a no-op if that spelling is already present)"""
+        key = normalize(value)
+        if not key:
+            return
+        spellings = self._spellings.get(key)
+        if spellings is None:
+            spellings = self._spellings[key] = set()
+            grams = self._grams[key] = trigrams(key)
+            for gram in grams:
+                self._postings.setdefault(gram, set()).add(key)
+        spellings.add(value)
+
+    def discard(self, value: str):
+        """Remove one spelling, dropping the entry once no spelling is left"""
+        key = normalize(value)
+        spellings = self._spellings.get(key)
+        if spellings is None:
+            return
+        spellings.discard(value)
+        if spellings:
+            return
+        del self._spellings[key]
+        for gram in self._grams.pop(key):
+            keys = self._postings[gram]
+            keys.discard(key)
+            if not keys:
+                del self._postings[gram]
+
+    def search(self, term: str, limit: int = 20) -> List[str]:
+        """Return the spellings of values containing term, or close to it"""
+        term = normalize(term)
+        if not term:
+            return []
+
+        keys = self._substring_matches(term)
+        if not keys:
+            keys = self._fuzzy_matches(term)
+        values = []
+        for key in keys[:limit]:
+            values.extend(sorted(self._spellings[key]))
+        return values
+
+    def _substring_matches(self, term: str) -> List[str]:
+        inner = {term[i : i + 3] for i in range(len(term) - 2)}
+        candidates: AbstractSet[str]
+        if inner:
+            postings = sorted(
+                (self._postings.get(gram, set()) for gram in inner), key=len
+            )
+            candidates = set.intersection(*postings)
+        else:
+            # Too short for a trigram: the value set is small enough to scan
+            candidates = self._spellings.keys()
+        return sorted(
+            (key for key in candidates if term in key), key=lambda k: (len(k), k)
+        )
+
+    def _fuzzy_matches(self, term: str) -> List[str]:
+        grams = trigrams(term)
+        shared: Counter[str] = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+
+        scored = []
+        for key, count in shared.items():
+            score = 2 * count / (len(grams) + len(self._grams[key]))
+            if score >= FUZZY_THRESHOLD:
+                scored.append((-score, key))
+        return [key for _, key in sorted(scored)]
@@ -0,0 +1,145 @@
+import os
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from analytics.columnar import ComplaintSnapshot
+from analytics.tdigest import TDigest
+from dao.dao_factory import dao_factory
+from services.cache import TTLCache
+
+OPEN_STATUSES = ("Pending", "In Progress")
+
+# Durations summarized by load_response_digests, and the quantiles reported
+RESPONSE_METRICS = ("resolution", "first_response")
+QUANTILES = {"p50": 0.5, "p90": 0.9, "p99": 0.99}
+
+
+def load_snapshot() -> ComplaintSnapshot:
+    """Stream every complaint into a fresh columnar snapshot"""
+    snapshot = ComplaintSnapshot.load(
+        dao_factory.get_complaint_dao().iter_analytics_batches(),
+        dao_factory.get_category_dao().find_all(),
+    )
+    # Checked once here so the first dashboard read does not pay for it
+    snapshot.is_sorted("created_at")
+    return snapshot
+
+
+# One snapshot per process, reloaded in the background once it is older
+# than ANALYTICS_SNAPSHOT_TTL seconds
+snapshot_cache = TTLCache(
+    loader=load_snapshot, ttl=float(os.getenv("ANALYTICS_SNAPSHOT_TTL", "60"))
+)
+
+
+def load_response_digests() -> Dict[str, Dict[str, dict]]:
+    """Stream response times into one t-digest per metric and category, and
+    per metric and staff member (keyed by (id, name))"""
+    digests: Dict[str, Dict[str, dict]] = {
+        metric: {"category": {}, "staff": {}} for metric in RESPONSE_METRICS
+    }
+    for batch in dao_factory.get_complaint_dao().iter_response_times():
+        for category, staff_id, staff_name, *durations in batch:
+            for metric, seconds in zip(RESPONSE_METRICS, durations):
+                if seconds is None:
+                    continue
+                groups = digests[metric]
+                if category not in groups["category"]:
+                    groups["category"][category] = TDigest()
+                groups["category"][category].add(seconds)
+                if staff_id is not None:
+                    if (staff_id, staff_name) not in groups["staff"]:
+                        groups["staff"][(staff_id, staff_name)] = TDigest()
+                    groups["staff"][(staff_id, staff_name)].add(seconds)
+    # Compressed up front so concurrent readers never modify a shared digest
+    for groups in digests.values():
+        for group in groups.values():
+            for digest in group.values():
+                digest.compress()
+    return digests
+
+
+# Rebuilt in the background once older than RESOLUTION_STATS_TTL seconds
+response_digests_cache = TTLCache(
+    loader=load_response_digests,
+    ttl=float(os.getenv("RESOLUTION_STATS_TTL", "300")),
+)
+
+
+def summarize(digest: TDigest) -> Dict[str, Any]:
+    """Count and quantiles in whole seconds of one digest"""
+    summary: Dict[str, Any] = {"count": len(digest)}
+    for name, q in QUANTILES.items():
+        value = digest.quantile(q)
+        summary[name] = None if value is None else round(value)
+    return summary
+
+
+class AnalyticsService:
+    """Dashboard aggregates computed from an in-memory columnar snapshot"""
+
+    def __init__(self):
+        self.snapshot_cache = snapshot_cache
+        self.response_digests_cache = response_digests_cache
+
+    def get_dashboard(
+        self,
+        days: int = 30,
+        category: Optional[List[str]] = None,
+        status: Optional[List[str]] = None,
+        now: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """Breakdowns, open workload per assignee and daily inflow
+
+        category and status narrow every figure; days sets how far back
+        the daily inflow goes.
+        """
+        snapshot = self.snapshot_cache.get()
+        mask = snapshot.filter(status=status, category=category)
+        open_mask = mask & snapshot.mask("status", OPEN_STATUSES)
+        open_by_assignee = snapshot.group_count("assigned_to", open_mask)
+
+        today = (now or datetime.now()).replace(
+            hour=0, minute=0, second=0, microsecond=0
+        )
+        since = today - timedelta(days=days - 1)
+        recent = mask & snapshot.between("created_at", since)
+        return {
+            "total_complaints": snapshot.count(mask),
+            "by_status": snapshot.group_count("status", mask),
+            "by_category": snapshot.group_count("category", mask),
+            "unassigned_open": open_by_assignee.pop(0, 0),
+            "open_by_assignee": open_by_assignee,
+            "daily_created": {
+                day.date().isoformat(): count
+                for day, count in snapshot.histogram("created_at", mask=recent).items()
+            },
+            "snapshot_rows": len(snapshot),
+            "snapshot_bytes": snapshot.memory_bytes(),
+        }
+
+    def get_resolution_times(self) -> Dict[str, Any]:
+        """p50/p90/p99 seconds to resolution and to first response
+
+        Reported overall, per category and per staff member. The overall
+        figures merge the per-category digests.
+        """
+        digests = self.response_digests_cache.get()
+        report = {}
+        for metric in RESPONSE_METRICS:
+            groups = digests[metric]
+            overall = TDigest()
+            for digest in groups["category"].values():
+                overall.merge(digest)
+            report[metric] = {
+                "overall": summarize(overall) if len(overall) else {"count": 0},
+                "by_category": {
+                    category: summarize(digest)
+                    for category, digest in sorted(groups["category"].items())
+                },
+                "by_staff": {
+                    staff_id: {"name": name, **summarize(digest)}
+                    for (staff_id, name), digest in sorted(groups["staff"].items())
+                },
+            }
+        return report
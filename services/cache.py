@@ -0,0 +1,120 @@
+import copy
+import threading
+import time
+from typing import Any, Callable, Optional
+
+
+class TTLCache:
+    """Single-value cache with a time-to-live and stale-while-revalidate reads
+
+    The first read loads the value synchronously. Once the TTL has passed,
+    readers keep getting the stale value while exactly one background thread
+    reloads it. invalidate() drops the value so the next read loads fresh data,
+    and a reload that started before an invalidation is discarded.
+
+    Readers use the value returned by get() without holding the lock, so
+    update() adjusts a copy made by copy_value and swaps it in. A value that
+    guards its own state with a lock can pass copy_value=None to be adjusted
+    in place instead.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Any],
+        ttl: float,
+        copy_value: Optional[Callable[[Any], Any]] = copy.deepcopy,
+    ):
+        self.loader = loader
+        self.ttl = ttl
+        self.copy_value = copy_value
+        self._lock = threading.Lock()
+        self._value: Any = None
+        self._has_value = False
+        self._expires_at = 0.0
+        self._generation = 0
+        self._refreshing = False
+
+    def get(self) -> Any:
+        """Return the cached value, loading or revalidating it as needed"""
+        with self._lock:
+            if self._has_value:
+                if time.monotonic() >= self._expires_at and not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(
+                        target=self._refresh, args=(self._generation,), daemon=True
+                    ).start()
+                return self._value
+
+            # Nothing cached yet: load while holding the lock so concurrent
+            # callers wait for one load instead of all hitting the database
+            generation = self._generation
+            value = self.loader()
+            self._store(value, generation)
+            return value
+
+    def peek(self) -> Any:
+        """Return the cached value without blocking, or None while it first loads
+
+        For values too slow to load on a request path: the first call starts
+        the load in the background and later calls get the value once ready.
+        """
+        with self._lock:
+            if self._has_value:
+                if time.monotonic() >= self._expires_at and not self._refreshing:
+                    self._refreshing = True
+                    threading.Thread(
+                        target=self._refresh, args=(self._generation,), daemon=True
+                    ).start()
+                return self._value
+
+            if not self._refreshing:
+                self._refreshing = True
+                threading.Thread(
+                    target=self._refresh, args=(self._generation,), daemon=True
+                ).start()
+            return None
+
+    def update(self, mutator: Callable[[Any], None]) -> None:
+        """Apply an adjustment to the cached value, if one is held
+
+        The adjustment is made on a copy, so a reader still using the old
+        value never sees it change.
+        """
+        with self._lock:
+            if not self._has_value:
+                return
+            if self.copy_value is None:
+                mutator(self._value)
+                return
+            value = self.copy_value(self._value)
+            mutator(value)
+            self._value = value
+
+    def invalidate(self) -> None:
+        """Drop the cached value so the next read reloads it"""
+        with self._lock:
+            self._generation += 1
+            self._has_value = False
+            self._value = None
+
+    def _refresh(self, generation: int) -> None:
+        """Reload the value in the background"""
+        try:
+            value = self.loader()
+        except Exception as e:
+            print(f"Error refreshing cached value: {e}")
+            with self._lock:
+                self._refreshing = False
+            return
+
+        with self._lock:
+            self._refreshing = False
+            self._store(value, generation)
+
+    def _store(self, value: Any, generation: int) -> None:
+        """Store a loaded value unless the cache was invalidated meanwhile"""
+        if generation != self._generation:
+            return
+        self._value = value
+        self._has_value = True
+        self._expires_at = time.monotonic() + self.ttl
@@ -0,0 +1,117 @@
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from dao.dao_factory import dao_factory
+from search.prefix_trie import PrefixTrie
+from search.trigram_index import TrigramIndex, normalize
+from services.cache import TTLCache
+
+
+class CategoryCatalog:
+    """Known complaint categories with their complaint counts
+
+    Built from the category buckets of the statistics rollup and kept in
+    memory, so category lookups never scan the complaints table. Spellings
+    that differ only in case or spacing are grouped; the most used one is
+    the canonical category suggested to users.
+    """
+
+    def __init__(self, counts: Dict[str, int]):
+        self._lock = threading.Lock()
+        self.counts: Dict[str, int] = {}
+        self.variants: Dict[str, Dict[str, int]] = {}
+        self.trigrams = TrigramIndex()
+        self.trie = PrefixTrie()
+        for category, count in counts.items():
+            self._record(category, count)
+
+    def record(self, category: str, delta: int = 1):
+        """Count complaints filed under a category, indexing it if new"""
+        with self._lock:
+            self._record(category, delta)
+
+    def _record(self, category: str, delta: int):
+        count = self.counts.get(category, 0) + delta
+        key = normalize(category)
+        if not key:
+            return
+        variants = self.variants.setdefault(key, {})
+        if count > 0:
+            if category not in self.counts:
+                self.trigrams.add(category)
+            self.counts[category] = variants[category] = count
+        else:
+            if category in self.counts:
+                del self.counts[category]
+                self.trigrams.discard(category)
+            variants.pop(category, None)
+        if not variants:
+            del self.variants[key]
+        self.trie.set_weight(key, sum(variants.values()))
+
+    def _canonical(self, key: str) -> str:
+        variants = self.variants[key]
+        return max(variants, key=lambda category: (variants[category], category))
+
+    def canonical(self, category: str) -> Optional[str]:
+        """The canonical spelling of an existing category, or None"""
+        with self._lock:
+            key = normalize(category)
+            return self._canonical(key) if key in self.variants else None
+
+    def suggest(self, prefix: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Most used categories starting with prefix, ignoring case"""
+        with self._lock:
+            return [
+                {"category": self._canonical(key), "count": count}
+                for key, count in self.trie.suggest(normalize(prefix), limit)
+            ]
+
+    def match(self, term: str, limit: int = 20) -> List[str]:
+        """Categories containing term, or close to it when nothing does"""
+        with self._lock:
+            return self.trigrams.search(term, limit)
+
+
+# One catalog per process. Writes made here are applied immediately, in place
+# under the catalog's own lock; the TTL picks up categories added or emptied
+# by other processes.
+category_cache = TTLCache(
+    loader=lambda: CategoryCatalog(
+        dao_factory.get_complaint_dao().get_statistics().get("category", {})
+    ),
+    ttl=float(os.getenv("CATEGORY_CACHE_TTL", "300")),
+    copy_value=None,
+)
+
+
+class CategoryService:
+    """Service layer for looking up complaint categories"""
+
+    def __init__(self) -> None:
+        self.category_cache = category_cache
+
+    def _catalog(self) -> CategoryCatalog:
+        catalog: CategoryCatalog = self.category_cache.get()
+        return catalog
+
+    def match_categories(self, term: str, limit: int = 20) -> List[str]:
+        """Resolve free text to existing categories, tolerating typos"""
+        return self._catalog().match(term, limit)
+
+    def suggest_categories(self, prefix: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Autocomplete a category prefix with the most used categories"""
+        return self._catalog().suggest(prefix, limit)
+
+    def canonical_category(self, category: str) -> Optional[str]:
+        """The canonical spelling of an existing category, or None"""
+        return self._catalog().canonical(category)
+
+    def record_category(self, category: str, delta: int = 1):
+        """Keep the cached catalog in step with a complaint write"""
+        self.category_cache.update(lambda catalog: catalog.record(category, delta))
+
+    def invalidate(self):
+        """Reload the catalog on next use, after categories changed in bulk"""
+        self.category_cache.invalidate()
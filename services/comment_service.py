@@ -7,7 +7,7 @@ from dto.comment_dto import CommentDTO
 class CommentService:
     """Service layer for Comment operations using DAO pattern"""
 
-    def __init__(self):
+    def __init__(self) -> None:
         self.comment_dao = dao_factory.get_comment_dao()
 
     def create_comment(self, complaint_id: int, staff_id: int, comment: str) -> bool:
@@ -31,6 +31,28 @@ class CommentService:
         """Find comments by complaint ID"""
         return self.comment_dao.find_by_complaint_id(complaint_id)
 
+    def find_comment_page(
+        self, complaint_id: int, limit: int = 50, before_id: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """Find a page of comments, newest page first
+
+        Returns the comments (oldest first) and next_before_id, the cursor
+        for the previous page, or None when there are no older comments.
+        """
+        comments = self.comment_dao.find_page_by_complaint_id(
+            complaint_id, limit, before_id=before_id
+        )
+        next_before_id = comments[0]["id"] if len(comments) == limit else None
+        return {"comments": comments, "next_before_id": next_before_id}
+
+    def find_comments_since(
+        self, complaint_id: int, since_id: int, limit: int = 500
+    ) -> List[dict]:
+        """Find only the comments newer than the one the client already has"""
+        return self.comment_dao.find_page_by_complaint_id(
+            complaint_id, limit, since_id=since_id
+        )
+
     def find_comments_by_user_id(self, user_id: int) -> List[dict]:
         """Find comments by user ID"""
         return self.comment_dao.find_by_user_id(user_id)
@@ -1,29 +1,105 @@
-from typing import Any, Dict, List, Optional
+import os
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from dao.dao_factory import dao_factory
 from dto.complaint_dto import ComplaintDTO
+from services import search_service
+from services.analytics_service import AnalyticsService
+from services.cache import TTLCache
+from services.category_service import CategoryService
+from services.concurrency import run_concurrently
+from services.duplicate_service import DuplicateDetectionService
+from services.routing_service import RoutingService
+from services.similarity_service import SimilarityService
+
+# Column order of the rows yielded by iter_export_batches
+EXPORT_COLUMNS = ["id", "user_id", "category", "description", "status", "created_at"]
+
+# Widths of the buckets get_trends can group daily rollup rows into
+TREND_BUCKETS = ("day", "week")
+
+# Dashboard numbers only need to be seconds-fresh, so the statistics rollup is
+# cached per process and shared by every ComplaintService instance
+statistics_cache = TTLCache(
+    loader=lambda: dao_factory.get_complaint_dao().get_statistics(),
+    ttl=float(os.getenv("STATS_CACHE_TTL", "5")),
+)
 
 
 class ComplaintService:
     """Service layer for Complaint operations using DAO pattern"""
 
-    def __init__(self):
+    def __init__(self) -> None:
         self.complaint_dao = dao_factory.get_complaint_dao()
+        self.comment_dao = dao_factory.get_comment_dao()
+        self.category_dao = dao_factory.get_category_dao()
+        self.statistics_cache = statistics_cache
+        self.category_service = CategoryService()
+        self.duplicate_service = DuplicateDetectionService()
+        self.similarity_service = SimilarityService()
+        self.routing_service = RoutingService()
+        self.analytics_service = AnalyticsService()
 
     def create_complaint(self, user_id: int, category: str, description: str) -> bool:
-        """Create a new complaint"""
+        """Create a new complaint, routed and linked to any likely duplicate
+
+        A confident routing prediction assigns the complaint to staff
+        straight away.
+        """
         complaint_data = {
             "user_id": user_id,
             "category": category,
             "description": description,
             "status": "Pending",
         }
-        return self.complaint_dao.create(complaint_data)
+        complaint_data.update(self.duplicate_service.prepare(description))
+        complaint_data.update(self.routing_service.prepare(description))
+        if not self.complaint_dao.create(complaint_data):
+            return False
+
+        # The rollup's bucket column matches names by its collation, so count
+        # the complaint under the spelling the rollup already uses for the
+        # same category. The database tells which spellings match; the
+        # category DAO caches each answer, so this rarely queries.
+        def count_new_complaint(rollup: dict):
+            categories = rollup.setdefault("category", {})
+            ids = self.category_dao.find_ids([category, *categories])
+            category_id = ids.get(category)
+            bucket = next(
+                (
+                    name
+                    for name in categories
+                    if category_id is not None and ids.get(name) == category_id
+                ),
+                category,
+            )
+            for counts, name in (
+                (rollup.setdefault("status", {}), "Pending"),
+                (categories, bucket),
+            ):
+                counts[name] = counts.get(name, 0) + 1
+
+        self.statistics_cache.update(count_new_complaint)
+        self.category_service.record_category(category)
+        return True
 
     def find_complaint_by_id(self, complaint_id: int) -> Optional[dict]:
         """Find complaint by ID"""
         return self.complaint_dao.find_by_id(complaint_id)
 
+    def get_complaint_details(
+        self, complaint_id: int, comment_limit: int = 20
+    ) -> Tuple[Optional[dict], List[dict]]:
+        """Fetch a complaint's detail header and its latest comments concurrently"""
+        complaint, comments = run_concurrently(
+            lambda: self.complaint_dao.find_details(complaint_id),
+            lambda: self.comment_dao.find_page_by_complaint_id(
+                complaint_id, comment_limit
+            ),
+        )
+        return complaint, comments
+
     def find_all_complaints(self) -> List[dict]:
         """Find all complaints"""
         return self.complaint_dao.find_all()
@@ -61,11 +137,20 @@ class ComplaintService:
             "status": status,
             "assigned_to": assigned_to,
         }
-        return self.complaint_dao.update(complaint_id, complaint_data)
+        if not self.complaint_dao.update(complaint_id, complaint_data):
+            return False
+        self.statistics_cache.invalidate()
+        self.category_service.invalidate()
+        self.similarity_service.record_status(complaint_id, status)
+        return True
 
     def update_complaint_status(self, complaint_id: int, status: str) -> bool:
         """Update complaint status"""
-        return self.complaint_dao.update_status(complaint_id, status)
+        if not self.complaint_dao.update_status(complaint_id, status):
+            return False
+        self.statistics_cache.invalidate()
+        self.similarity_service.record_status(complaint_id, status)
+        return True
 
     def assign_complaint(self, complaint_id: int, staff_id: int) -> bool:
         """Assign complaint to staff member"""
@@ -73,61 +158,223 @@ class ComplaintService:
 
     def delete_complaint(self, complaint_id: int) -> bool:
         """Delete a complaint"""
-        return self.complaint_dao.delete(complaint_id)
+        if not self.complaint_dao.delete(complaint_id):
+            return False
+        self.statistics_cache.invalidate()
+        self.category_service.invalidate()
+        self.similarity_service.forget(complaint_id)
+        return True
+
+    def find_similar_resolved(
+        self, complaint: dict, limit: int = 5
+    ) -> Optional[List[dict]]:
+        """Resolved complaints worded like this one, or None while indexing"""
+        return self.similarity_service.find_similar_resolved(complaint, limit)
 
     def get_statistics(self) -> dict:
-        """Get complaint statistics"""
+        """Get complaint statistics from the cached statistics rollup"""
         try:
-            all_complaints = self.find_all_complaints()
+            rollup = self.statistics_cache.get()
+            by_status = rollup.get("status", {})
 
             stats = {
-                "total_complaints": len(all_complaints),
-                "pending_complaints": len(
-                    [c for c in all_complaints if c["status"] == "Pending"]
-                ),
-                "in_progress_complaints": len(
-                    [c for c in all_complaints if c["status"] == "In Progress"]
-                ),
-                "resolved_complaints": len(
-                    [c for c in all_complaints if c["status"] == "Resolved"]
-                ),
-                "closed_complaints": len(
-                    [c for c in all_complaints if c["status"] == "Closed"]
-                ),
+                "total_complaints": sum(by_status.values()),
+                "pending_complaints": by_status.get("Pending", 0),
+                "in_progress_complaints": by_status.get("In Progress", 0),
+                "resolved_complaints": by_status.get("Resolved", 0),
+                "closed_complaints": by_status.get("Closed", 0),
             }
 
             # Add category statistics
-            categories = {}
-            for complaint in all_complaints:
-                category = complaint["category"]
-                categories[category] = categories.get(category, 0) + 1
-
-            stats["category_breakdown"] = categories
+            stats["category_breakdown"] = dict(rollup.get("category", {}))
             return stats
         except Exception as e:
             print(f"Error getting statistics: {e}")
             return {}
 
+    def get_trends(
+        self,
+        days: int = 90,
+        bucket: str = "day",
+        categories: Optional[List[str]] = None,
+        today: Optional[date] = None,
+    ) -> Dict[str, Any]:
+        """Complaints filed and resolved per day or week, overall and per category
+
+        Reads the daily rollup, so a year of history costs one row per day
+        and category rather than a scan of the complaints table. Weeks
+        start on Monday. Every period in range is listed, with zeros for
+        quiet ones, so the series can be charted directly.
+        """
+        if bucket not in TREND_BUCKETS:
+            raise ValueError(f"Invalid trend bucket: {bucket}")
+        today = today or date.today()
+        since = today - timedelta(days=days - 1)
+        if bucket == "week":
+            since -= timedelta(days=since.weekday())
+
+        step = 7 if bucket == "week" else 1
+        periods = [
+            since + timedelta(days=offset)
+            for offset in range(0, (today - since).days + 1, step)
+        ]
+        positions = {period: index for index, period in enumerate(periods)}
+
+        def empty_series() -> Dict[str, List[int]]:
+            return {"created": [0] * len(periods), "resolved": [0] * len(periods)}
+
+        totals = empty_series()
+        by_category: Dict[str, Dict[str, List[int]]] = {}
+        for day, category, created, resolved in self.complaint_dao.get_daily_stats(
+            since, categories
+        ):
+            index = positions.get(day - timedelta(days=(day - since).days % step))
+            if index is None:
+                continue
+            series = by_category.setdefault(category, empty_series())
+            for name, count in (("created", created), ("resolved", resolved)):
+                series[name][index] += count
+                totals[name][index] += count
+
+        return {
+            "bucket": bucket,
+            "periods": [period.isoformat() for period in periods],
+            "created": totals["created"],
+            "resolved": totals["resolved"],
+            "by_category": by_category,
+        }
+
+    def get_dashboard(
+        self,
+        days: int = 30,
+        category: Optional[List[str]] = None,
+        status: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """Dashboard breakdowns from the in-memory analytics snapshot"""
+        return self.analytics_service.get_dashboard(days, category, status)
+
+    def get_resolution_times(self) -> Dict[str, Any]:
+        """Resolution and first response percentiles from streaming sketches"""
+        return self.analytics_service.get_resolution_times()
+
+    def rebuild_daily_statistics(self) -> bool:
+        """Rebuild the daily rollup behind get_trends from the complaints table"""
+        return self.complaint_dao.rebuild_daily_stats()
+
+    def reconcile_statistics(self) -> bool:
+        """Repair drift between the statistics rollup and the complaints table"""
+        if not self.complaint_dao.reconcile_statistics():
+            return False
+        self.statistics_cache.invalidate()
+        return True
+
     def find_assigned_complaints(self, staff_id: int) -> List[dict]:
         """Find complaints assigned to a specific staff member"""
-        try:
-            all_complaints = self.find_all_complaints()
-            assigned_complaints = [
-                c for c in all_complaints if c.get("assigned_to") == staff_id
-            ]
-            return assigned_complaints
-        except Exception as e:
-            print(f"Error finding assigned complaints: {e}")
+        return self.complaint_dao.find_page({"assigned_to": staff_id}, page_size=None)
+
+    def find_with_comments(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        page: int = 1,
+        page_size: Optional[int] = 20,
+        max_comments: Optional[int] = None,
+        order_by: str = "newest",
+    ) -> List[dict]:
+        """Find a page of complaints with their comments and comment counts attached
+
+        Comments for the whole page come from one IN query. max_comments
+        keeps only the newest N comments of each complaint, and then one
+        GROUP BY query supplies the full comment counts.
+        """
+        complaints = self.complaint_dao.find_page(filters, page, page_size, order_by)
+        self.attach_comments(complaints, max_comments)
+        if max_comments is None:
+            for complaint in complaints:
+                complaint["comment_count"] = len(complaint["comments"])
+        elif complaints:
+            counts = self.comment_dao.count_by_complaint_ids(
+                [complaint["id"] for complaint in complaints]
+            )
+            for complaint in complaints:
+                complaint["comment_count"] = counts.get(complaint["id"], 0)
+        return complaints
+
+    def attach_comments(
+        self, complaints: List[dict], max_comments: Optional[int] = None
+    ) -> List[dict]:
+        """Fetch the comments of many complaints at once and group them in one pass"""
+        by_id = {}
+        for complaint in complaints:
+            complaint["comments"] = []
+            by_id[complaint["id"]] = complaint
+        if not by_id:
+            return complaints
+
+        for comment in self.comment_dao.find_by_complaint_ids(
+            list(by_id), max_comments
+        ):
+            by_id[comment["complaint_id"]]["comments"].append(comment)
+        return complaints
+
+    def iter_history_batches(
+        self,
+        user_id: Optional[int] = None,
+        is_admin: bool = False,
+        batch_size: int = 500,
+        max_comments: Optional[int] = None,
+    ) -> Iterator[List[dict]]:
+        """Stream complaints with their comments for a full-history export
+
+        Complaints are streamed in id order and each batch costs one comment
+        query, so memory stays bounded by batch_size.
+        """
+        for batch in self.iter_export_batches(user_id, is_admin, batch_size):
+            complaints = [dict(zip(EXPORT_COLUMNS, row)) for row in batch]
+            yield self.attach_comments(complaints, max_comments)
+
+    def search(
+        self,
+        text: str,
+        filters: Optional[Dict[str, Any]] = None,
+        page: int = 1,
+        page_size: int = 20,
+    ) -> List[dict]:
+        """Keyword search over descriptions and comments, most relevant first"""
+        text = text.strip()
+        if not text:
             return []
+        if search_service.SEARCH_BACKEND == "bm25":
+            return search_service.get_search_index_service().search(
+                text, filters, page, page_size
+            )
+        return self.complaint_dao.search(text, filters, page, page_size)
+
+    def suggest_categories(self, prefix: str, limit: int = 5) -> List[dict]:
+        """Suggest existing categories for a typed prefix, most used first"""
+        return self.category_service.suggest_categories(prefix, limit)
+
+    def suggest_routing(self, description: str) -> Dict[str, Any]:
+        """Predicted category and assignee for a complaint description"""
+        return self.routing_service.suggest(description)
+
+    def canonical_category(self, category: str) -> Optional[str]:
+        """The canonical spelling of an existing category, or None if new"""
+        return self.category_service.canonical_category(category)
 
     def search_by_category(
         self, category: str, user_id: int = None, is_admin: bool = False
     ) -> List[dict]:
-        """Search complaints by category with user filtering"""
+        """Search complaints by category substring or near-miss spelling
+
+        The term is resolved to existing categories in memory first, so the
+        database only sees an indexed IN lookup.
+        """
+        categories = self.category_service.match_categories(category)
+        if not categories:
+            return []
         if is_admin or user_id is None:
-            return self.find_complaints_by_category(category)
-        else:
-            return self.find_complaints_by_user_and_category(user_id, category)
+            return self.complaint_dao.find_by_categories(categories)
+        return self.complaint_dao.find_by_categories(categories, user_id)
 
     def export_to_list(self, user_id: int = None, is_admin: bool = False) -> List[dict]:
         """Export complaints to list format"""
@@ -135,3 +382,76 @@ class ComplaintService:
             return self.find_all_complaints()
         else:
             return self.find_complaints_by_user_id(user_id)
+
+    def iter_export_batches(
+        self,
+        user_id: Optional[int] = None,
+        is_admin: bool = False,
+        batch_size: int = 1000,
+        id_range: Optional[Tuple[int, int]] = None,
+    ) -> Iterator[List[tuple]]:
+        """Stream complaint rows for CSV export in constant memory"""
+        if is_admin or user_id is None:
+            return self.complaint_dao.iter_export_batches(
+                batch_size=batch_size, id_range=id_range
+            )
+        return self.complaint_dao.iter_export_batches(user_id, batch_size, id_range)
+
+    def iter_all_complaint_batches(
+        self, batch_size: int = 1000
+    ) -> Iterator[List[tuple]]:
+        """Stream all complaints as ComplaintDTO-ordered tuples"""
+        return self.complaint_dao.iter_all_batches(batch_size)
+
+    def get_export_id_range(
+        self, user_id: Optional[int] = None, is_admin: bool = False
+    ) -> Optional[Tuple[int, int]]:
+        """Get the (min, max) complaint id covered by an export"""
+        if is_admin or user_id is None:
+            return self.complaint_dao.get_id_range()
+        return self.complaint_dao.get_id_range(user_id)
+
+    def get_export_watermark(self, export_name: str) -> dict:
+        """Get the watermark of a named incremental export (empty on first run)"""
+        watermark = self.complaint_dao.get_export_watermark(export_name)
+        if watermark is None:
+            watermark = {
+                "last_updated_at": None,
+                "last_complaint_id": 0,
+                "last_tombstone_id": 0,
+            }
+        return watermark
+
+    def save_export_watermark(self, export_name: str, watermark: dict) -> bool:
+        """Persist the watermark reached by an incremental export"""
+        return self.complaint_dao.save_export_watermark(export_name, watermark)
+
+    def iter_incremental_export(
+        self, watermark: dict, batch_size: int = 1000, lag_seconds: int = 5
+    ) -> Iterator[List[tuple]]:
+        """Stream changes since the watermark as ("upsert"|"delete", ...) rows
+
+        Upserts come first in (updated_at, id) order, followed by tombstones of
+        deleted complaints. The watermark dict is advanced after each batch is
+        consumed, so it can be saved once the output has been written.
+        """
+        until = self.complaint_dao.get_export_horizon(lag_seconds)
+
+        for batch in self.complaint_dao.iter_changed_batches(
+            watermark["last_updated_at"],
+            watermark["last_complaint_id"],
+            until,
+            batch_size,
+        ):
+            yield [("upsert",) + tuple(row) for row in batch]
+            watermark["last_complaint_id"] = batch[-1][0]
+            watermark["last_updated_at"] = batch[-1][6]
+
+        for batch in self.complaint_dao.iter_tombstone_batches(
+            watermark["last_tombstone_id"], until, batch_size
+        ):
+            yield [
+                ("delete", row[1], None, None, None, None, None, row[2])
+                for row in batch
+            ]
+            watermark["last_tombstone_id"] = batch[-1][0]
@@ -0,0 +1,44 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+from config.database import db_config
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_pid: Optional[int] = None
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Get this process's query executor, sized to the database pool"""
+    global _executor, _executor_pid
+    with _lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(
+                max_workers=db_config.pool_size,
+                thread_name_prefix="query",
+                initializer=_mark_worker,
+            )
+            _executor_pid = os.getpid()
+        return _executor
+
+
+def _mark_worker():
+    _local.is_worker = True
+
+
+def run_concurrently(*calls: Callable[[], Any]) -> List[Any]:
+    """Run independent blocking calls in parallel and return their results in order
+
+    Each call borrows its own pooled connection, so total latency is that of
+    the slowest call. The first exception raised by any call is re-raised.
+    Calls made from inside an executor thread, or a single call, run inline
+    so nested use can never wait on its own busy workers.
+    """
+    if len(calls) < 2 or getattr(_local, "is_worker", False):
+        return [call() for call in calls]
+
+    futures = [get_executor().submit(call) for call in calls]
+    return [future.result() for future in futures]
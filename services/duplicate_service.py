@@ -0,0 +1,142 @@
+import os
+from array import array
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dao.dao_factory import dao_factory
+from search.minhash import MinHasher, band_keys, from_bytes, similarity, to_bytes
+
+# Estimated Jaccard similarity of description word pairs above which a new
+# complaint is linked to an earlier one as its likely duplicate
+DUPLICATE_THRESHOLD = float(os.getenv("DUPLICATE_THRESHOLD", "0.7"))
+
+# Buckets larger than this (boilerplate text) are only partly compared
+MAX_BUCKET_SIZE = 200
+
+minhasher = MinHasher()
+
+
+class DuplicateDetectionService:
+    """Near-duplicate complaint detection with MinHash and LSH banding
+
+    Each complaint's description gets a MinHash signature whose 16 band
+    keys are stored in complaint_lsh_bands. Complaints sharing a band key
+    are candidates, and their signatures decide which are near-duplicates,
+    so no check ever compares against the whole table.
+    """
+
+    def __init__(self, threshold: float = DUPLICATE_THRESHOLD):
+        self.complaint_dao = dao_factory.get_complaint_dao()
+        self.threshold = threshold
+
+    def fingerprint(self, description: str) -> Tuple[array, List[int]]:
+        """MinHash signature and LSH band keys of a description"""
+        signature = minhasher.signature(description)
+        return signature, band_keys(signature)
+
+    def find_duplicate(
+        self, signature: array, keys: List[int]
+    ) -> Optional[Tuple[int, float]]:
+        """Most similar earlier complaint above the threshold, with its score"""
+        best = None
+        for complaint_id, stored in self.complaint_dao.find_signatures_by_band_keys(
+            keys
+        ):
+            score = similarity(signature, from_bytes(stored))
+            if score >= self.threshold and (best is None or score > best[1]):
+                best = (complaint_id, score)
+        return best
+
+    def prepare(self, description: str) -> Dict[str, object]:
+        """Fingerprint a new complaint and find what it likely duplicates
+
+        Returns the duplicate_of, signature and band_keys entries that
+        ComplaintDAO.create stores with the complaint.
+        """
+        signature, keys = self.fingerprint(description)
+        match = self.find_duplicate(signature, keys)
+        return {
+            "duplicate_of": match[0] if match else None,
+            "signature": to_bytes(signature),
+            "band_keys": keys,
+        }
+
+    def index_backlog(self, batch_size: int = 1000) -> int:
+        """Fingerprint every complaint stored without a signature"""
+        indexed = 0
+        for batch in self.complaint_dao.iter_unsigned_batches(batch_size):
+            rows = []
+            for complaint_id, description in batch:
+                signature, keys = self.fingerprint(description or "")
+                rows.append((complaint_id, to_bytes(signature), keys))
+            indexed += self.complaint_dao.save_signatures(rows)
+        return indexed
+
+    def cluster(self, batch_size: int = 10000) -> List[List[int]]:
+        """Group fingerprinted complaints into near-duplicate clusters
+
+        Only LSH buckets with two or more members are read, and pairs inside
+        a bucket are confirmed by signature similarity before being merged
+        with union-find. Each cluster is sorted, oldest complaint first.
+        """
+        parent: Dict[int, int] = {}
+        signatures: Dict[int, array] = {}
+
+        def find(x: int) -> int:
+            parent.setdefault(x, x)
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        def merge_bucket(members: List[int]):
+            members = members[:MAX_BUCKET_SIZE]
+            missing = [m for m in members if m not in signatures]
+            if missing:
+                if len(signatures) > 100000:
+                    signatures.clear()
+                    missing = members
+                for complaint_id, stored in self.complaint_dao.find_signatures(
+                    missing
+                ).items():
+                    signatures[complaint_id] = from_bytes(stored)
+            members = [m for m in members if m in signatures]
+            for i, first in enumerate(members):
+                for second in members[i + 1 :]:
+                    a, b = find(first), find(second)
+                    if a != b and (
+                        similarity(signatures[first], signatures[second])
+                        >= self.threshold
+                    ):
+                        parent[max(a, b)] = min(a, b)
+
+        current_key: Optional[int] = None
+        members: List[int] = []
+        for batch in self.complaint_dao.iter_shared_band_batches(batch_size):
+            for band_key, complaint_id in batch:
+                if band_key != current_key:
+                    if len(members) > 1:
+                        merge_bucket(members)
+                    current_key, members = band_key, []
+                members.append(complaint_id)
+        if len(members) > 1:
+            merge_bucket(members)
+
+        clusters: Dict[int, List[int]] = {}
+        for complaint_id in parent:
+            clusters.setdefault(find(complaint_id), []).append(complaint_id)
+        return sorted(
+            (sorted(members) for members in clusters.values() if len(members) > 1),
+            key=lambda members: members[0],
+        )
+
+    def link_clusters(self, clusters: Iterable[List[int]]) -> int:
+        """Link every later complaint of each cluster to its oldest one"""
+        links = [
+            (complaint_id, members[0])
+            for members in clusters
+            for complaint_id in members[1:]
+        ]
+        linked = 0
+        for start in range(0, len(links), 1000):
+            linked += self.complaint_dao.link_duplicates(links[start : start + 1000])
+        return linked
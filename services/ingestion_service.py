@@ -0,0 +1,158 @@
+import csv
+import json
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from dao.dao_factory import dao_factory
+from services.complaint_service import statistics_cache
+
+VALID_STATUSES = ("Pending", "In Progress", "Resolved")
+
+REJECT_FIELDS = ["line", "error", "record"]
+
+
+class ComplaintIngestionService:
+    """Bulk-load complaints from partner CSV or JSONL files
+
+    Rows are stream-parsed and validated, user emails are resolved with one
+    batched lookup per chunk, and each chunk is inserted with a single
+    executemany in its own transaction. Invalid rows go to a reject file.
+    """
+
+    def __init__(self) -> None:
+        self.complaint_dao = dao_factory.get_complaint_dao()
+        self.user_dao = dao_factory.get_user_dao()
+        self._user_ids: Dict[str, int] = {}
+
+    def iter_records(
+        self, path: str, file_format: Optional[str] = None
+    ) -> Iterator[Tuple[int, Any]]:
+        """Yield (line number, record) pairs from a CSV or JSONL file"""
+        file_format = file_format or ("jsonl" if path.endswith(".jsonl") else "csv")
+        with open(path, newline="", encoding="utf-8") as f:
+            if file_format == "csv":
+                reader = csv.DictReader(f)
+                for record in reader:
+                    yield reader.line_num, record
+            elif file_format == "jsonl":
+                for line_number, line in enumerate(f, start=1):
+                    if not line.strip():
+                        continue
+                    try:
+                        yield line_number, json.loads(line)
+                    except json.JSONDecodeError as e:
+                        yield line_number, ValueError(f"Invalid JSON: {e}")
+            else:
+                raise ValueError(f"Unsupported file format: {file_format}")
+
+    def validate_record(self, record: Any) -> Dict[str, Any]:
+        """Normalize one record or raise ValueError explaining why it is rejected"""
+        if isinstance(record, Exception):
+            raise record
+        if not isinstance(record, dict):
+            raise ValueError("Record is not an object")
+
+        email = str(record.get("user_email") or "").strip().lower()
+        category = str(record.get("category") or "").strip()
+        description = str(record.get("description") or "").strip()
+        status = str(record.get("status") or "Pending").strip()
+
+        if not email:
+            raise ValueError("user_email is required")
+        if not category:
+            raise ValueError("category is required")
+        if len(category) > 255:
+            raise ValueError("category is longer than 255 characters")
+        if not description:
+            raise ValueError("description is required")
+        if status not in VALID_STATUSES:
+            raise ValueError(f"Invalid status: {status}")
+
+        return {
+            "user_email": email,
+            "category": category,
+            "description": description,
+            "status": status,
+        }
+
+    def resolve_user_ids(self, emails: List[str]) -> Dict[str, int]:
+        """Resolve emails to user ids, looking up only emails not seen before"""
+        missing = [email for email in set(emails) if email not in self._user_ids]
+        if missing:
+            self._user_ids.update(self.user_dao.find_ids_by_emails(missing))
+        return self._user_ids
+
+    def ingest(
+        self,
+        path: str,
+        file_format: Optional[str] = None,
+        reject_path: Optional[str] = None,
+        chunk_size: int = 2000,
+    ) -> Dict[str, Any]:
+        """Ingest a file and return a report with row counts and rows/sec"""
+        started = time.perf_counter()
+        report: Dict[str, Any] = {"read": 0, "inserted": 0, "rejected": 0}
+        reject_path = reject_path or f"{path}.rejects.csv"
+
+        with open(reject_path, "w", newline="", encoding="utf-8") as reject_file:
+            rejects = csv.writer(reject_file)
+            rejects.writerow(REJECT_FIELDS)
+
+            def reject(line_number: int, error: str, record: Any):
+                report["rejected"] += 1
+                rejects.writerow([line_number, error, json.dumps(record, default=str)])
+
+            chunk: List[Tuple[int, Dict[str, Any]]] = []
+            for line_number, record in self.iter_records(path, file_format):
+                report["read"] += 1
+                try:
+                    chunk.append((line_number, self.validate_record(record)))
+                except ValueError as e:
+                    reject(line_number, str(e), record)
+                    continue
+
+                if len(chunk) >= chunk_size:
+                    report["inserted"] += self._insert_chunk(chunk, reject)
+                    chunk = []
+
+            if chunk:
+                report["inserted"] += self._insert_chunk(chunk, reject)
+
+        if report["inserted"]:
+            statistics_cache.invalidate()
+
+        report["seconds"] = time.perf_counter() - started
+        report["rows_per_sec"] = (
+            report["read"] / report["seconds"] if report["seconds"] > 0 else 0.0
+        )
+        report["reject_file"] = reject_path
+        return report
+
+    def _insert_chunk(self, chunk: List[Tuple[int, Dict[str, Any]]], reject) -> int:
+        """Resolve user ids for a chunk of valid rows and insert it in bulk"""
+        user_ids = self.resolve_user_ids([row["user_email"] for _, row in chunk])
+
+        to_insert = []
+        for line_number, row in chunk:
+            user_id = user_ids.get(row["user_email"])
+            if user_id is None:
+                reject(line_number, "Unknown user_email", row)
+                continue
+            to_insert.append((line_number, dict(row, user_id=user_id)))
+
+        if not to_insert:
+            return 0
+
+        inserted = self.complaint_dao.create_many([row for _, row in to_insert])
+        if inserted:
+            return inserted
+
+        # The bulk insert failed as a whole: retry row by row so a single
+        # bad row does not cost the rest of the chunk
+        inserted = 0
+        for line_number, row in to_insert:
+            if self.complaint_dao.create(row):
+                inserted += 1
+            else:
+                reject(line_number, "Insert failed", row)
+        return inserted
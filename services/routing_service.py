@@ -0,0 +1,169 @@
+import os
+from typing import Any, Dict, Iterator, List, Optional
+
+from dao.dao_factory import dao_factory
+from search.naive_bayes import NaiveBayesClassifier, NaiveBayesTrainer, features
+from services.cache import TTLCache
+from services.category_service import CategoryService
+
+ROUTING_MODEL_PATH = os.getenv("ROUTING_MODEL_PATH", "routing_model")
+
+# Predicted probability a new complaint's assignee needs before the
+# complaint is assigned automatically
+ROUTING_ASSIGN_CONFIDENCE = float(os.getenv("ROUTING_ASSIGN_CONFIDENCE", "0.8"))
+
+# The two models trained from past complaints
+HEADS = ("category", "assignee")
+
+
+def load_routing_models() -> Dict[str, Optional[NaiveBayesClassifier]]:
+    """Load the saved routing models, None for any not trained yet"""
+    models = {}
+    for head in HEADS:
+        path = os.path.join(ROUTING_MODEL_PATH, f"{head}.nb")
+        models[head] = NaiveBayesClassifier.load(path) if os.path.exists(path) else None
+    return models
+
+
+# Models are read once per process and re-read every few minutes, so a
+# retrained model is picked up without a restart
+routing_models_cache = TTLCache(
+    loader=load_routing_models, ttl=float(os.getenv("ROUTING_MODEL_TTL", "300"))
+)
+
+
+class RoutingService:
+    """Suggest a category and an assignee for complaints from their description
+
+    Two naive Bayes classifiers are trained offline from past complaints:
+    one on their categories and one on the staff they were assigned to.
+    """
+
+    def __init__(self, assign_confidence: float = ROUTING_ASSIGN_CONFIDENCE):
+        self.complaint_dao = dao_factory.get_complaint_dao()
+        self.user_dao = dao_factory.get_user_dao()
+        self.category_service = CategoryService()
+        self.models_cache = routing_models_cache
+        self.assign_confidence = assign_confidence
+
+    def suggest(self, description: str) -> Dict[str, Any]:
+        """Predicted category and assignee with their probabilities"""
+        models = self.models_cache.get()
+        counts = features(description)
+        suggestion: Dict[str, Any] = {}
+        if models["category"] is not None:
+            prediction = models["category"].predict_features(counts)
+            if prediction:
+                suggestion["category"], suggestion["category_confidence"] = prediction[
+                    0
+                ]
+        if models["assignee"] is not None:
+            prediction = models["assignee"].predict_features(counts)
+            if prediction:
+                suggestion["assigned_to"] = int(prediction[0][0])
+                suggestion["assignee_confidence"] = prediction[0][1]
+        return suggestion
+
+    def prepare(self, description: str) -> Dict[str, Any]:
+        """The assigned_to entry for a new complaint, when the router is confident"""
+        suggestion = self.suggest(description)
+        staff_id = suggestion.get("assigned_to")
+        if (
+            staff_id is None
+            or suggestion["assignee_confidence"] < self.assign_confidence
+        ):
+            return {}
+        staff = self.user_dao.find_by_id(staff_id)
+        if not staff or staff["role"] != "staff":
+            return {}
+        return {"assigned_to": staff_id}
+
+    def train(
+        self, holdout: int = 0, batch_size: int = 5000
+    ) -> Dict[str, NaiveBayesClassifier]:
+        """Train both heads in one streaming pass over past complaints
+
+        With holdout N, complaints whose id is a multiple of N are left out
+        so evaluate() can score the models on complaints they never saw.
+        """
+        trainers = {head: NaiveBayesTrainer() for head in HEADS}
+        for batch in self.complaint_dao.iter_routing_examples(batch_size):
+            for complaint_id, category, description, assignee in batch:
+                if holdout and complaint_id % holdout == 0:
+                    continue
+                counts = features(description or "")
+                trainers["category"].add(counts, self.label_category(category))
+                if assignee is not None:
+                    trainers["assignee"].add(counts, str(assignee))
+        return {head: trainer.build() for head, trainer in trainers.items()}
+
+    def label_category(self, category: str) -> str:
+        """Train on canonical spellings so case variants count as one label"""
+        return self.category_service.canonical_category(category) or category
+
+    def save(self, models: Dict[str, NaiveBayesClassifier]):
+        """Write trained models where the application loads them from"""
+        os.makedirs(ROUTING_MODEL_PATH, exist_ok=True)
+        for head, model in models.items():
+            model.save(os.path.join(ROUTING_MODEL_PATH, f"{head}.nb"))
+        self.models_cache.invalidate()
+
+    def evaluate(
+        self,
+        models: Dict[str, NaiveBayesClassifier],
+        holdout: int,
+        batch_size: int = 5000,
+    ) -> Dict[str, Dict[str, float]]:
+        """Top-1 and top-3 accuracy of each head on the held-out complaints"""
+        report: Dict[str, Dict[str, float]] = {
+            head: {"examples": 0, "top1": 0, "top3": 0} for head in HEADS
+        }
+        for batch in self.complaint_dao.iter_routing_examples(batch_size):
+            for complaint_id, category, description, assignee in batch:
+                if complaint_id % holdout:
+                    continue
+                counts = features(description or "")
+                truths = {
+                    "category": self.label_category(category),
+                    "assignee": None if assignee is None else str(assignee),
+                }
+                for head, truth in truths.items():
+                    if truth is None:
+                        continue
+                    labels = [
+                        label for label, _ in models[head].predict_features(counts, 3)
+                    ]
+                    scores = report[head]
+                    scores["examples"] += 1
+                    scores["top1"] += labels[:1] == [truth]
+                    scores["top3"] += truth in labels
+        for scores in report.values():
+            examples = scores["examples"] or 1
+            scores["top1"] /= examples
+            scores["top3"] /= examples
+        return report
+
+    def route_backlog(self, batch_size: int = 1000) -> Iterator[List[dict]]:
+        """Suggestions for each batch of pending unassigned complaints"""
+        for batch in self.complaint_dao.iter_unrouted_batches(batch_size):
+            routed = []
+            for complaint_id, category, description in batch:
+                suggestion = self.suggest(description or "")
+                suggestion.update(id=complaint_id, current_category=category)
+                routed.append(suggestion)
+            yield routed
+
+    def assign(self, routed: List[dict]) -> int:
+        """Assign the complaints whose suggested assignee is confident enough
+
+        Suggestions naming someone who is no longer staff are skipped.
+        """
+        staff_ids = {staff["id"] for staff in self.user_dao.find_by_role("staff")}
+        return self.complaint_dao.assign_many(
+            [
+                (suggestion["id"], suggestion["assigned_to"])
+                for suggestion in routed
+                if suggestion.get("assigned_to") in staff_ids
+                and suggestion["assignee_confidence"] >= self.assign_confidence
+            ]
+        )
@@ -0,0 +1,176 @@
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from dao.dao_factory import dao_factory
+from search.bm25_index import BM25Index
+
+# "mysql" searches with the database's FULLTEXT indexes; "bm25" ranks with the
+# embedded index kept up to date by refresh_search_index.py
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "mysql")
+SEARCH_INDEX_PATH = os.getenv("SEARCH_INDEX_PATH", "search_index")
+SEARCH_MAX_CANDIDATES = int(os.getenv("SEARCH_MAX_CANDIDATES", "1000"))
+
+# Watermark keys holding datetimes, stored in the index as ISO strings
+WATERMARK_DATETIMES = ("last_updated_at", "last_comment_at")
+
+
+class SearchIndexService:
+    """Keep the embedded BM25 index in step with the database and query it
+
+    A complaint is indexed as its description followed by its comments.
+    refresh() applies only what changed since the watermark stored in the
+    index: complaints updated or deleted (the incremental export feed) and
+    complaints that received comments (by last_comment_at).
+    """
+
+    def __init__(self, index_path: Optional[str] = None):
+        self.complaint_dao = dao_factory.get_complaint_dao()
+        self.comment_dao = dao_factory.get_comment_dao()
+        self.index = BM25Index(index_path or SEARCH_INDEX_PATH)
+
+    def _documents(self, rows: List[Tuple[int, str]]) -> List[Tuple[int, str]]:
+        """Append each complaint's comments to its description"""
+        texts = {
+            complaint_id: [description or ""] for complaint_id, description in rows
+        }
+        for comment in self.comment_dao.find_by_complaint_ids(
+            list(texts), raise_errors=True
+        ):
+            texts[comment["complaint_id"]].append(comment["comment"] or "")
+        return [
+            (complaint_id, "\n".join(parts)) for complaint_id, parts in texts.items()
+        ]
+
+    def _load_watermark(self) -> Optional[Dict[str, Any]]:
+        state = self.index.state
+        if not state:
+            return None
+        watermark = dict(state)
+        for key in WATERMARK_DATETIMES:
+            if watermark.get(key):
+                watermark[key] = datetime.fromisoformat(watermark[key])
+        return watermark
+
+    def _dump_watermark(self, watermark: Dict[str, Any]) -> Dict[str, Any]:
+        state = dict(watermark)
+        for key in WATERMARK_DATETIMES:
+            if isinstance(state.get(key), datetime):
+                state[key] = state[key].isoformat(" ")
+        return state
+
+    def rebuild(self, batch_size: int = 20000, lag_seconds: int = 5) -> int:
+        """Index every complaint from scratch and return how many were indexed
+
+        The new index is built beside the live one, which keeps serving
+        searches until the finished index replaces it in one commit. The
+        watermark is taken before the scan, so anything changed while the
+        rebuild runs is picked up again by the next refresh.
+        """
+        until = self.complaint_dao.get_export_horizon(lag_seconds)
+        fresh = self.index.staging()
+
+        indexed = 0
+        for batch in self.complaint_dao.iter_export_batches(batch_size=batch_size):
+            fresh.update(self._documents([(row[0], row[3]) for row in batch]))
+            indexed += len(batch)
+
+        fresh.compact()
+        fresh.update(
+            state=self._dump_watermark(
+                {
+                    "last_updated_at": until,
+                    "last_complaint_id": 0,
+                    "last_tombstone_id": 0,
+                    "last_comment_at": until,
+                }
+            )
+        )
+        self.index.replace(fresh)
+        return indexed
+
+    def refresh(self, batch_size: int = 1000, lag_seconds: int = 5) -> Dict[str, int]:
+        """Apply changes since the stored watermark in one index commit
+
+        Database errors propagate before the commit, so the watermark only
+        moves past changes that were read in full.
+        """
+        watermark = self._load_watermark()
+        if watermark is None:
+            return {"indexed": self.rebuild(lag_seconds=lag_seconds), "deleted": 0}
+
+        until = self.complaint_dao.get_export_horizon(lag_seconds)
+        descriptions: Dict[int, str] = {}
+        for batch in self.complaint_dao.iter_changed_batches(
+            watermark["last_updated_at"],
+            watermark["last_complaint_id"],
+            until,
+            batch_size,
+        ):
+            for row in batch:
+                descriptions[row[0]] = row[3]
+            watermark["last_complaint_id"] = batch[-1][0]
+            watermark["last_updated_at"] = batch[-1][6]
+
+        deleted: Set[int] = set()
+        for batch in self.complaint_dao.iter_tombstone_batches(
+            watermark["last_tombstone_id"], until, batch_size
+        ):
+            deleted.update(row[1] for row in batch)
+            watermark["last_tombstone_id"] = batch[-1][0]
+
+        # Comments do not bump updated_at, so pick those complaints up separately
+        commented = [
+            complaint_id
+            for complaint_id in self.complaint_dao.find_ids_commented_since(
+                watermark.get("last_comment_at"), until
+            )
+            if complaint_id not in descriptions
+        ]
+        for start in range(0, len(commented), batch_size):
+            chunk = commented[start : start + batch_size]
+            for complaint in self.complaint_dao.find_by_ids(chunk, raise_errors=True):
+                descriptions[complaint["id"]] = complaint["description"]
+        watermark["last_comment_at"] = until
+
+        deleted -= set(descriptions)
+        documents = []
+        rows = list(descriptions.items())
+        for start in range(0, len(rows), batch_size):
+            documents.extend(self._documents(rows[start : start + batch_size]))
+        self.index.update(documents, deleted, state=self._dump_watermark(watermark))
+        return {"indexed": len(documents), "deleted": len(deleted)}
+
+    def search(
+        self,
+        text: str,
+        filters: Optional[Dict[str, Any]] = None,
+        page: int = 1,
+        page_size: int = 20,
+    ) -> List[dict]:
+        """Rank complaints with BM25, then load and filter the top candidates
+
+        Only the best SEARCH_MAX_CANDIDATES hits are considered, so deep
+        pages of very broad queries with narrow filters can come back short.
+        """
+        hits = self.index.search(text, SEARCH_MAX_CANDIDATES)
+        scores = dict(hits)
+        complaints = self.complaint_dao.find_by_ids(
+            [complaint_id for complaint_id, _ in hits], filters
+        )
+        start = (max(page, 1) - 1) * page_size
+        complaints = complaints[start : start + page_size]
+        for complaint in complaints:
+            complaint["relevance"] = scores[complaint["id"]]
+        return complaints
+
+
+_search_index_service: Optional[SearchIndexService] = None
+
+
+def get_search_index_service() -> SearchIndexService:
+    """Get the process-wide SearchIndexService, opening the index on first use"""
+    global _search_index_service
+    if _search_index_service is None:
+        _search_index_service = SearchIndexService()
+    return _search_index_service
@@ -0,0 +1,73 @@
+import os
+from itertools import chain
+from typing import List, Optional
+
+from dao.dao_factory import dao_factory
+from search.tfidf import TfidfIndex
+from services.cache import TTLCache
+
+
+def build_resolved_index() -> TfidfIndex:
+    """Build the TF-IDF index over every resolved complaint's description"""
+    rows = chain.from_iterable(dao_factory.get_complaint_dao().iter_resolved_batches())
+    return TfidfIndex.build((row[0], row[1] or "") for row in rows)
+
+
+# One index per process, rebuilt in the background every SIMILAR_REBUILD_SECONDS
+# so idf and complaints resolved by other processes catch up. Resolutions made
+# here are appended straight away, in place: copying the whole index on each
+# status change would cost more than the append-only arrays risk.
+resolved_index_cache = TTLCache(
+    loader=build_resolved_index,
+    ttl=float(os.getenv("SIMILAR_REBUILD_SECONDS", "3600")),
+    copy_value=None,
+)
+
+
+class SimilarityService:
+    """Suggest earlier resolved complaints similar to a given one"""
+
+    def __init__(self) -> None:
+        self.complaint_dao = dao_factory.get_complaint_dao()
+        self.comment_dao = dao_factory.get_comment_dao()
+        self.resolved_index_cache = resolved_index_cache
+
+    def find_similar_resolved(
+        self, complaint: dict, limit: int = 5
+    ) -> Optional[List[dict]]:
+        """Most similar resolved complaints with their latest comment attached
+
+        Returns None while the index is still being built for the first
+        time, so callers can skip the panel instead of waiting.
+        """
+        index = self.resolved_index_cache.peek()
+        if index is None:
+            return None
+        hits = index.most_similar(complaint["description"], limit, complaint["id"])
+        if not hits:
+            return []
+
+        scores = dict(hits)
+        similar = self.complaint_dao.find_by_ids(list(scores))
+        resolutions = {}
+        for comment in self.comment_dao.find_by_complaint_ids(list(scores), 1):
+            resolutions[comment["complaint_id"]] = comment
+        for other in similar:
+            other["similarity"] = scores[other["id"]]
+            other["resolution"] = resolutions.get(other["id"])
+        return similar
+
+    def record_status(self, complaint_id: int, status: str):
+        """Keep the cached index in step with a status change"""
+        if status != "Resolved":
+            self.forget(complaint_id)
+            return
+        complaint = self.complaint_dao.find_by_id(complaint_id)
+        if complaint:
+            self.resolved_index_cache.update(
+                lambda index: index.add(complaint_id, complaint["description"])
+            )
+
+    def forget(self, complaint_id: int):
+        """Drop a complaint that was deleted or reopened"""
+        self.resolved_index_cache.update(lambda index: index.remove(complaint_id))
@@ -0,0 +1,89 @@
+# Unit tests for AnalyticsService
+from datetime import datetime
+from unittest.mock import patch
+
+from analytics.columnar import ComplaintSnapshot
+from services.analytics_service import AnalyticsService, load_response_digests
+from services.cache import TTLCache
+
+
+class TestAnalyticsService:
+    """Test cases for AnalyticsService"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        rows = [
+            (1, 10, None, 1, "Pending", datetime(2025, 6, 1, 8), None),
+            (2, 11, 5, 1, "In Progress", datetime(2025, 7, 9, 8), None),
+            (3, 12, 5, 2, "Pending", datetime(2025, 7, 10, 8), None),
+            (4, 12, 6, 1, "Resolved", datetime(2025, 7, 10, 9), None),
+        ]
+        snapshot = ComplaintSnapshot.load([rows], {1: "Billing", 2: "Bug Report"})
+        self.analytics_service = AnalyticsService()
+        self.analytics_service.snapshot_cache = TTLCache(lambda: snapshot, ttl=60)
+        self.now = datetime(2025, 7, 10, 17)
+
+    def test_dashboard_breakdowns(self):
+        """Test totals, open workload per assignee and recent daily inflow"""
+        # Act
+        result = self.analytics_service.get_dashboard(days=7, now=self.now)
+
+        # Assert
+        assert result["total_complaints"] == 4
+        assert result["by_status"] == {"Pending": 2, "In Progress": 1, "Resolved": 1}
+        assert result["unassigned_open"] == 1
+        assert result["open_by_assignee"] == {5: 2}
+        assert result["daily_created"] == {"2025-07-09": 1, "2025-07-10": 2}
+        assert result["snapshot_rows"] == 4
+
+    def test_dashboard_filters_every_figure(self):
+        """Test category and status filters narrow all breakdowns"""
+        # Act
+        result = self.analytics_service.get_dashboard(
+            days=7, category=["Billing"], status=["Pending", "Resolved"], now=self.now
+        )
+
+        # Assert
+        assert result["total_complaints"] == 2
+        assert result["by_category"] == {"Billing": 2}
+        assert result["open_by_assignee"] == {}
+        assert result["daily_created"] == {"2025-07-10": 1}
+
+    @patch("services.analytics_service.dao_factory")
+    def test_resolution_times_per_category_and_staff(self, mock_dao_factory):
+        """Test percentiles per group, with overall merged from categories"""
+        # Arrange
+        hour = 3600
+        rows = [("Billing", 5, "Sam", n * hour, 60) for n in range(1, 101)]
+        rows += [("Bug Report", 6, "Ana", 200 * hour, None)]
+        rows += [("Bug Report", None, None, None, 120)]
+        mock_dao_factory.get_complaint_dao.return_value.iter_response_times.return_value = iter(
+            [rows]
+        )
+        digests = load_response_digests()
+        self.analytics_service.response_digests_cache = TTLCache(
+            lambda: digests, ttl=60
+        )
+
+        # Act
+        report = self.analytics_service.get_resolution_times()
+
+        # Assert
+        resolution = report["resolution"]
+        assert resolution["overall"]["count"] == 101
+        assert abs(resolution["by_category"]["Billing"]["p50"] - 50.5 * hour) < hour
+        assert resolution["by_category"]["Bug Report"] == {
+            "count": 1,
+            "p50": 200 * hour,
+            "p90": 200 * hour,
+            "p99": 200 * hour,
+        }
+        assert (
+            resolution["overall"]["p99"] > resolution["by_category"]["Billing"]["p99"]
+        )
+        assert resolution["by_staff"][5]["name"] == "Sam"
+        assert resolution["by_staff"][5]["count"] == 100
+        first_response = report["first_response"]
+        assert first_response["overall"]["count"] == 101
+        assert first_response["by_category"]["Bug Report"]["p50"] == 120
+        assert list(first_response["by_staff"]) == [5]
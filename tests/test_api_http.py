@@ -0,0 +1,117 @@
+# Unit tests for the API request parsing and routing
+import asyncio
+
+import pytest
+
+from api.protocol import HTTPError, Router, build_response, parse_head, read_request
+
+
+def read(raw: bytes):
+    """Run read_request over a stream holding the given bytes"""
+
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(raw)
+        reader.feed_eof()
+        return await read_request(reader)
+
+    return asyncio.run(run())
+
+
+class TestRequestParsing:
+    """Test cases for HTTP request parsing"""
+
+    def test_parse_head_reads_path_query_and_headers(self):
+        """Test the request line, query string and headers are parsed"""
+        # Arrange
+        head = "GET /complaints?status=Pending HTTP/1.1\r\nHost: x\r\n\r\n"
+
+        # Act
+        request = parse_head(head)
+
+        # Assert
+        assert request.method == "GET"
+        assert request.path == "/complaints"
+        assert request.query == {"status": "Pending"}
+        assert request.headers["host"] == "x"
+        assert request.keep_alive == True
+
+    def test_parse_head_rejects_malformed_request_line(self):
+        """Test a malformed request line is a 400"""
+        # Act / Assert
+        with pytest.raises(HTTPError) as error:
+            parse_head("GARBAGE\r\n\r\n")
+        assert error.value.status == 400
+
+    def test_read_request_reads_json_body(self):
+        """Test the body is read using Content-Length"""
+        # Arrange
+        body = b'{"status": "Resolved"}'
+        raw = (
+            b"PATCH /complaints/3/status HTTP/1.1\r\n"
+            b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+            b"Connection: close\r\n\r\n" + body
+        )
+
+        # Act
+        request = read(raw)
+
+        # Assert
+        assert request.json() == {"status": "Resolved"}
+        assert request.keep_alive == False
+
+    def test_read_request_returns_none_on_closed_connection(self):
+        """Test a client closing an idle keep-alive connection is not an error"""
+        # Act
+        request = read(b"")
+
+        # Assert
+        assert request is None
+
+    def test_build_response_sets_length(self):
+        """Test responses carry a Content-Length for keep-alive clients"""
+        # Act
+        response = build_response(200, b"{}")
+
+        # Assert
+        assert response.startswith(b"HTTP/1.1 200 OK\r\n")
+        assert b"Content-Length: 2\r\n" in response
+        assert response.endswith(b"\r\n\r\n{}")
+
+
+class TestRouter:
+    """Test cases for route resolution"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.router = Router()
+        self.router.add("GET", "/complaints/statistics", lambda request: "stats")
+        self.router.add("GET", "/complaints/{complaint_id}", lambda request: "one")
+
+    def test_resolve_extracts_integer_params(self):
+        """Test path parameters are passed to the handler as ints"""
+        # Act
+        handler, params = self.router.resolve("GET", "/complaints/42")
+
+        # Assert
+        assert handler(None) == "one"
+        assert params == {"complaint_id": 42}
+
+    def test_resolve_prefers_literal_route(self):
+        """Test a literal segment is not captured as a parameter"""
+        # Act
+        handler, params = self.router.resolve("GET", "/complaints/statistics")
+
+        # Assert
+        assert handler(None) == "stats"
+        assert params == {}
+
+    def test_resolve_unknown_method_and_path(self):
+        """Test 405 for a known path with another method and 404 otherwise"""
+        # Act / Assert
+        with pytest.raises(HTTPError) as error:
+            self.router.resolve("DELETE", "/complaints/statistics")
+        assert error.value.status == 405
+        with pytest.raises(HTTPError) as error:
+            self.router.resolve("GET", "/nowhere")
+        assert error.value.status == 404
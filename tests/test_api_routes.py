@@ -0,0 +1,273 @@
+# Unit tests for API authentication, role checks and streaming limits
+import threading
+from unittest.mock import Mock
+
+import pytest
+
+from api.auth import issue_token, verify_token
+from api.protocol import HTTPError, Request
+from api.routes import create_router
+from config.database import StreamLimitError, db_config
+
+USERS = {
+    1: {"id": 1, "name": "Ann", "role": "user", "password": "x"},
+    2: {"id": 2, "name": "Sam", "role": "staff", "password": "x"},
+    3: {"id": 3, "name": "Ada", "role": "admin", "password": "x"},
+    4: {"id": 4, "name": "Bob", "role": "user", "password": "x"},
+}
+
+
+class TestApiAuth:
+    """Test cases for bearer tokens and per-route role checks"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.user_service = Mock()
+        self.user_service.find_user_by_id.side_effect = USERS.get
+        self.user_service.find_all_users.return_value = list(USERS.values())
+        self.complaint_service = Mock()
+        self.complaint_service.find_complaint_by_id.return_value = {
+            "id": 7,
+            "user_id": 1,
+            "assigned_to": 2,
+        }
+        self.comment_service = Mock()
+        self.router = create_router(
+            self.user_service, self.complaint_service, self.comment_service
+        )
+
+    def call(self, method, path, user_id=None, body=b"", query=None):
+        """Dispatch a request the way the server does"""
+        headers = {}
+        if user_id is not None:
+            headers["authorization"] = f"Bearer {issue_token(user_id)}"
+        request = Request(method, path, query=query or {}, headers=headers, body=body)
+        handler, params = self.router.resolve(method, path)
+        return handler(request, **params)
+
+    def test_tokens_reject_tampering_and_expiry(self):
+        """Test only unexpired tokens with a valid signature are accepted"""
+        # Arrange
+        token = issue_token(5, now=1000)
+        payload, _, signature = token.partition(".")
+
+        # Act & Assert
+        assert verify_token(token, now=1001) == 5
+        assert verify_token(token, now=10**12) is None
+        assert verify_token(payload + "." + signature[::-1], now=1001) is None
+        assert verify_token("garbage", now=1001) is None
+
+    def test_non_ascii_tokens_are_unauthorized(self):
+        """Test a token with non-ASCII characters is rejected with 401"""
+        # Arrange
+        request = Request(
+            "GET", "/users", query={}, headers={"authorization": "Bearer x.\u00e9"}
+        )
+        handler, params = self.router.resolve("GET", "/users")
+
+        # Act
+        with pytest.raises(HTTPError) as error:
+            handler(request, **params)
+
+        # Assert
+        assert verify_token("x.\u00e9") is None
+        assert verify_token("\u00e9.x\udcff") is None
+        assert error.value.status == 401
+
+    def test_routes_require_a_token(self):
+        """Test protected routes answer 401 without a valid token"""
+        # Act & Assert
+        for method, path in [("GET", "/users"), ("DELETE", "/complaints/7")]:
+            with pytest.raises(HTTPError) as error:
+                self.call(method, path)
+            assert error.value.status == 401
+        assert self.call("GET", "/health") == (200, {"status": "ok"})
+
+    def test_registration_ignores_role(self):
+        """Test self-registration cannot create staff or admin accounts"""
+        # Arrange
+        self.user_service.find_user_by_email.return_value = None
+        body = b'{"name": "Eve", "email": "e@x", "password": "p", "role": "admin"}'
+
+        # Act
+        self.call("POST", "/users", body=body)
+
+        # Assert
+        self.user_service.create_user.assert_called_once_with("Eve", "e@x", "p")
+
+    def test_login_returns_token(self):
+        """Test login answers with the user and a token that names them"""
+        # Arrange
+        self.user_service.authenticate_user.return_value = USERS[1]
+
+        # Act
+        status, payload = self.call(
+            "POST", "/users/login", body=b'{"email": "a@x", "password": "x"}'
+        )
+
+        # Assert
+        assert status == 200
+        assert "password" not in payload["user"]
+        assert verify_token(payload["token"]) == 1
+
+    def test_admin_only_routes(self):
+        """Test users and staff cannot list users, assign or read statistics"""
+        # Act & Assert
+        for user_id in (1, 2):
+            for method, path in [
+                ("GET", "/users"),
+                ("GET", "/complaints/statistics"),
+                ("PATCH", "/complaints/7/assignment"),
+            ]:
+                with pytest.raises(HTTPError) as error:
+                    self.call(method, path, user_id)
+                assert error.value.status == 403
+        assert self.call("GET", "/users", 3)[0] == 200
+
+    def test_users_only_reach_their_own_complaints(self):
+        """Test a user's filters are replaced by their own id"""
+        # Act
+        self.call("GET", "/complaints", 1, query={"user_id": "4"})
+        with pytest.raises(HTTPError) as error:
+            self.call("DELETE", "/complaints/7", 4)
+
+        # Assert
+        self.complaint_service.find_complaints_by_user_id.assert_called_once_with(1)
+        assert error.value.status == 403
+        self.complaint_service.delete_complaint.assert_not_called()
+
+    def test_complaints_are_filed_as_the_token_user(self):
+        """Test the acting user comes from the token, not the body"""
+        # Act
+        self.call(
+            "POST",
+            "/complaints",
+            1,
+            body=b'{"user_id": 4, "category": "Billing", "description": "Twice"}',
+        )
+
+        # Assert
+        self.complaint_service.create_complaint.assert_called_once_with(
+            1, "Billing", "Twice"
+        )
+
+    def test_staff_update_and_comment_on_assigned_complaints(self):
+        """Test staff act as themselves and only on their assigned complaints"""
+        # Arrange
+        self.complaint_service.update_complaint_status.return_value = True
+        self.comment_service.create_comment.return_value = True
+
+        # Act
+        self.call("PATCH", "/complaints/7/status", 2, body=b'{"status": "Resolved"}')
+        self.call(
+            "POST",
+            "/complaints/7/comments",
+            2,
+            body=b'{"staff_id": 3, "comment": "Hi"}',
+        )
+        self.complaint_service.find_complaint_by_id.return_value = {
+            "id": 8,
+            "user_id": 1,
+            "assigned_to": None,
+        }
+        with pytest.raises(HTTPError) as error:
+            self.call(
+                "PATCH", "/complaints/8/status", 2, body=b'{"status": "Resolved"}'
+            )
+
+        # Assert
+        self.comment_service.create_comment.assert_called_once_with(7, 2, "Hi")
+        assert error.value.status == 403
+        self.complaint_service.update_complaint_status.assert_called_once_with(
+            7, "Resolved"
+        )
+
+    def test_non_numeric_ids_are_bad_requests(self):
+        """Test malformed staff ids answer 400 instead of failing the handler"""
+        # Act & Assert
+        for body in (
+            b'{"staff_id": "abc"}',
+            b'{"staff_id": [2]}',
+            b'{"staff_id": 2.5}',
+        ):
+            with pytest.raises(HTTPError) as error:
+                self.call("PATCH", "/complaints/7/assignment", 3, body=body)
+            assert error.value.status == 400
+        self.user_service.find_user_by_id.reset_mock()
+        self.call("PATCH", "/complaints/7/assignment", 3, body=b'{"staff_id": "2"}')
+        self.user_service.find_user_by_id.assert_called_with(2)
+
+
+class FakeCursor:
+    """Cursor returning one batch of rows"""
+
+    def __init__(self):
+        self.batches = [[(1,)]]
+
+    def execute(self, query, params=None):
+        pass
+
+    def fetchmany(self, size):
+        return self.batches.pop() if self.batches else []
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    """Connection handing out FakeCursors"""
+
+    def cursor(self):
+        return FakeCursor()
+
+    def close(self):
+        pass
+
+
+class TestStreamingLimit:
+    """Test cases for the cap on concurrent streaming queries"""
+
+    def test_streams_beyond_the_limit_are_refused(self, monkeypatch):
+        """Test a second stream waits for the first to close its connection"""
+        # Arrange
+        monkeypatch.setattr(
+            db_config, "open_connection", lambda streaming: FakeConnection()
+        )
+        monkeypatch.setattr(db_config, "_stream_slots", threading.BoundedSemaphore(1))
+        first = db_config.stream_query("SELECT 1")
+        second = db_config.stream_query("SELECT 1")
+
+        # Act & Assert
+        assert next(first) == [(1,)]
+        with db_config.stream_timeout(0):
+            with pytest.raises(StreamLimitError):
+                next(second)
+        first.close()
+        third = db_config.stream_query("SELECT 1")
+        with db_config.stream_timeout(0):
+            assert list(third) == [[(1,)]]
+
+    def test_busy_stream_answers_503(self):
+        """Test the streamed complaint list answers 503 when no slot is free"""
+        # Arrange
+        complaint_service = Mock()
+
+        def busy():
+            raise StreamLimitError("busy")
+            yield
+
+        complaint_service.iter_all_complaint_batches.return_value = busy()
+        user_service = Mock()
+        user_service.find_user_by_id.side_effect = USERS.get
+        router = create_router(user_service, complaint_service, Mock())
+        handler, _ = router.resolve("GET", "/complaints")
+        request = Request(
+            "GET",
+            "/complaints",
+            headers={"authorization": f"Bearer {issue_token(3)}"},
+        )
+
+        # Act & Assert
+        with pytest.raises(HTTPError) as error:
+            handler(request)
+        assert error.value.status == 503
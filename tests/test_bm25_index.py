@@ -0,0 +1,167 @@
+# Unit tests for the embedded BM25 search index
+from search import bm25_index
+from search.bm25_index import BM25Index, tokenize
+
+
+class TestBM25Index:
+    """Test cases for BM25Index"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.documents = [
+            (1, "Refund not received for the duplicate charge"),
+            (2, "App crashes when uploading a photo"),
+            (3, "Refund refund refund please, charged twice"),
+            (4, "Delivery was late and the box was damaged"),
+        ]
+
+    def test_tokenize_drops_stopwords_and_punctuation(self):
+        """Test text is lower-cased into word tokens without stopwords"""
+        # Act
+        result = tokenize("The App CRASHES, and I lost my photo!")
+
+        # Assert
+        assert result == ["app", "crashes", "lost", "photo"]
+
+    def test_search_ranks_by_term_frequency(self, tmp_path):
+        """Test documents mentioning a term more often rank higher"""
+        # Arrange
+        index = BM25Index(str(tmp_path))
+        index.update(self.documents)
+
+        # Act
+        result = index.search("refund")
+
+        # Assert
+        assert [doc_id for doc_id, _ in result] == [3, 1]
+        assert result[0][1] > result[1][1] > 0
+
+    def test_update_replaces_and_deletes_documents(self, tmp_path):
+        """Test a newer version hides the old one and deleted ids disappear"""
+        # Arrange
+        index = BM25Index(str(tmp_path))
+        index.update(self.documents)
+
+        # Act
+        index.update([(2, "Refund for the crash")], deleted=[3])
+
+        # Assert
+        assert sorted(doc_id for doc_id, _ in index.search("refund")) == [1, 2]
+        assert index.search("photo") == []
+        assert len(index) == 3
+
+    def test_index_and_state_persist_across_reopen(self, tmp_path):
+        """Test a reopened index serves the same results and stored state"""
+        # Arrange
+        index = BM25Index(str(tmp_path))
+        index.update(self.documents, state={"last_complaint_id": 4})
+        index.update([(5, "Damaged screen on delivery")])
+        index.close()
+
+        # Act
+        reopened = BM25Index(str(tmp_path))
+
+        # Assert
+        assert sorted(doc_id for doc_id, _ in reopened.search("damaged")) == [4, 5]
+        assert reopened.state == {"last_complaint_id": 4}
+
+    def test_reader_sees_writer_commits(self, tmp_path):
+        """Test a separately opened index picks up new commits on search"""
+        # Arrange
+        writer = BM25Index(str(tmp_path))
+        writer.update(self.documents)
+        reader = BM25Index(str(tmp_path))
+
+        # Act
+        writer.update([(9, "Photo upload failed again")], deleted=[2])
+
+        # Assert
+        assert [doc_id for doc_id, _ in reader.search("photo")] == [9]
+
+    def test_segments_are_merged(self, tmp_path, monkeypatch):
+        """Test too many segments are compacted without changing results"""
+        # Arrange
+        monkeypatch.setattr(bm25_index, "MAX_SEGMENTS", 2)
+        index = BM25Index(str(tmp_path))
+
+        # Act
+        for doc_id, text in self.documents:
+            index.update([(doc_id, text)])
+        index.update(deleted=[1])
+        before = [doc_id for doc_id, _ in index.search("refund charged delivery")]
+        index.compact()
+        after = [doc_id for doc_id, _ in index.search("refund charged delivery")]
+
+        # Assert
+        assert len(index.segments) == 1
+        assert len(index) == 3
+        assert after == before == [3, 4]
+        assert {f.name.split(".")[0] for f in tmp_path.glob("seg_*")} == {
+            index.segments[0].name
+        }
+
+    def test_uncommitted_deletes_leave_committed_index_intact(
+        self, tmp_path, monkeypatch
+    ):
+        """Test a writer stopping before its commit leaves the last commit as is"""
+        # Arrange
+        index = BM25Index(str(tmp_path))
+        index.update(self.documents)
+
+        def crash():
+            raise OSError("disk full")
+
+        monkeypatch.setattr(index, "_commit", crash)
+
+        # Act
+        try:
+            index.update([(1, "Photo of the receipt")], deleted=[3])
+        except OSError:
+            pass
+        reopened = BM25Index(str(tmp_path))
+
+        # Assert
+        assert sorted(doc_id for doc_id, _ in reopened.search("refund")) == [1, 3]
+        assert len(reopened) == 4
+
+    def test_deletes_are_committed_as_new_generations(self, tmp_path):
+        """Test each delete bitmap change is a new file, the old one removed"""
+        # Arrange
+        index = BM25Index(str(tmp_path))
+        index.update(self.documents)
+        name = index.segments[0].name
+
+        # Act
+        index.update(deleted=[3])
+        index.update(deleted=[4])
+        reopened = BM25Index(str(tmp_path))
+
+        # Assert
+        assert sorted(f.name for f in tmp_path.glob(f"{name}*.del")) == [
+            f"{name}.2.del"
+        ]
+        assert reopened.meta["deletes"] == {name: 2}
+        assert [doc_id for doc_id, _ in reopened.search("refund damaged")] == [1]
+
+    def test_replace_swaps_in_staged_index(self, tmp_path):
+        """Test a staged rebuild stays invisible until replace() publishes it"""
+        # Arrange
+        live = BM25Index(str(tmp_path / "index"))
+        live.update(self.documents, state={"last_complaint_id": 4})
+        reader = BM25Index(str(tmp_path / "index"))
+        staging = live.staging()
+
+        # Act
+        staging.update([(7, "Refund finally arrived")], state={"last_complaint_id": 7})
+        during = [doc_id for doc_id, _ in reader.search("refund")]
+        live.replace(staging)
+
+        # Assert
+        assert during == [3, 1]
+        assert [doc_id for doc_id, _ in reader.search("refund")] == [7]
+        assert reader.state == {"last_complaint_id": 7}
+        assert len(reader) == 1
+        assert not (tmp_path / "index.staging").exists()
+        assert {f.name.split(".")[0] for f in (tmp_path / "index").glob("seg_*")} == {
+            live.segments[0].name
+        }
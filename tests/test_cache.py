@@ -0,0 +1,143 @@
+# Unit tests for TTLCache
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+from services.cache import TTLCache
+
+
+class TestTTLCache:
+    """Test cases for TTLCache"""
+
+    def test_first_get_loads_value(self):
+        """Test the first read loads synchronously and later reads are cached"""
+        # Arrange
+        loader = Mock(return_value={"total": 1})
+        cache = TTLCache(loader, ttl=60)
+
+        # Act
+        first = cache.get()
+        second = cache.get()
+
+        # Assert
+        assert first == {"total": 1}
+        assert second is first
+        loader.assert_called_once()
+
+    def test_stale_value_served_while_revalidating(self):
+        """Test an expired value is returned while one background refresh runs"""
+        # Arrange
+        release = threading.Event()
+        values = iter(["old", "new"])
+        calls = []
+
+        def loader():
+            calls.append(1)
+            value = next(values)
+            if value == "new":
+                release.wait(5)
+            return value
+
+        cache = TTLCache(loader, ttl=0)
+        cache.get()
+
+        # Act
+        stale_reads = [cache.get() for _ in range(5)]
+        release.set()
+        deadline = time.monotonic() + 5
+        while cache.get() != "new" and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        # Assert
+        assert stale_reads == ["old"] * 5
+        assert cache.get() == "new"
+        assert len(calls) >= 2
+
+    def test_peek_loads_in_background(self):
+        """Test peek returns None at once and the value after a background load"""
+        # Arrange
+        release = threading.Event()
+
+        def loader():
+            release.wait(5)
+            return "index"
+
+        cache = TTLCache(loader, ttl=60)
+
+        # Act
+        first = cache.peek()
+        release.set()
+        deadline = time.monotonic() + 5
+        while cache.peek() is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        # Assert
+        assert first is None
+        assert cache.peek() == "index"
+
+    def test_invalidate_forces_reload(self):
+        """Test invalidation makes the next read load fresh data"""
+        # Arrange
+        loader = Mock(side_effect=["old", "new"])
+        cache = TTLCache(loader, ttl=60)
+        cache.get()
+
+        # Act
+        cache.invalidate()
+        result = cache.get()
+
+        # Assert
+        assert result == "new"
+        assert loader.call_count == 2
+
+    def test_update_adjusts_cached_value(self):
+        """Test adjusting the cached value"""
+        # Arrange
+        cache = TTLCache(lambda: {"Pending": 1}, ttl=60)
+        cache.get()
+
+        # Act
+        cache.update(lambda counts: counts.update(Pending=counts["Pending"] + 1))
+
+        # Assert
+        assert cache.get() == {"Pending": 2}
+
+    def test_update_leaves_readers_value_unchanged(self):
+        """Test a value already handed to a reader is never mutated"""
+        # Arrange
+        cache = TTLCache(lambda: {"status": {"Pending": 1}}, ttl=60)
+        held = cache.get()
+
+        # Act
+        cache.update(lambda rollup: rollup["status"].update(Resolved=1))
+
+        # Assert
+        assert held == {"status": {"Pending": 1}}
+        assert cache.get() == {"status": {"Pending": 1, "Resolved": 1}}
+
+    def test_update_in_place_without_copy(self):
+        """Test values that lock themselves can opt out of copying"""
+        # Arrange
+        cache = TTLCache(lambda: {"Pending": 1}, ttl=60, copy_value=None)
+        held = cache.get()
+
+        # Act
+        cache.update(lambda counts: counts.update(Pending=2))
+
+        # Assert
+        assert cache.get() is held
+        assert held == {"Pending": 2}
+
+    def test_update_without_value_is_noop(self):
+        """Test adjusting an empty cache does not load it"""
+        # Arrange
+        loader = Mock(return_value={})
+        cache = TTLCache(loader, ttl=60)
+
+        # Act
+        cache.update(lambda counts: counts.clear())
+
+        # Assert
+        loader.assert_not_called()
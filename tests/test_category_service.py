@@ -0,0 +1,39 @@
+# Unit tests for the in-memory category catalog
+from services.category_service import CategoryCatalog
+
+
+class TestCategoryCatalog:
+    """Test cases for CategoryCatalog"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.catalog = CategoryCatalog(
+            {"Bug Report": 5, "bug report": 2, "Billing": 9, "Delivery": 0}
+        )
+
+    def test_spellings_are_grouped_under_the_most_used(self):
+        """Test case variants share one suggestion with a combined count"""
+        # Act
+        result = self.catalog.suggest("BU")
+
+        # Assert
+        assert result == [{"category": "Bug Report", "count": 7}]
+
+    def test_canonical_ignores_case_and_spacing(self):
+        """Test typed categories map to the canonical spelling"""
+        # Act
+        known = self.catalog.canonical("  bug   REPORT ")
+        unknown = self.catalog.canonical("Delivery")
+
+        # Assert
+        assert known == "Bug Report"
+        assert unknown is None
+
+    def test_record_adds_new_category(self):
+        """Test a new complaint's category is searchable and suggested at once"""
+        # Act
+        self.catalog.record("Refunds")
+
+        # Assert
+        assert self.catalog.match("fund") == ["Refunds"]
+        assert self.catalog.suggest("re") == [{"category": "Refunds", "count": 1}]
@@ -0,0 +1,117 @@
+# Unit tests for the columnar complaint snapshot
+from datetime import datetime, timedelta
+
+import pytest
+
+from analytics.columnar import ComplaintSnapshot, Mask, from_seconds, to_seconds
+
+
+class TestComplaintSnapshot:
+    """Test cases for ComplaintSnapshot and Mask"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        day = datetime(2025, 7, 1, 9, 30)
+        rows = [
+            (1, 10, None, 1, "Pending", day, day),
+            (2, 11, 5, 2, "Resolved", day + timedelta(hours=3), day),
+            (3, 10, 5, 1, "In Progress", day + timedelta(days=1), day),
+            (4, 12, 6, 1, "Resolved", day + timedelta(days=2), day),
+            (5, 12, None, 9, "Pending", day + timedelta(days=2, hours=1), day),
+        ]
+        self.snapshot = ComplaintSnapshot.load(
+            [rows[:2], rows[2:]], {1: "Billing", 2: "Bug Report"}
+        )
+
+    def test_columns_are_typed_arrays(self):
+        """Test rows are stored column-wise with dictionary-encoded names"""
+        # Assert
+        assert len(self.snapshot) == 5
+        assert self.snapshot.columns["status"].typecode == "B"
+        assert self.snapshot.labels["status"] == ["Pending", "Resolved", "In Progress"]
+        assert list(self.snapshot.columns["assigned_to"]) == [0, 5, 5, 6, 0]
+        assert self.snapshot.memory_bytes() == 5 * 34
+
+    def test_filter_combines_conditions(self):
+        """Test filters on encoded, plain and time columns are ANDed"""
+        # Act
+        mask = self.snapshot.filter(
+            status=["Pending", "Resolved"],
+            category=["Billing"],
+            created_from=datetime(2025, 7, 2),
+        )
+
+        # Assert
+        assert self.snapshot.count(mask) == 1
+        assert self.snapshot.group_count("user_id", mask) == {12: 1}
+
+    def test_unknown_values_match_nothing(self):
+        """Test filtering on a name never seen selects no rows"""
+        # Act
+        mask = self.snapshot.mask("category", ["Nope"])
+
+        # Assert
+        assert self.snapshot.count(mask) == 0
+
+    def test_group_count_decodes_names(self):
+        """Test group-by results use names, with unknown category ids grouped"""
+        # Act
+        result = self.snapshot.group_count("category")
+        masked = self.snapshot.group_count(
+            "status", self.snapshot.mask("category", ["Billing"])
+        )
+
+        # Assert
+        assert result == {"Billing": 3, "Bug Report": 1, "Unknown": 1}
+        assert masked == {"Pending": 1, "In Progress": 1, "Resolved": 1}
+
+    def test_histogram_buckets_by_day(self):
+        """Test daily buckets are keyed by their start and skip empty days"""
+        # Act
+        result = self.snapshot.histogram(mask=self.snapshot.mask("status", ["Pending"]))
+
+        # Assert
+        assert result == {datetime(2025, 7, 1): 1, datetime(2025, 7, 3): 1}
+
+    def test_group_histogram_per_category(self):
+        """Test per-category daily counts"""
+        # Act
+        result = self.snapshot.group_histogram("category")
+
+        # Assert
+        assert result["Billing"] == {
+            datetime(2025, 7, 1): 1,
+            datetime(2025, 7, 2): 1,
+            datetime(2025, 7, 3): 1,
+        }
+        assert result["Bug Report"] == {datetime(2025, 7, 1): 1}
+
+    def test_unsorted_column_falls_back_to_scans(self):
+        """Test range filters and histograms work on columns out of order"""
+        # Arrange
+        self.snapshot.columns["updated_at"][0] = to_seconds(datetime(2025, 8, 1))
+
+        # Act
+        mask = self.snapshot.between("updated_at", start=datetime(2025, 7, 15))
+        result = self.snapshot.histogram("updated_at", width=timedelta(days=7))
+
+        # Assert
+        assert self.snapshot.is_sorted("updated_at") is False
+        assert self.snapshot.count(mask) == 1
+        assert sum(result.values()) == 5
+        with pytest.raises(ValueError):
+            self.snapshot.group_histogram("status", "updated_at")
+
+    def test_mask_operators(self):
+        """Test masks combine and invert row by row"""
+        # Arrange
+        first = Mask(b"\x01\x01\x00\x00")
+        second = Mask(b"\x01\x00\x01\x00")
+
+        # Assert
+        assert (first & second).flags == b"\x01\x00\x00\x00"
+        assert (first | second).flags == b"\x01\x01\x01\x00"
+        assert (~first).flags == b"\x00\x00\x01\x01"
+        assert from_seconds(to_seconds(datetime(2025, 7, 1, 9, 30))) == datetime(
+            2025, 7, 1, 9, 30
+        )
@@ -0,0 +1,54 @@
+# Unit tests for CommentService
+from unittest.mock import Mock
+
+import pytest
+
+from services.comment_service import CommentService
+
+
+class TestCommentService:
+    """Test cases for CommentService"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.comment_service = CommentService()
+        self.mock_dao = Mock()
+        self.comment_service.comment_dao = self.mock_dao
+
+    def test_find_comment_page_returns_cursor_for_full_page(self):
+        """Test a full page hands back its oldest id as the next cursor"""
+        # Arrange
+        self.mock_dao.find_page_by_complaint_id.return_value = [{"id": 8}, {"id": 9}]
+
+        # Act
+        result = self.comment_service.find_comment_page(3, limit=2, before_id=10)
+
+        # Assert
+        assert result["next_before_id"] == 8
+        self.mock_dao.find_page_by_complaint_id.assert_called_once_with(
+            3, 2, before_id=10
+        )
+
+    def test_find_comment_page_last_page_has_no_cursor(self):
+        """Test a short page means there are no older comments"""
+        # Arrange
+        self.mock_dao.find_page_by_complaint_id.return_value = [{"id": 1}]
+
+        # Act
+        result = self.comment_service.find_comment_page(3, limit=2)
+
+        # Assert
+        assert result["next_before_id"] is None
+
+    def test_find_comments_since_reads_only_newer(self):
+        """Test polling asks the DAO only for comments after since_id"""
+        # Arrange
+        self.mock_dao.find_page_by_complaint_id.return_value = []
+
+        # Act
+        self.comment_service.find_comments_since(3, since_id=42)
+
+        # Assert
+        self.mock_dao.find_page_by_complaint_id.assert_called_once_with(
+            3, 500, since_id=42
+        )
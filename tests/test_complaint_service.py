@@ -0,0 +1,442 @@
+# Unit tests for ComplaintService
+from datetime import date
+from unittest.mock import Mock
+
+import pytest
+
+from services import search_service
+from services.cache import TTLCache
+from services.complaint_service import ComplaintService
+
+
+class TestComplaintService:
+    """Test cases for ComplaintService"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.complaint_service = ComplaintService()
+        self.mock_dao = Mock()
+        self.complaint_service.complaint_dao = self.mock_dao
+        self.mock_comment_dao = Mock()
+        self.complaint_service.comment_dao = self.mock_comment_dao
+        self.mock_category_dao = Mock()
+        self.mock_category_dao.find_ids.return_value = {}
+        self.complaint_service.category_dao = self.mock_category_dao
+        self.complaint_service.statistics_cache = TTLCache(
+            self.mock_dao.get_statistics, ttl=60
+        )
+        self.mock_category_service = Mock()
+        self.complaint_service.category_service = self.mock_category_service
+        self.mock_duplicate_service = Mock()
+        self.mock_duplicate_service.prepare.return_value = {}
+        self.complaint_service.duplicate_service = self.mock_duplicate_service
+        self.mock_similarity_service = Mock()
+        self.complaint_service.similarity_service = self.mock_similarity_service
+        self.mock_routing_service = Mock()
+        self.mock_routing_service.prepare.return_value = {}
+        self.complaint_service.routing_service = self.mock_routing_service
+
+    def test_get_statistics_reads_rollup(self):
+        """Test statistics are built from the stats rollup, not a table scan"""
+        # Arrange
+        self.mock_dao.get_statistics.return_value = {
+            "status": {"Pending": 3, "In Progress": 2, "Resolved": 5},
+            "category": {"Technical Issue": 6, "Billing": 4},
+        }
+
+        # Act
+        result = self.complaint_service.get_statistics()
+
+        # Assert
+        assert result["total_complaints"] == 10
+        assert result["pending_complaints"] == 3
+        assert result["in_progress_complaints"] == 2
+        assert result["resolved_complaints"] == 5
+        assert result["closed_complaints"] == 0
+        assert result["category_breakdown"] == {"Technical Issue": 6, "Billing": 4}
+        self.mock_dao.find_all.assert_not_called()
+
+    def test_get_statistics_empty_rollup(self):
+        """Test statistics with no complaints"""
+        # Arrange
+        self.mock_dao.get_statistics.return_value = {"status": {}, "category": {}}
+
+        # Act
+        result = self.complaint_service.get_statistics()
+
+        # Assert
+        assert result["total_complaints"] == 0
+        assert result["category_breakdown"] == {}
+
+    def test_reconcile_statistics(self):
+        """Test reconciliation is delegated to the DAO"""
+        # Arrange
+        self.mock_dao.reconcile_statistics.return_value = True
+
+        # Act
+        result = self.complaint_service.reconcile_statistics()
+
+        # Assert
+        assert result == True
+        self.mock_dao.reconcile_statistics.assert_called_once()
+
+    def test_get_statistics_is_cached(self):
+        """Test repeated dashboard reads hit the rollup once within the TTL"""
+        # Arrange
+        self.mock_dao.get_statistics.return_value = {"status": {}, "category": {}}
+
+        # Act
+        self.complaint_service.get_statistics()
+        self.complaint_service.get_statistics()
+
+        # Assert
+        self.mock_dao.get_statistics.assert_called_once()
+
+    def test_create_complaint_adjusts_cached_statistics(self):
+        """Test a new complaint is counted without reloading the rollup"""
+        # Arrange
+        self.mock_dao.get_statistics.return_value = {
+            "status": {"Pending": 1},
+            "category": {"Billing": 1},
+        }
+        self.mock_dao.create.return_value = True
+        self.complaint_service.get_statistics()
+
+        # Act
+        self.complaint_service.create_complaint(1, "Billing", "Charged twice")
+        result = self.complaint_service.get_statistics()
+
+        # Assert
+        assert result["pending_complaints"] == 2
+        assert result["category_breakdown"] == {"Billing": 2}
+        self.mock_dao.get_statistics.assert_called_once()
+
+    def test_create_complaint_counts_category_in_matching_bucket(self):
+        """Test a spelling the database matches to a bucket is counted in it"""
+        # Arrange
+        self.mock_dao.get_statistics.return_value = {
+            "status": {"Pending": 1},
+            "category": {"Caf\u00e9": 1, "Billing": 4},
+        }
+        self.mock_dao.create.return_value = True
+        self.mock_category_dao.find_ids.return_value = {
+            "cafe": 3,
+            "Caf\u00e9": 3,
+            "Billing": 1,
+        }
+        before = self.complaint_service.get_statistics()
+
+        # Act
+        self.complaint_service.create_complaint(1, "cafe", "Cold coffee")
+        result = self.complaint_service.get_statistics()
+
+        # Assert
+        assert result["category_breakdown"] == {"Caf\u00e9": 2, "Billing": 4}
+        assert before["category_breakdown"] == {"Caf\u00e9": 1, "Billing": 4}
+
+    def test_create_complaint_links_near_duplicate(self):
+        """Test the duplicate link and fingerprint are stored with the complaint"""
+        # Arrange
+        self.mock_duplicate_service.prepare.return_value = {
+            "duplicate_of": 12,
+            "signature": b"sig",
+            "band_keys": [1, 2],
+        }
+        self.mock_dao.create.return_value = True
+
+        # Act
+        result = self.complaint_service.create_complaint(1, "Bug", "App crashes")
+
+        # Assert
+        assert result == True
+        created = self.mock_dao.create.call_args[0][0]
+        assert created["duplicate_of"] == 12
+        assert created["band_keys"] == [1, 2]
+        self.mock_duplicate_service.prepare.assert_called_once_with("App crashes")
+
+    def test_create_complaint_assigns_routed_staff(self):
+        """Test a confident routing prediction is stored as the assignee"""
+        # Arrange
+        self.mock_routing_service.prepare.return_value = {"assigned_to": 6}
+        self.mock_dao.create.return_value = True
+
+        # Act
+        self.complaint_service.create_complaint(1, "Billing", "Charged twice")
+
+        # Assert
+        assert self.mock_dao.create.call_args[0][0]["assigned_to"] == 6
+        self.mock_routing_service.prepare.assert_called_once_with("Charged twice")
+
+    def test_update_status_invalidates_cached_statistics(self):
+        """Test a status change forces the next read to reload the rollup"""
+        # Arrange
+        self.mock_dao.get_statistics.return_value = {"status": {}, "category": {}}
+        self.mock_dao.update_status.return_value = True
+        self.complaint_service.get_statistics()
+
+        # Act
+        self.complaint_service.update_complaint_status(1, "Resolved")
+        self.complaint_service.get_statistics()
+
+        # Assert
+        assert self.mock_dao.get_statistics.call_count == 2
+        self.mock_similarity_service.record_status.assert_called_once_with(
+            1, "Resolved"
+        )
+
+    def test_get_complaint_details_fetches_complaint_and_comments(self):
+        """Test the detail view gets the complaint and its comments together"""
+        # Arrange
+        self.mock_dao.find_details.return_value = {"id": 5, "comment_count": 1}
+        self.mock_comment_dao.find_page_by_complaint_id.return_value = [{"id": 1}]
+
+        # Act
+        complaint, comments = self.complaint_service.get_complaint_details(5)
+
+        # Assert
+        assert complaint == {"id": 5, "comment_count": 1}
+        assert comments == [{"id": 1}]
+        self.mock_dao.find_details.assert_called_once_with(5)
+        self.mock_comment_dao.find_page_by_complaint_id.assert_called_once_with(5, 20)
+
+    def test_find_with_comments_groups_comments_in_one_query(self):
+        """Test a page of complaints gets its comments from a single IN query"""
+        # Arrange
+        self.mock_dao.find_page.return_value = [{"id": 7}, {"id": 5}]
+        self.mock_comment_dao.find_by_complaint_ids.return_value = [
+            {"id": 1, "complaint_id": 5},
+            {"id": 2, "complaint_id": 7},
+            {"id": 3, "complaint_id": 7},
+        ]
+
+        # Act
+        result = self.complaint_service.find_with_comments(
+            {"assigned_to": 3}, page=2, page_size=2, max_comments=2
+        )
+
+        # Assert
+        assert [len(c["comments"]) for c in result] == [2, 1]
+        self.mock_dao.find_page.assert_called_once_with(
+            {"assigned_to": 3}, 2, 2, "newest"
+        )
+        self.mock_comment_dao.find_by_complaint_ids.assert_called_once_with([7, 5], 2)
+
+    def test_find_with_comments_counts_beyond_the_preview_cap(self):
+        """Test capped previews still report each complaint's full comment count"""
+        # Arrange
+        self.mock_dao.find_page.return_value = [{"id": 7}, {"id": 5}]
+        self.mock_comment_dao.find_by_complaint_ids.return_value = [
+            {"id": 9, "complaint_id": 7}
+        ]
+        self.mock_comment_dao.count_by_complaint_ids.return_value = {7: 12}
+
+        # Act
+        result = self.complaint_service.find_with_comments(
+            {"assigned_to": 3}, page_size=None, max_comments=1, order_by="activity"
+        )
+
+        # Assert
+        assert [c["comment_count"] for c in result] == [12, 0]
+        self.mock_dao.find_page.assert_called_once_with(
+            {"assigned_to": 3}, 1, None, "activity"
+        )
+
+    def test_find_with_comments_empty_page_skips_comment_query(self):
+        """Test an empty page does not query comments"""
+        # Arrange
+        self.mock_dao.find_page.return_value = []
+
+        # Act
+        result = self.complaint_service.find_with_comments()
+
+        # Assert
+        assert result == []
+        self.mock_comment_dao.find_by_complaint_ids.assert_not_called()
+
+    def test_search_passes_filters_to_fulltext_query(self):
+        """Test keyword search is delegated to the DAO with trimmed text"""
+        # Arrange
+        self.mock_dao.search.return_value = [{"id": 1, "relevance": 2.5}]
+
+        # Act
+        result = self.complaint_service.search("  refund  ", {"user_id": 4}, page=2)
+
+        # Assert
+        assert result == [{"id": 1, "relevance": 2.5}]
+        self.mock_dao.search.assert_called_once_with("refund", {"user_id": 4}, 2, 20)
+
+    def test_search_uses_bm25_index_when_configured(self, monkeypatch):
+        """Test the bm25 backend ranks with the embedded index, not FULLTEXT"""
+        # Arrange
+        index_service = Mock()
+        index_service.search.return_value = [{"id": 3, "relevance": 4.2}]
+        monkeypatch.setattr(search_service, "SEARCH_BACKEND", "bm25")
+        monkeypatch.setattr(
+            search_service, "get_search_index_service", lambda: index_service
+        )
+
+        # Act
+        result = self.complaint_service.search("refund", {"status": "Pending"})
+
+        # Assert
+        assert result == [{"id": 3, "relevance": 4.2}]
+        index_service.search.assert_called_once_with(
+            "refund", {"status": "Pending"}, 1, 20
+        )
+        self.mock_dao.search.assert_not_called()
+
+    def test_search_blank_text_skips_query(self):
+        """Test blank keywords return nothing without touching the database"""
+        # Act
+        result = self.complaint_service.search("   ")
+
+        # Assert
+        assert result == []
+        self.mock_dao.search.assert_not_called()
+
+    def test_search_by_category_resolves_matching_categories(self):
+        """Test a category term is resolved in memory before one IN query"""
+        # Arrange
+        self.mock_category_service.match_categories.return_value = [
+            "Bug Report",
+            "bug report",
+        ]
+        self.mock_dao.find_by_categories.return_value = [{"id": 2}]
+
+        # Act
+        result = self.complaint_service.search_by_category("bug", user_id=4)
+
+        # Assert
+        assert result == [{"id": 2}]
+        self.mock_dao.find_by_categories.assert_called_once_with(
+            ["Bug Report", "bug report"], 4
+        )
+
+    def test_search_by_category_without_match_skips_query(self):
+        """Test an unknown category returns nothing without a database query"""
+        # Arrange
+        self.mock_category_service.match_categories.return_value = []
+
+        # Act
+        result = self.complaint_service.search_by_category("zzz", is_admin=True)
+
+        # Assert
+        assert result == []
+        self.mock_dao.find_by_categories.assert_not_called()
+
+    def test_iter_export_batches_admin_streams_all(self):
+        """Test admin exports stream every complaint from the DAO"""
+        # Arrange
+        self.mock_dao.iter_export_batches.return_value = iter([[(1,)], [(2,)]])
+
+        # Act
+        result = list(self.complaint_service.iter_export_batches(is_admin=True))
+
+        # Assert
+        assert result == [[(1,)], [(2,)]]
+        self.mock_dao.iter_export_batches.assert_called_once_with(
+            batch_size=1000, id_range=None
+        )
+
+    def test_iter_export_batches_user_filters_by_owner(self):
+        """Test user exports only stream that user's complaints"""
+        # Arrange
+        self.mock_dao.iter_export_batches.return_value = iter([])
+
+        # Act
+        list(self.complaint_service.iter_export_batches(user_id=7, batch_size=50))
+
+        # Assert
+        self.mock_dao.iter_export_batches.assert_called_once_with(7, 50, None)
+
+    def test_incremental_export_advances_watermark(self):
+        """Test changed rows and tombstones are emitted and the watermark moves"""
+        # Arrange
+        self.mock_dao.get_export_horizon.return_value = "2025-07-24 00:00:00"
+        self.mock_dao.iter_changed_batches.return_value = iter(
+            [
+                [
+                    (4, 1, "Billing", "Refund", "Pending", "c", "2025-07-23 09:00:00"),
+                    (9, 2, "Bug", "Crash", "Resolved", "c", "2025-07-23 10:00:00"),
+                ]
+            ]
+        )
+        self.mock_dao.iter_tombstone_batches.return_value = iter(
+            [[(15, 3, "2025-07-23 11:00:00")]]
+        )
+        self.mock_dao.get_export_watermark.return_value = None
+        watermark = self.complaint_service.get_export_watermark("nightly")
+
+        # Act
+        rows = [
+            row
+            for batch in self.complaint_service.iter_incremental_export(watermark)
+            for row in batch
+        ]
+
+        # Assert
+        assert [row[0] for row in rows] == ["upsert", "upsert", "delete"]
+        assert rows[2][1] == 3
+        assert watermark == {
+            "last_updated_at": "2025-07-23 10:00:00",
+            "last_complaint_id": 9,
+            "last_tombstone_id": 15,
+        }
+        self.mock_dao.iter_changed_batches.assert_called_once_with(
+            None, 0, "2025-07-24 00:00:00", 1000
+        )
+
+    def test_get_trends_daily_fills_quiet_days(self):
+        """Test daily trends list every day in range with zeros for quiet ones"""
+        # Arrange
+        self.mock_dao.get_daily_stats.return_value = [
+            (date(2025, 7, 21), "Network", 3, 1),
+            (date(2025, 7, 21), "Billing", 2, 0),
+            (date(2025, 7, 23), "Network", 1, 2),
+        ]
+
+        # Act
+        trends = self.complaint_service.get_trends(days=4, today=date(2025, 7, 23))
+
+        # Assert
+        self.mock_dao.get_daily_stats.assert_called_once_with(date(2025, 7, 20), None)
+        assert trends["periods"] == [
+            "2025-07-20",
+            "2025-07-21",
+            "2025-07-22",
+            "2025-07-23",
+        ]
+        assert trends["created"] == [0, 5, 0, 1]
+        assert trends["resolved"] == [0, 1, 0, 2]
+        assert trends["by_category"]["Billing"] == {
+            "created": [0, 2, 0, 0],
+            "resolved": [0, 0, 0, 0],
+        }
+
+    def test_get_trends_weekly_starts_on_monday(self):
+        """Test weekly trends sum days into Monday-based weeks"""
+        # Arrange
+        self.mock_dao.get_daily_stats.return_value = [
+            (date(2025, 7, 15), "Network", 1, 0),
+            (date(2025, 7, 20), "Network", 2, 1),
+            (date(2025, 7, 21), "Network", 4, 3),
+        ]
+
+        # Act
+        trends = self.complaint_service.get_trends(
+            days=9, bucket="week", categories=["Network"], today=date(2025, 7, 23)
+        )
+
+        # Assert
+        self.mock_dao.get_daily_stats.assert_called_once_with(
+            date(2025, 7, 14), ["Network"]
+        )
+        assert trends["periods"] == ["2025-07-14", "2025-07-21"]
+        assert trends["created"] == [3, 4]
+        assert trends["resolved"] == [1, 3]
+
+    def test_get_trends_rejects_unknown_bucket(self):
+        """Test trends only bucket by day or week"""
+        # Act & Assert
+        with pytest.raises(ValueError):
+            self.complaint_service.get_trends(bucket="month")
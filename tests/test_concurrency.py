@@ -0,0 +1,40 @@
+# Unit tests for the concurrent query helper
+import threading
+
+import pytest
+
+from services.concurrency import run_concurrently
+
+
+class TestRunConcurrently:
+    """Test cases for run_concurrently"""
+
+    def test_results_keep_call_order(self):
+        """Test results come back in the order the calls were given"""
+        # Act
+        result = run_concurrently(lambda: 1, lambda: 2, lambda: 3)
+
+        # Assert
+        assert result == [1, 2, 3]
+
+    def test_calls_overlap(self):
+        """Test calls run at the same time rather than one after another"""
+        # Arrange
+        barrier = threading.Barrier(2, timeout=5)
+
+        # Act
+        result = run_concurrently(barrier.wait, barrier.wait)
+
+        # Assert
+        assert sorted(result) == [0, 1]
+
+    def test_exception_is_reraised(self):
+        """Test a failing call surfaces its exception to the caller"""
+
+        # Arrange
+        def fail():
+            raise ValueError("boom")
+
+        # Act / Assert
+        with pytest.raises(ValueError):
+            run_concurrently(lambda: 1, fail)
@@ -0,0 +1,73 @@
+# Unit tests for DuplicateDetectionService
+from unittest.mock import Mock
+
+from search.minhash import to_bytes
+from services.duplicate_service import DuplicateDetectionService, minhasher
+
+
+class TestDuplicateDetectionService:
+    """Test cases for DuplicateDetectionService"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.duplicate_service = DuplicateDetectionService(threshold=0.7)
+        self.mock_dao = Mock()
+        self.duplicate_service.complaint_dao = self.mock_dao
+        self.texts = {
+            1: "Refund not received for the order I cancelled last week",
+            2: "Refund not received for the order I cancelled last week!!",
+            3: "The app crashes when I upload a photo",
+            4: "Refund not received for the order I cancelled last week please",
+        }
+        self.signatures = {
+            complaint_id: to_bytes(minhasher.signature(text))
+            for complaint_id, text in self.texts.items()
+        }
+
+    def test_prepare_links_most_similar_candidate(self):
+        """Test a new complaint is linked to a bucket mate above the threshold"""
+        # Arrange
+        self.mock_dao.find_signatures_by_band_keys.return_value = [
+            (3, self.signatures[3]),
+            (1, self.signatures[1]),
+        ]
+
+        # Act
+        result = self.duplicate_service.prepare(self.texts[2])
+
+        # Assert
+        assert result["duplicate_of"] == 1
+        assert len(result["band_keys"]) == 16
+
+    def test_prepare_without_similar_candidate(self):
+        """Test dissimilar bucket mates are not linked"""
+        # Arrange
+        self.mock_dao.find_signatures_by_band_keys.return_value = [
+            (3, self.signatures[3])
+        ]
+
+        # Act
+        result = self.duplicate_service.prepare(self.texts[1])
+
+        # Assert
+        assert result["duplicate_of"] is None
+
+    def test_cluster_merges_confirmed_bucket_mates(self):
+        """Test shared buckets are confirmed by signature and merged transitively"""
+        # Arrange
+        self.mock_dao.iter_shared_band_batches.return_value = iter(
+            [[(10, 1), (10, 2), (10, 3)], [(11, 2), (11, 4)]]
+        )
+        self.mock_dao.link_duplicates.return_value = 2
+        self.mock_dao.find_signatures.side_effect = lambda ids: {
+            complaint_id: self.signatures[complaint_id] for complaint_id in ids
+        }
+
+        # Act
+        clusters = self.duplicate_service.cluster()
+        linked = self.duplicate_service.link_clusters(clusters)
+
+        # Assert
+        assert clusters == [[1, 2, 4]]
+        assert linked == 2
+        self.mock_dao.link_duplicates.assert_called_once_with([(2, 1), (4, 1)])
@@ -0,0 +1,99 @@
+# Unit tests for ComplaintIngestionService
+import csv
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from services.ingestion_service import ComplaintIngestionService
+
+
+class TestComplaintIngestionService:
+    """Test cases for ComplaintIngestionService"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.ingestion_service = ComplaintIngestionService()
+        self.mock_complaint_dao = Mock()
+        self.mock_user_dao = Mock()
+        self.ingestion_service.complaint_dao = self.mock_complaint_dao
+        self.ingestion_service.user_dao = self.mock_user_dao
+        self.mock_user_dao.find_ids_by_emails.return_value = {"a@example.com": 1}
+        self.mock_complaint_dao.create_many.side_effect = lambda rows: len(rows)
+
+    def read_rejects(self, path):
+        """Read the reject file written by an ingestion run"""
+        with open(path, newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+
+    def test_ingest_csv(self, tmp_path):
+        """Test valid CSV rows are inserted in chunks and bad rows rejected"""
+        # Arrange
+        source = tmp_path / "complaints.csv"
+        source.write_text(
+            "user_email,category,description,status\n"
+            "A@example.com,Billing,Charged twice,\n"
+            "a@example.com,Bug Report,App crashes,Resolved\n"
+            "a@example.com,,Missing category,\n"
+            "nobody@example.com,Billing,Unknown user,\n",
+            encoding="utf-8",
+        )
+
+        # Act
+        report = self.ingestion_service.ingest(str(source), chunk_size=10)
+
+        # Assert
+        assert report["read"] == 4
+        assert report["inserted"] == 2
+        assert report["rejected"] == 2
+        inserted = self.mock_complaint_dao.create_many.call_args[0][0]
+        assert [row["status"] for row in inserted] == ["Pending", "Resolved"]
+        assert all(row["user_id"] == 1 for row in inserted)
+        errors = [row["error"] for row in self.read_rejects(report["reject_file"])]
+        assert errors == ["category is required", "Unknown user_email"]
+
+    def test_ingest_jsonl_chunks_and_batched_lookup(self, tmp_path):
+        """Test JSONL input is inserted per chunk with one email lookup"""
+        # Arrange
+        source = tmp_path / "complaints.jsonl"
+        lines = [
+            json.dumps(
+                {
+                    "user_email": "a@example.com",
+                    "category": "Billing",
+                    "description": f"Complaint {i}",
+                }
+            )
+            for i in range(5)
+        ]
+        source.write_text("\n".join(lines + ["{not json"]) + "\n", encoding="utf-8")
+
+        # Act
+        report = self.ingestion_service.ingest(str(source), chunk_size=2)
+
+        # Assert
+        assert report["inserted"] == 5
+        assert report["rejected"] == 1
+        assert self.mock_complaint_dao.create_many.call_count == 3
+        self.mock_user_dao.find_ids_by_emails.assert_called_once_with(["a@example.com"])
+
+    def test_failed_chunk_falls_back_to_single_rows(self, tmp_path):
+        """Test a failed bulk insert is retried row by row"""
+        # Arrange
+        source = tmp_path / "complaints.csv"
+        source.write_text(
+            "user_email,category,description\n"
+            "a@example.com,Billing,First\n"
+            "a@example.com,Billing,Second\n",
+            encoding="utf-8",
+        )
+        self.mock_complaint_dao.create_many.side_effect = None
+        self.mock_complaint_dao.create_many.return_value = 0
+        self.mock_complaint_dao.create.side_effect = [True, False]
+
+        # Act
+        report = self.ingestion_service.ingest(str(source))
+
+        # Assert
+        assert report["inserted"] == 1
+        assert report["rejected"] == 1
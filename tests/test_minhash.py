@@ -0,0 +1,59 @@
+# Unit tests for MinHash signatures and LSH band keys
+from search.minhash import MinHasher, band_keys, from_bytes, similarity, to_bytes
+
+
+class TestMinHash:
+    """Test cases for MinHasher and its helpers"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.minhasher = MinHasher()
+        self.original = (
+            "The app crashes every time I try to upload a photo from my "
+            "gallery, please fix this as soon as possible"
+        )
+        self.resubmitted = (
+            "The app crashes every time I try to upload a photo from my "
+            "gallery, please fix this soon"
+        )
+        self.unrelated = "I was charged twice for my subscription and need a refund"
+
+    def test_near_duplicates_are_similar(self):
+        """Test a reworded resubmission scores far above an unrelated text"""
+        # Act
+        original = self.minhasher.signature(self.original)
+        close = similarity(original, self.minhasher.signature(self.resubmitted))
+        far = similarity(original, self.minhasher.signature(self.unrelated))
+
+        # Assert
+        assert close >= 0.7
+        assert far < 0.2
+
+    def test_near_duplicates_share_a_band(self):
+        """Test near-duplicates land in a common LSH bucket"""
+        # Act
+        first = band_keys(self.minhasher.signature(self.original))
+        second = band_keys(self.minhasher.signature(self.resubmitted))
+
+        # Assert
+        assert len(first) == 16
+        assert set(first) & set(second)
+        assert all(0 <= key < 2**63 for key in first)
+
+    def test_signatures_are_stable_across_instances(self):
+        """Test separately created hashers agree, so stored signatures compare"""
+        # Act
+        first = MinHasher().signature(self.original)
+        second = MinHasher().signature(self.original)
+
+        # Assert
+        assert first == second
+        assert from_bytes(to_bytes(first)) == first
+
+    def test_empty_text_matches_nothing_real(self):
+        """Test an empty description gets a signature unlike any real text"""
+        # Act
+        empty = self.minhasher.signature("   ")
+
+        # Assert
+        assert similarity(empty, self.minhasher.signature(self.original)) == 0.0
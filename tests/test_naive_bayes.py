@@ -0,0 +1,76 @@
+# Unit tests for the hashed-feature naive Bayes classifier
+import pytest
+
+from search.naive_bayes import NaiveBayesClassifier, NaiveBayesTrainer, features
+
+
+class TestNaiveBayes:
+    """Test cases for NaiveBayesTrainer and NaiveBayesClassifier"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        trainer = NaiveBayesTrainer(min_feature_count=1)
+        examples = [
+            ("Billing", "Charged twice for my subscription, need a refund"),
+            ("Billing", "Refund still missing after the double charge"),
+            ("Billing", "Invoice shows a charge I did not make"),
+            ("Technical Issue", "App crashes when I upload a photo"),
+            ("Technical Issue", "Login page crashes on the mobile app"),
+        ]
+        for label, text in examples:
+            trainer.add(features(text), label)
+        self.model = trainer.build()
+
+    def test_predict_picks_label_with_matching_words(self):
+        """Test descriptions are classified by the words they share with a label"""
+        # Act
+        billing = self.model.predict("I want a refund for the double charge")
+        technical = self.model.predict("The app crashes at login")
+
+        # Assert
+        assert billing[0][0] == "Billing"
+        assert technical[0][0] == "Technical Issue"
+
+    def test_predict_returns_probabilities_best_first(self):
+        """Test top-k predictions are ranked and their probabilities sum to one"""
+        # Act
+        result = self.model.predict("refund", k=2)
+
+        # Assert
+        assert [label for label, _ in result] == ["Billing", "Technical Issue"]
+        assert sum(p for _, p in result) == pytest.approx(1.0)
+
+    def test_unknown_words_fall_back_to_priors(self):
+        """Test a description with no known words predicts the most common label"""
+        # Act
+        result = self.model.predict("zebra quokka")
+
+        # Assert
+        assert result[0] == ("Billing", pytest.approx(0.6))
+
+    def test_rare_features_are_pruned(self):
+        """Test features seen fewer than min_feature_count times are dropped"""
+        # Arrange
+        trainer = NaiveBayesTrainer(min_feature_count=2)
+        trainer.add(features("refund refund"), "Billing")
+        trainer.add(features("crash"), "Technical Issue")
+
+        # Act
+        model = trainer.build()
+
+        # Assert
+        assert list(model.rows) == list(features("refund"))
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        """Test a saved model predicts the same after loading"""
+        # Arrange
+        path = str(tmp_path / "category.nb")
+        text = "double charge on my invoice"
+
+        # Act
+        self.model.save(path)
+        loaded = NaiveBayesClassifier.load(path)
+
+        # Assert
+        assert loaded.labels == self.model.labels
+        assert loaded.predict(text, k=2) == pytest.approx(self.model.predict(text, k=2))
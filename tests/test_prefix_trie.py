@@ -0,0 +1,67 @@
+# Unit tests for the category autocomplete trie
+from search import prefix_trie
+from search.prefix_trie import PrefixTrie
+
+
+class TestPrefixTrie:
+    """Test cases for PrefixTrie"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.trie = PrefixTrie()
+        for key, weight in [
+            ("billing", 9),
+            ("bug report", 5),
+            ("bug", 2),
+            ("delivery", 1),
+        ]:
+            self.trie.set_weight(key, weight)
+
+    def test_suggest_orders_by_weight(self):
+        """Test keys under a prefix come back heaviest first"""
+        # Act
+        result = self.trie.suggest("b")
+
+        # Assert
+        assert result == [("billing", 9), ("bug report", 5), ("bug", 2)]
+
+    def test_empty_prefix_suggests_overall_top(self):
+        """Test an empty prefix returns the most used keys"""
+        # Act
+        result = self.trie.suggest("", limit=2)
+
+        # Assert
+        assert result == [("billing", 9), ("bug report", 5)]
+
+    def test_reweight_reorders_suggestions(self):
+        """Test raising a weight moves the key up every prefix on its path"""
+        # Act
+        self.trie.set_weight("bug", 20)
+
+        # Assert
+        assert self.trie.suggest("bu") == [("bug", 20), ("bug report", 5)]
+        assert self.trie.suggest("")[0] == ("bug", 20)
+
+    def test_zero_weight_removes_key_and_prunes_nodes(self):
+        """Test removing a key drops it from suggestions and the trie"""
+        # Act
+        self.trie.set_weight("delivery", 0)
+
+        # Assert
+        assert self.trie.suggest("d") == []
+        assert "d" not in self.trie.root.children
+        assert len(self.trie) == 3
+
+    def test_cached_top_lists_are_bounded(self, monkeypatch):
+        """Test each node only caches TOP_K keys yet stays correct"""
+        # Arrange
+        monkeypatch.setattr(prefix_trie, "TOP_K", 2)
+        trie = PrefixTrie()
+        for weight, key in enumerate(["aa", "ab", "ac", "ad"], start=1):
+            trie.set_weight(key, weight)
+
+        # Act
+        trie.set_weight("ad", 0)
+
+        # Assert
+        assert trie.suggest("a") == [("ac", 3), ("ab", 2)]
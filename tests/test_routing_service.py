@@ -0,0 +1,117 @@
+# Unit tests for RoutingService
+from unittest.mock import Mock
+
+from search.naive_bayes import NaiveBayesTrainer, features
+from services.cache import TTLCache
+from services.routing_service import RoutingService
+
+
+def train(examples):
+    """Build a classifier from (label, text) pairs"""
+    trainer = NaiveBayesTrainer(min_feature_count=1)
+    for label, text in examples:
+        trainer.add(features(text), label)
+    return trainer.build()
+
+
+class TestRoutingService:
+    """Test cases for RoutingService"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.routing_service = RoutingService(assign_confidence=0.6)
+        self.mock_dao = Mock()
+        self.mock_user_dao = Mock()
+        self.mock_category_service = Mock()
+        self.mock_category_service.canonical_category.return_value = None
+        self.routing_service.complaint_dao = self.mock_dao
+        self.routing_service.user_dao = self.mock_user_dao
+        self.routing_service.category_service = self.mock_category_service
+        self.rows = [
+            (1, "Billing", "Charged twice, refund please", 7),
+            (2, "Billing", "Refund for the double charge", 7),
+            (3, "Technical Issue", "App crashes on upload", 8),
+            (4, "Technical Issue", "Upload crashes the app", None),
+            (5, "Technical Issue", "The app crashes when I upload", 8),
+        ]
+        models = {
+            "category": train([(row[1], row[2]) for row in self.rows]),
+            "assignee": train([(str(row[3]), row[2]) for row in self.rows if row[3]]),
+        }
+        self.routing_service.models_cache = TTLCache(lambda: models, ttl=60)
+
+    def test_suggest_predicts_category_and_assignee(self):
+        """Test both heads are applied to a new description"""
+        # Act
+        result = self.routing_service.suggest("I need a refund, charged twice")
+
+        # Assert
+        assert result["category"] == "Billing"
+        assert result["assigned_to"] == 7
+        assert 0.5 < result["assignee_confidence"] <= 1
+
+    def test_prepare_assigns_only_current_staff(self):
+        """Test a confident assignee is dropped once they are no longer staff"""
+        # Arrange
+        self.mock_user_dao.find_by_id.side_effect = [
+            {"id": 7, "role": "staff"},
+            {"id": 7, "role": "user"},
+        ]
+
+        # Act
+        first = self.routing_service.prepare("refund for a double charge")
+        second = self.routing_service.prepare("refund for a double charge")
+
+        # Assert
+        assert first == {"assigned_to": 7}
+        assert second == {}
+
+    def test_prepare_without_models_assigns_nobody(self):
+        """Test complaints are filed unassigned until models are trained"""
+        # Arrange
+        self.routing_service.models_cache = TTLCache(
+            lambda: {"category": None, "assignee": None}, ttl=60
+        )
+
+        # Act
+        result = self.routing_service.prepare("refund for a double charge")
+
+        # Assert
+        assert result == {}
+        self.mock_user_dao.find_by_id.assert_not_called()
+
+    def test_train_holds_out_every_nth_complaint(self):
+        """Test held-out complaints are skipped in training and scored in evaluation"""
+        # Arrange
+        self.mock_dao.iter_routing_examples.side_effect = lambda batch_size: iter(
+            [self.rows]
+        )
+
+        # Act
+        models = self.routing_service.train(holdout=4)
+        report = self.routing_service.evaluate(models, holdout=4)
+
+        # Assert
+        assert models["category"].labels == ["Billing", "Technical Issue"]
+        assert models["assignee"].labels == ["7", "8"]
+        assert report["category"] == {"examples": 1, "top1": 1.0, "top3": 1.0}
+        assert report["assignee"]["examples"] == 0
+
+    def test_assign_applies_confident_suggestions_for_staff(self):
+        """Test backlog assignments skip low confidence and non-staff suggestions"""
+        # Arrange
+        self.mock_user_dao.find_by_role.return_value = [{"id": 7}]
+        self.mock_dao.assign_many.return_value = 1
+        routed = [
+            {"id": 10, "assigned_to": 7, "assignee_confidence": 0.9},
+            {"id": 11, "assigned_to": 7, "assignee_confidence": 0.4},
+            {"id": 12, "assigned_to": 9, "assignee_confidence": 0.95},
+            {"id": 13},
+        ]
+
+        # Act
+        result = self.routing_service.assign(routed)
+
+        # Assert
+        assert result == 1
+        self.mock_dao.assign_many.assert_called_once_with([(10, 7)])
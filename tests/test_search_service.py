@@ -0,0 +1,74 @@
+# Unit tests for SearchIndexService
+from datetime import datetime
+from unittest.mock import Mock
+
+import pytest
+
+from services.search_service import SearchIndexService
+
+
+class TestSearchIndexService:
+    """Test cases for SearchIndexService"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.mock_dao = Mock()
+        self.mock_comment_dao = Mock()
+        self.mock_dao.get_export_horizon.return_value = datetime(2026, 1, 2)
+        self.mock_dao.iter_changed_batches.return_value = iter([])
+        self.mock_dao.iter_tombstone_batches.return_value = iter([])
+        self.watermark = {
+            "last_updated_at": "2026-01-01 00:00:00",
+            "last_complaint_id": 0,
+            "last_tombstone_id": 0,
+            "last_comment_at": "2026-01-01 00:00:00",
+        }
+
+    def make_service(self, tmp_path) -> SearchIndexService:
+        service = SearchIndexService(str(tmp_path))
+        service.complaint_dao = self.mock_dao
+        service.comment_dao = self.mock_comment_dao
+        service.index.update([(1, "Refund missing")], state=dict(self.watermark))
+        return service
+
+    def test_refresh_indexes_complaints_with_new_comments(self, tmp_path):
+        """Test a complaint with a new comment is indexed with its comments"""
+        # Arrange
+        service = self.make_service(tmp_path)
+        self.mock_dao.find_ids_commented_since.return_value = [1]
+        self.mock_dao.find_by_ids.return_value = [
+            {"id": 1, "description": "Refund missing"}
+        ]
+        self.mock_comment_dao.find_by_complaint_ids.return_value = [
+            {"complaint_id": 1, "comment": "Escalated to billing"}
+        ]
+
+        # Act
+        result = service.refresh()
+
+        # Assert
+        assert result == {"indexed": 1, "deleted": 0}
+        assert [doc_id for doc_id, _ in service.index.search("escalated")] == [1]
+        assert service.index.state["last_comment_at"] == "2026-01-02 00:00:00"
+
+    def test_refresh_keeps_watermark_when_comments_cannot_be_read(self, tmp_path):
+        """Test a database error aborts the refresh before anything is committed"""
+        # Arrange
+        service = self.make_service(tmp_path)
+        self.mock_dao.find_ids_commented_since.return_value = [1]
+        self.mock_dao.find_by_ids.return_value = [
+            {"id": 1, "description": "Refund missing"}
+        ]
+        self.mock_comment_dao.find_by_complaint_ids.side_effect = RuntimeError(
+            "connection lost"
+        )
+
+        # Act
+        with pytest.raises(RuntimeError):
+            service.refresh()
+
+        # Assert
+        assert service.index.state == self.watermark
+        self.mock_comment_dao.find_by_complaint_ids.assert_called_once_with(
+            [1], raise_errors=True
+        )
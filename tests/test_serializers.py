@@ -0,0 +1,91 @@
+# Unit tests for the DTO JSON serializers
+import json
+from datetime import date, datetime
+
+import pytest
+
+from dto.comment_dto import CommentDTO
+from dto.serializers import (
+    comment_serializer,
+    complaint_serializer,
+    user_serializer,
+)
+
+CREATED = datetime(2025, 7, 23, 10, 0, 0)
+
+
+class TestSerializers:
+    """Test cases for precomputed per-type JSON encoders"""
+
+    def test_encode_dict_formats_datetime(self):
+        """Test a DAO dict encodes with datetimes as plain timestamps"""
+        # Arrange
+        row = {"id": 1, "user_id": 2, "category": "Billing", "created_at": CREATED}
+
+        # Act
+        result = json.loads(complaint_serializer.encode(row))
+
+        # Assert
+        assert result["created_at"] == "2025-07-23 10:00:00"
+        assert result["assigned_to"] is None
+        assert result["status"] is None
+
+    def test_encode_escapes_strings(self):
+        """Test quotes, backslashes and non-ASCII text survive a round trip"""
+        # Arrange
+        comment = CommentDTO(id=1, complaint_id=2, user_id=3, comment='Say "hé"\\n')
+
+        # Act
+        result = json.loads(comment_serializer.encode(comment))
+
+        # Assert
+        assert result["comment"] == 'Say "hé"\\n'
+
+    def test_user_serializer_excludes_password(self):
+        """Test password hashes never reach JSON output"""
+        # Act
+        result = json.loads(user_serializer.encode({"id": 1, "password": "hash"}))
+
+        # Assert
+        assert "password" not in result
+
+    def test_iter_json_array_streams_tuple_rows_in_chunks(self):
+        """Test cursor tuples stream as a valid array split into chunks"""
+        # Arrange
+        rows = (
+            (i, 1, "Billing", "Refund", "Pending", CREATED, None, "Ann", None, None)
+            for i in range(5)
+        )
+
+        # Act
+        chunks = list(complaint_serializer.iter_json_array(rows, chunk_rows=2))
+
+        # Assert
+        assert len(chunks) == 3
+        result = json.loads(b"".join(chunks))
+        assert [row["id"] for row in result] == [0, 1, 2, 3, 4]
+        assert result[4]["user_name"] == "Ann"
+
+    def test_encode_plain_date(self):
+        """Test a date in a datetime field encodes without a time part"""
+        # Act
+        result = json.loads(
+            complaint_serializer.encode({"created_at": date(2025, 7, 23)})
+        )
+
+        # Assert
+        assert result["created_at"] == "2025-07-23"
+
+    def test_encode_rejects_tuple_of_wrong_length(self):
+        """Test a cursor row out of step with the DTO fields is an error"""
+        # Act & Assert
+        with pytest.raises(ValueError):
+            complaint_serializer.encode((1, 2, "Billing"))
+
+    def test_iter_json_array_empty(self):
+        """Test an empty row iterator is an empty array"""
+        # Act
+        result = b"".join(complaint_serializer.iter_json_array(iter([])))
+
+        # Assert
+        assert result == b"[]"
@@ -0,0 +1,68 @@
+# Unit tests for the t-digest quantile sketch
+import random
+from bisect import bisect_left
+
+from analytics.tdigest import TDigest
+
+
+def rank_error(values, q, estimate):
+    """Distance between q and the true rank of an estimated quantile"""
+    return abs(bisect_left(values, estimate) / len(values) - q)
+
+
+class TestTDigest:
+    """Test cases for TDigest"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        rng = random.Random(7)
+        self.values = [rng.expovariate(1 / 3600) for _ in range(50000)]
+        self.sorted_values = sorted(self.values)
+
+    def test_quantiles_track_true_ranks(self):
+        """Test p50/p90/p99 land within half a percent of their true rank"""
+        # Arrange
+        digest = TDigest()
+
+        # Act
+        digest.extend(self.values)
+
+        # Assert
+        assert len(digest) == 50000
+        assert len(digest.means) <= 100
+        for q in (0.5, 0.9, 0.99):
+            assert rank_error(self.sorted_values, q, digest.quantile(q)) < 0.005
+
+    def test_merged_digests_match_whole_stream(self):
+        """Test digests of separate parts merge into a digest of the whole"""
+        # Arrange
+        parts = [TDigest() for _ in range(10)]
+        for i, value in enumerate(self.values):
+            parts[i % 10].add(value)
+
+        # Act
+        merged = TDigest()
+        for part in parts:
+            merged.merge(part)
+
+        # Assert
+        assert len(merged) == 50000
+        assert merged.min == self.sorted_values[0]
+        assert merged.max == self.sorted_values[-1]
+        for q in (0.5, 0.9, 0.99):
+            assert rank_error(self.sorted_values, q, merged.quantile(q)) < 0.005
+
+    def test_small_and_empty_digests(self):
+        """Test quantiles of an empty digest and of one or two values"""
+        # Arrange
+        digest = TDigest()
+
+        # Act & Assert
+        assert digest.quantile(0.5) is None
+        digest.add(5)
+        assert digest.quantile(0.5) == 5
+        assert digest.quantile(0.99) == 5
+        digest.add(7)
+        assert digest.quantile(0) == 5
+        assert digest.quantile(0.5) == 6
+        assert digest.quantile(1) == 7
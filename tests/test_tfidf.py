@@ -0,0 +1,68 @@
+# Unit tests for the TF-IDF similarity index
+import pytest
+
+from search.tfidf import TfidfIndex
+
+
+class TestTfidfIndex:
+    """Test cases for TfidfIndex"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.index = TfidfIndex.build(
+            [
+                (1, "Charged twice for my monthly subscription"),
+                (2, "App crashes when uploading a photo"),
+                (3, "Password reset email never arrives"),
+                (4, "Subscription renewal charged to an expired card"),
+            ]
+        )
+
+    def test_most_similar_ranks_by_cosine(self):
+        """Test the closest description ranks first with a cosine in (0, 1]"""
+        # Act
+        result = self.index.most_similar("I was charged twice this month", limit=2)
+
+        # Assert
+        assert result[0][0] == 1
+        assert 0 < result[0][1] <= 1
+        assert len(result) <= 2
+
+    def test_identical_text_scores_one(self):
+        """Test an indexed text is fully similar to itself"""
+        # Act
+        result = self.index.most_similar("App crashes when uploading a photo")
+
+        # Assert
+        assert result[0][0] == 2
+        assert result[0][1] == pytest.approx(1.0, abs=1e-5)
+
+    def test_exclude_skips_the_complaint_itself(self):
+        """Test the complaint being viewed is not suggested to itself"""
+        # Act
+        result = self.index.most_similar(
+            "Password reset email never arrives", exclude=3
+        )
+
+        # Assert
+        assert 3 not in [doc_id for doc_id, _ in result]
+
+    def test_add_and_remove_update_results(self):
+        """Test newly resolved complaints appear and reopened ones disappear"""
+        # Act
+        self.index.add(5, "Photo upload crashes the app on Android")
+        self.index.remove(2)
+        result = self.index.most_similar("photo upload crash")
+
+        # Assert
+        assert result[0][0] == 5
+        assert 2 not in [doc_id for doc_id, _ in result]
+        assert len(self.index) == 4
+
+    def test_unknown_terms_match_nothing(self):
+        """Test a query sharing no terms with the corpus returns no suggestions"""
+        # Act
+        result = self.index.most_similar("zebra quokka")
+
+        # Assert
+        assert result == []
@@ -0,0 +1,57 @@
+# Unit tests for the in-memory trigram index
+from search.trigram_index import TrigramIndex
+
+
+class TestTrigramIndex:
+    """Test cases for TrigramIndex"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.index = TrigramIndex(
+            ["Bug Report", "bug report", "Billing", "Technical Issue", "Delivery"]
+        )
+
+    def test_substring_match_returns_every_spelling(self):
+        """Test a substring finds the category under all of its spellings"""
+        # Act
+        result = self.index.search("REPORT")
+
+        # Assert
+        assert result == ["Bug Report", "bug report"]
+        assert len(self.index) == 4
+
+    def test_short_term_matches_by_scan(self):
+        """Test terms shorter than a trigram still match"""
+        # Act
+        result = self.index.search("bi")
+
+        # Assert
+        assert result == ["Billing"]
+
+    def test_typo_falls_back_to_similar_values(self):
+        """Test misspelt terms resolve to categories sharing most trigrams"""
+        # Act
+        result = self.index.search("tecnical isue")
+
+        # Assert
+        assert result == ["Technical Issue"]
+
+    def test_unrelated_term_matches_nothing(self):
+        """Test a term with no similar category returns nothing"""
+        # Act
+        result = self.index.search("xyz")
+
+        # Assert
+        assert result == []
+
+    def test_discard_removes_value_once_all_spellings_are_gone(self):
+        """Test an entry stays until its last spelling is discarded"""
+        # Act
+        self.index.discard("bug report")
+        after_one = self.index.search("bug")
+        self.index.discard("Bug Report")
+        after_both = self.index.search("bug")
+
+        # Assert
+        assert after_one == ["Bug Report"]
+        assert after_both == []
@@ -0,0 +1,282 @@
+# Unit tests for ComplaintView CSV export
+import csv
+import gzip
+from datetime import datetime
+
+import pytest
+
+from views.views import EXPORT_FIELDS, ComplaintView
+
+
+def sample_batches():
+    """Two batches of export rows in EXPORT_FIELDS order"""
+    created = datetime(2025, 7, 23, 10, 0, 0)
+    return [
+        [(1, 1, "Technical Issue", "Login not working", "Pending", created)],
+        [
+            (2, 1, "Billing", "Charged twice, please refund", "Resolved", created),
+            (3, 2, "Bug Report", 'Quote " and, comma', "In Progress", created),
+        ],
+    ]
+
+
+class TestComplaintViewExport:
+    """Test cases for streaming CSV export"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.complaint_view = ComplaintView()
+
+    def test_export_writes_header_and_rows(self, tmp_path):
+        """Test plain CSV export of streamed batches"""
+        # Arrange
+        filename = str(tmp_path / "export.csv")
+
+        # Act
+        result = self.complaint_view.export_complaints_to_csv(
+            iter(sample_batches()), filename
+        )
+
+        # Assert
+        assert result == True
+        with open(filename, newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == EXPORT_FIELDS
+        assert len(rows) == 4
+        assert rows[1] == [
+            "1",
+            "1",
+            "Technical Issue",
+            "Login not working",
+            "Pending",
+            "2025-07-23 10:00:00",
+        ]
+        assert rows[3][3] == 'Quote " and, comma'
+
+    def test_export_gzip(self, tmp_path):
+        """Test gzip-compressed export"""
+        # Arrange
+        filename = str(tmp_path / "export.csv.gz")
+
+        # Act
+        result = self.complaint_view.export_complaints_to_csv(
+            iter(sample_batches()), filename, compress=True
+        )
+
+        # Assert
+        assert result == True
+        with gzip.open(filename, "rt", newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        assert len(rows) == 4
+
+    def test_export_reports_progress_per_batch(self, tmp_path):
+        """Test the progress callback receives running row counts"""
+        # Arrange
+        progress = []
+
+        # Act
+        self.complaint_view.export_complaints_to_csv(
+            iter(sample_batches()),
+            str(tmp_path / "export.csv"),
+            progress_callback=progress.append,
+        )
+
+        # Assert
+        assert progress == [1, 3]
+
+
+class TestComplaintViewParts:
+    """Test cases for joining parallel export part files"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.complaint_view = ComplaintView()
+
+    def write_parts(self, tmp_path, compress):
+        """Write each sample batch to its own headerless part file"""
+        part_files = []
+        for index, batch in enumerate(sample_batches()):
+            part_file = str(tmp_path / f"export.csv.part{index:04d}")
+            self.complaint_view.write_complaint_rows(
+                [batch], part_file, compress, include_header=False
+            )
+            part_files.append(part_file)
+        return part_files
+
+    def test_concatenate_parts(self, tmp_path):
+        """Test parts are joined under a single header and removed"""
+        # Arrange
+        part_files = self.write_parts(tmp_path, compress=False)
+        filename = str(tmp_path / "export.csv")
+
+        # Act
+        self.complaint_view.concatenate_export_parts(filename, part_files)
+
+        # Assert
+        with open(filename, newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == EXPORT_FIELDS
+        assert [row[0] for row in rows[1:]] == ["1", "2", "3"]
+        assert list(tmp_path.iterdir()) == [tmp_path / "export.csv"]
+
+    def test_concatenate_gzip_parts(self, tmp_path):
+        """Test gzip parts join into one readable gzip stream"""
+        # Arrange
+        part_files = self.write_parts(tmp_path, compress=True)
+        filename = str(tmp_path / "export.csv.gz")
+
+        # Act
+        self.complaint_view.concatenate_export_parts(
+            filename, part_files, compress=True
+        )
+
+        # Assert
+        with gzip.open(filename, "rt", newline="", encoding="utf-8") as f:
+            rows = list(csv.reader(f))
+        assert rows[0] == EXPORT_FIELDS
+        assert len(rows) == 4
+
+
+class TestComplaintViewDetails:
+    """Test cases for the complaint detail screen"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.complaint_view = ComplaintView()
+
+    def test_details_show_assignee_and_comment_summary(self, capsys):
+        """Test the joined detail row and DAO comments render"""
+        # Arrange
+        created = datetime(2025, 7, 23, 10, 0, 0)
+        complaint = {
+            "id": 3,
+            "user_name": "Ann",
+            "category": "Billing",
+            "status": "In Progress",
+            "description": "Charged twice",
+            "created_at": created,
+            "assigned_staff_name": "Sam",
+            "comment_count": 1,
+            "latest_comment": {
+                "comment": "Refund issued",
+                "created_at": created,
+                "user_name": "Sam",
+            },
+        }
+        comments = [
+            {"created_at": created, "user_name": "Sam", "comment": "Refund issued"}
+        ]
+
+        # Act
+        self.complaint_view.display_complaint_details(complaint, comments)
+
+        # Assert
+        output = capsys.readouterr().out
+        assert "Assigned To: Sam" in output
+        assert "Comments: 1" in output
+        assert "Sam: Refund issued" in output
+
+    def test_similar_complaints_show_score_and_resolution(self, capsys):
+        """Test the similar resolved panel lists matches with their resolution"""
+        # Arrange
+        similar = [
+            {
+                "id": 8,
+                "category": "Billing",
+                "description": "Charged two times",
+                "similarity": 0.82,
+                "resolution": {"user_name": "Sam", "comment": "Refunded duplicate"},
+            }
+        ]
+
+        # Act
+        self.complaint_view.display_similar_complaints(similar)
+        self.complaint_view.display_similar_complaints(None)
+
+        # Assert
+        output = capsys.readouterr().out
+        assert "#8 (82% similar) [Billing] Charged two times" in output
+        assert "Resolution: Sam: Refunded duplicate" in output
+        assert "still loading" in output
+
+    def test_trends_list_each_period(self, capsys):
+        """Test the trends table shows filed and resolved counts per period"""
+        # Arrange
+        trends = {
+            "bucket": "week",
+            "periods": ["2025-07-14", "2025-07-21"],
+            "created": [3, 4],
+            "resolved": [1, 0],
+        }
+
+        # Act
+        self.complaint_view.display_trends(trends)
+
+        # Assert
+        lines = capsys.readouterr().out.splitlines()
+        assert "Filed vs Resolved per Week" in lines[1]
+        assert lines[3].split() == ["2025-07-14", "3", "1"]
+        assert lines[4].split() == ["2025-07-21", "4", "0"]
+
+    def test_resolution_times_show_percentiles_per_group(self, capsys):
+        """Test the resolution table shows readable durations per group"""
+        # Arrange
+        summary = {"count": 12, "p50": 2700, "p90": 12000, "p99": 180000}
+        report = {
+            "resolution": {
+                "overall": summary,
+                "by_category": {"Billing": summary},
+                "by_staff": {5: {"name": "Sam", **summary}},
+            },
+            "first_response": {
+                "overall": {"count": 0},
+                "by_category": {},
+                "by_staff": {},
+            },
+        }
+
+        # Act
+        self.complaint_view.display_resolution_times(report)
+
+        # Assert
+        output = capsys.readouterr().out
+        assert "Time to Resolution" in output
+        assert "Time to First Response" in output
+        rows = [line.split() for line in output.splitlines()]
+        assert ["Overall", "12", "45m", "3h", "20m", "2d", "2h"] in rows
+        assert ["Sam", "12", "45m", "3h", "20m", "2d", "2h"] in rows
+
+
+class TestComplaintViewCategories:
+    """Test cases for choosing a suggested category"""
+
+    def setup_method(self):
+        """Set up test fixtures before each test method"""
+        self.complaint_view = ComplaintView()
+        self.suggestions = [
+            {"category": "Billing", "count": 12},
+            {"category": "Bug Report", "count": 4},
+        ]
+
+    def test_choose_category_by_number(self, monkeypatch, capsys):
+        """Test picking a numbered suggestion returns its canonical spelling"""
+        # Arrange
+        monkeypatch.setattr("builtins.input", lambda prompt: "2")
+
+        # Act
+        result = self.complaint_view.choose_category("bu", self.suggestions)
+
+        # Assert
+        assert result == "Bug Report"
+        assert "1. Billing (12)" in capsys.readouterr().out
+
+    def test_choose_category_keeps_typed_text(self, monkeypatch):
+        """Test pressing Enter keeps the category as typed"""
+        # Arrange
+        monkeypatch.setattr("builtins.input", lambda prompt: "")
+
+        # Act
+        result = self.complaint_view.choose_category("Bulk order", self.suggestions)
+
+        # Assert
+        assert result == "Bulk order"
@@ -0,0 +1,72 @@
+"""
+Routing Model Training Script
+Trains the category and assignee classifiers from past complaints and saves
+them to ROUTING_MODEL_PATH, where the application picks them up within
+ROUTING_MODEL_TTL seconds. --evaluate first trains with every --holdout'th
+complaint left out and reports accuracy on those held-out complaints.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from config.database import db_config
+from services.routing_service import ROUTING_MODEL_PATH, RoutingService
+
+
+def main():
+    """Train, optionally evaluate, and save the routing models"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument(
+        "--evaluate", action="store_true", help="Report held-out accuracy first"
+    )
+    parser.add_argument(
+        "--holdout",
+        type=int,
+        default=10,
+        help="Hold out complaints whose id is a multiple of this (default: 10)",
+    )
+    parser.add_argument(
+        "--no-save", action="store_true", help="Only evaluate, keep the saved models"
+    )
+    args = parser.parse_args()
+
+    try:
+        routing_service = RoutingService()
+        if args.evaluate:
+            started = time.perf_counter()
+            models = routing_service.train(args.holdout, args.batch_size)
+            print(
+                f"Trained on held-in complaints in {time.perf_counter() - started:.2f}s"
+            )
+            report = routing_service.evaluate(models, args.holdout, args.batch_size)
+            print(
+                f"\n{'head':<10} {'labels':>7} {'examples':>9} {'top-1':>7} {'top-3':>7}"
+            )
+            for head, scores in report.items():
+                print(
+                    f"{head:<10} {len(models[head].labels):>7} "
+                    f"{scores['examples']:>9} {scores['top1']:>7.1%} "
+                    f"{scores['top3']:>7.1%}"
+                )
+        if args.no_save:
+            return
+
+        started = time.perf_counter()
+        models = routing_service.train(batch_size=args.batch_size)
+        routing_service.save(models)
+        print(
+            f"Trained on all complaints in {time.perf_counter() - started:.2f}s, "
+            f"saved to {ROUTING_MODEL_PATH}"
+        )
+    finally:
+        db_config.close_connection()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,29 @@
 import csv
-from typing import Any, Dict, List
+import gzip
+import io
+import json
+import os
+import shutil
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+# Column order of complaint export rows (see ComplaintDAO.iter_export_batches)
+EXPORT_FIELDS = ["id", "user_id", "category", "description", "status", "created_at"]
+
+# Column order of incremental export rows (see ComplaintService.iter_incremental_export)
+INCREMENTAL_EXPORT_FIELDS = ["op"] + EXPORT_FIELDS + ["updated_at"]
+
+
+def format_duration(seconds: int) -> str:
+    """Compact duration such as 45m, 3h 20m or 2d 4h"""
+    minutes = seconds // 60
+    if minutes < 60:
+        return f"{minutes}m"
+    hours, minutes = divmod(minutes, 60)
+    if hours < 24:
+        return f"{hours}h {minutes}m"
+    days, hours = divmod(hours, 24)
+    return f"{days}d {hours}h"
 
 
 class BaseView:
@@ -38,7 +62,8 @@ class UserView(BaseView):
         print("5. Change Password")
         print("6. Search Complaints by Category")
         print("7. Export My Complaints to CSV")
-        print("8. Logout")
+        print("8. Search Complaints by Keyword")
+        print("9. Logout")
 
     def display_admin_menu(self):
         """Display admin menu options"""
@@ -51,7 +76,8 @@ class UserView(BaseView):
         print("6. Search Complaints by Category")
         print("7. Export All Complaints to CSV")
         print("8. View Complaint Statistics")
-        print("9. Logout")
+        print("9. Search Complaints by Keyword")
+        print("10. Logout")
 
     def display_staff_menu(self):
         """Display staff menu options"""
@@ -59,7 +85,9 @@ class UserView(BaseView):
         print("1. View Assigned Complaints")
         print("2. Update Complaint Status")
         print("3. Add Comment to Complaint")
-        print("4. Logout")
+        print("4. Search Assigned Complaints by Keyword")
+        print("5. View Complaint Details")
+        print("6. Logout")
 
     def display_staff_list(self, staff_members: List[Dict[str, Any]]):
         """Display list of staff members"""
@@ -102,6 +130,15 @@ class ComplaintView(BaseView):
             print(f"Created: {complaint['created_at']}")
             if "assigned_staff_name" in complaint and complaint["assigned_staff_name"]:
                 print(f"Assigned to: {complaint['assigned_staff_name']}")
+            if "comment_count" in complaint:
+                activity = complaint.get("last_comment_at") or "none"
+                print(
+                    f"Comments: {complaint['comment_count']} (last activity: {activity})"
+                )
+            for comment in complaint.get("comments", []):
+                print(
+                    f"  [{comment['created_at']}] {comment['user_name']}: {comment['comment']}"
+                )
             print("-" * 50)
 
     def display_complaint_details(
@@ -122,55 +159,259 @@ class ComplaintView(BaseView):
 
         if complaint.get("assigned_staff_name"):
             print(f"Assigned To: {complaint['assigned_staff_name']}")
+        if complaint.get("duplicate_of"):
+            print(f"Possible Duplicate Of: #{complaint['duplicate_of']}")
+
+        if "comment_count" in complaint:
+            print(f"Comments: {complaint['comment_count']}")
+        latest = complaint.get("latest_comment")
+        if latest:
+            print(
+                f"Latest Comment: [{latest['created_at']}] "
+                f"{latest['user_name']}: {latest['comment']}"
+            )
 
         # Display comments if provided
         if comments:
-            print("\n=== Comments ===")
-            for comment in comments:
+            self.display_comments(comments)
+
+    def display_similar_complaints(self, similar: Optional[List[Dict[str, Any]]]):
+        """Display resolved complaints similar to the one being viewed"""
+        print("\n=== Similar Resolved Complaints ===")
+        if similar is None:
+            print("Similarity index is still loading, try again shortly.")
+            return
+        if not similar:
+            print("No similar resolved complaints found.")
+            return
+
+        for complaint in similar:
+            print(
+                f"#{complaint['id']} ({complaint['similarity']:.0%} similar) "
+                f"[{complaint['category']}] {complaint['description']}"
+            )
+            resolution = complaint.get("resolution")
+            if resolution:
                 print(
-                    f"[{comment['created_at']}] {comment['staff_name']}: {comment['comment']}"
+                    f"  Resolution: {resolution['user_name']}: {resolution['comment']}"
                 )
 
-    def display_complaint_statistics(self, stats: Dict[str, int]):
+    def display_comments(self, comments: List[Dict[str, Any]], title: str = "Comments"):
+        """Display comments oldest first"""
+        print(f"\n=== {title} ===")
+        for comment in comments:
+            print(
+                f"[{comment['created_at']}] {comment['user_name']}: {comment['comment']}"
+            )
+
+    def confirm_load_older(self, shown: int, total: Optional[int] = None) -> bool:
+        """Ask whether to load the previous page of comments"""
+        progress = f"{shown} of {total}" if total is not None else str(shown)
+        answer = input(f"Showing {progress} comments. Load older? (y/n): ")
+        return answer.strip().lower() == "y"
+
+    def display_complaint_statistics(self, stats: Dict[str, Any]):
         """Display complaint statistics"""
         print("\n=== Complaint Statistics ===")
-        print(f"Total: {stats['total']}")
-        print(f"Pending: {stats['pending']}")
-        print(f"In Progress: {stats['in_progress']}")
-        print(f"Resolved: {stats['resolved']}")
+        if not stats:
+            print("No statistics available.")
+            return
+
+        print(f"Total: {stats['total_complaints']}")
+        print(f"Pending: {stats['pending_complaints']}")
+        print(f"In Progress: {stats['in_progress_complaints']}")
+        print(f"Resolved: {stats['resolved_complaints']}")
+
+        categories = stats.get("category_breakdown", {})
+        if categories:
+            print("\n--- By Category ---")
+            for category, count in sorted(categories.items()):
+                print(f"{category}: {count}")
+
+    def display_trends(self, trends: Dict[str, Any]):
+        """Display complaints filed and resolved per period"""
+        print(f"\n--- Filed vs Resolved per {trends['bucket'].title()} ---")
+        print(f"{'Period':<12} {'Filed':>8} {'Resolved':>9}")
+        for period, created, resolved in zip(
+            trends["periods"], trends["created"], trends["resolved"]
+        ):
+            print(f"{period:<12} {created:>8} {resolved:>9}")
+
+    def display_resolution_times(self, report: Dict[str, Any]):
+        """Display p50/p90/p99 resolution and first response times"""
+        titles = {"resolution": "Resolution", "first_response": "First Response"}
+        for metric, title in titles.items():
+            times = report[metric]
+            print(f"\n--- Time to {title} ---")
+            rows = [("Overall", times["overall"])]
+            rows += sorted(times["by_category"].items())
+            rows += [(staff["name"], staff) for staff in times["by_staff"].values()]
+            print(f"{'':<20} {'Count':>7} {'p50':>8} {'p90':>8} {'p99':>8}")
+            for name, summary in rows:
+                if not summary["count"]:
+                    continue
+                quantiles = " ".join(
+                    f"{format_duration(summary[q]):>8}" for q in ("p50", "p90", "p99")
+                )
+                print(f"{name[:20]:<20} {summary['count']:>7} {quantiles}")
+
+    def write_complaint_rows(
+        self,
+        batches: Iterable[List[tuple]],
+        filename: str,
+        compress: bool = False,
+        include_header: bool = True,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        fields: List[str] = EXPORT_FIELDS,
+    ) -> int:
+        """Write batches of export rows to a CSV file and return the row count"""
+        if compress:
+            csvfile = gzip.open(filename, "wt", newline="", encoding="utf-8")
+        else:
+            csvfile = open(filename, "w", newline="", encoding="utf-8")
+
+        rows_written = 0
+        with csvfile:
+            writer = csv.writer(csvfile)
+            if include_header:
+                writer.writerow(fields)
+
+            for batch in batches:
+                writer.writerows(batch)
+                rows_written += len(batch)
+                if progress_callback:
+                    progress_callback(rows_written)
+        return rows_written
+
+    def concatenate_export_parts(
+        self,
+        filename: str,
+        part_files: List[str],
+        compress: bool = False,
+        fields: List[str] = EXPORT_FIELDS,
+    ):
+        """Join headerless part files into one CSV file and remove the parts
+
+        Gzip parts are joined byte for byte: a sequence of gzip members is
+        itself a valid gzip file, so nothing is decompressed or re-encoded.
+        """
+        header = io.StringIO()
+        csv.writer(header).writerow(fields)
+        header_bytes = header.getvalue().encode("utf-8")
+        if compress:
+            header_bytes = gzip.compress(header_bytes)
+
+        with open(filename, "wb") as output:
+            output.write(header_bytes)
+            for part_file in part_files:
+                with open(part_file, "rb") as part:
+                    shutil.copyfileobj(part, output, 1024 * 1024)
+                os.remove(part_file)
+
+    def write_export_manifest(
+        self,
+        filename: str,
+        parts: List[Dict[str, Any]],
+        compress: bool = False,
+        fields: List[str] = EXPORT_FIELDS,
+    ):
+        """Describe headerless part files in a JSON manifest instead of joining them"""
+        manifest = {
+            "fields": fields,
+            "compressed": compress,
+            "rows": sum(part["rows"] for part in parts),
+            "parts": parts,
+        }
+        with open(filename, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+
+    def display_export_report(self, filename: str, rows: int, elapsed: float):
+        """Display where an export went and how fast it ran"""
+        rate = rows / elapsed if elapsed > 0 else rows
+        print(f"Complaints exported to {filename}")
+        print(f"{rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)")
 
     def export_complaints_to_csv(
-        self, complaints: List[Dict[str, Any]], filename: str = "complaints_export.csv"
+        self,
+        batches: Iterable[List[tuple]],
+        filename: str = "complaints_export.csv",
+        compress: bool = False,
+        progress_callback: Optional[Callable[[int], None]] = None,
+        fields: List[str] = EXPORT_FIELDS,
     ):
-        """Export complaints to CSV file"""
+        """Export complaint row batches to a CSV file, optionally gzip-compressed"""
         try:
-            with open(filename, "w", newline="", encoding="utf-8") as csvfile:
-                fieldnames = [
-                    "id",
-                    "user_id",
-                    "category",
-                    "description",
-                    "status",
-                    "created_at",
-                ]
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-
-                for complaint in complaints:
-                    writer.writerow({k: str(complaint.get(k, "")) for k in fieldnames})
-
-            print(f"Complaints exported to {filename}")
+            started = time.perf_counter()
+            rows_written = self.write_complaint_rows(
+                batches,
+                filename,
+                compress,
+                progress_callback=progress_callback,
+                fields=fields,
+            )
+            elapsed = time.perf_counter() - started
+            self.display_export_report(filename, rows_written, elapsed)
             return True
         except Exception as e:
             print(f"Error exporting complaints: {e}")
             return False
 
+    def export_complaint_history(
+        self,
+        batches: Iterable[List[Dict[str, Any]]],
+        filename: str = "complaints_history.jsonl",
+        compress: bool = False,
+        progress_callback: Optional[Callable[[int], None]] = None,
+    ):
+        """Write complaints with their comments as JSON lines, one complaint per line"""
+        try:
+            started = time.perf_counter()
+            if compress:
+                outfile = gzip.open(filename, "wt", encoding="utf-8")
+            else:
+                outfile = open(filename, "w", encoding="utf-8")
+
+            rows_written = 0
+            with outfile:
+                for batch in batches:
+                    outfile.writelines(
+                        json.dumps(complaint, default=str) + "\n" for complaint in batch
+                    )
+                    rows_written += len(batch)
+                    if progress_callback:
+                        progress_callback(rows_written)
+
+            elapsed = time.perf_counter() - started
+            self.display_export_report(filename, rows_written, elapsed)
+            return True
+        except Exception as e:
+            print(f"Error exporting complaint history: {e}")
+            return False
+
     def get_complaint_input(self) -> Dict[str, str]:
         """Get complaint input from user"""
-        category = input("Complaint Category: ").strip()
+        category = input("Complaint Category (blank to have one suggested): ").strip()
         description = input("Description: ").strip()
         return {"category": category, "description": description}
 
+    def choose_category(self, typed: str, suggestions: List[Dict[str, Any]]) -> str:
+        """Offer existing categories for what was typed and return the choice"""
+        print("\nExisting categories:")
+        for number, suggestion in enumerate(suggestions, start=1):
+            print(f"{number}. {suggestion['category']} ({suggestion['count']})")
+        choice = input(f"Choose a number, or press Enter to keep '{typed}': ").strip()
+        if choice.isdigit() and 1 <= int(choice) <= len(suggestions):
+            category: str = suggestions[int(choice) - 1]["category"]
+            return category
+        return typed
+
+    def confirm_suggested_category(self, category: str, confidence: float) -> bool:
+        """Ask whether to file the complaint under the predicted category"""
+        answer = input(
+            f"Suggested category: {category} ({confidence:.0%} confident). Use it? (y/n): "
+        )
+        return answer.strip().lower() == "y"
+
     def get_status_input(self) -> str:
         """Get status input from user"""
         return input("Enter new status (Pending/In Progress/Resolved): ").strip()
@@ -183,6 +424,10 @@ class ComplaintView(BaseView):
         """Get category for searching"""
         return input("Enter category to search: ").strip()
 
+    def get_search_text(self) -> str:
+        """Get keywords for searching"""
+        return input("Enter keywords to search: ").strip()
+
     def get_filter_status(self) -> str:
         """Get status for filtering"""
         return input("Enter status to filter (Pending/In Progress/Resolved): ").strip()